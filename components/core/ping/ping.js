@@ -1,8 +1,9 @@
 // JavaScript para el componente core_ping
 
-function pingClick() {
+// Se empaqueta como módulo de Vite: se expone en window para el onclick de la plantilla
+window.pingClick = function pingClick() {
     alert('¡PONG desde JavaScript!');
-}
+};
 
 document.addEventListener('DOMContentLoaded', function() {
     console.log('✅ Componente ping JS cargado correctamente');
@@ -17,6 +17,11 @@ class Ping(Component):
             "ping_value": ping,
         }
     
+    class RenderCache:
+        """El HTML solo depende del prop `ping`, se memoiza por su valor."""
+        enabled = True
+        key_props = ["ping"]
+
     class Media:
         css = ["core/ping/ping.css"]
         js = ["core/ping/ping.js"] 
\ No newline at end of file
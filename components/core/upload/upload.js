@@ -0,0 +1,95 @@
+// JavaScript para el componente upload
+
+// Sube una parte con XHR (fetch no informa el progreso de subida)
+function putPart(url, blob, onProgress) {
+    return new Promise(function(resolve, reject) {
+        const xhr = new XMLHttpRequest();
+        xhr.open('PUT', url);
+        xhr.upload.onprogress = function(event) { onProgress(event.loaded); };
+        xhr.onload = function() {
+            if (xhr.status >= 200 && xhr.status < 300) {
+                onProgress(blob.size);
+                resolve();
+            } else {
+                reject(new Error('La parte falló con estado ' + xhr.status));
+            }
+        };
+        xhr.onerror = function() { reject(new Error('Error de red al subir una parte')); };
+        xhr.send(blob);
+    });
+}
+
+function post(url, csrf, body, contentType) {
+    return fetch(url, {
+        method: 'POST',
+        headers: {'X-CSRFToken': csrf, 'Content-Type': contentType},
+        body: body,
+        credentials: 'same-origin',
+    });
+}
+
+// Se empaqueta como módulo de Vite: se expone en window para el onclick de la plantilla
+window.uploadFile = async function uploadFile(button) {
+    const root = button.closest('.upload-component');
+    const file = root.querySelector('.upload-input').files[0];
+    const progress = root.querySelector('.upload-progress');
+    const percent = root.querySelector('.upload-percent');
+    const result = root.querySelector('.upload-result');
+    const csrf = root.querySelector('[name=csrfmiddlewaretoken]').value;
+    if (!file) {
+        return;
+    }
+
+    button.disabled = true;
+    result.textContent = '';
+    const response = await post(root.dataset.startUrl, csrf, JSON.stringify({
+        filename: file.name,
+        size: file.size,
+        content_type: file.type || 'application/octet-stream',
+    }), 'application/json');
+    const plan = await response.json();
+    if (!response.ok) {
+        result.textContent = plan.message;
+        button.disabled = false;
+        return;
+    }
+
+    // Bytes confirmados por parte, para sumar el progreso de las subidas en paralelo
+    const loaded = new Array(plan.parts.length).fill(0);
+    progress.hidden = false;
+    const report = function() {
+        const value = Math.round(loaded.reduce((a, b) => a + b, 0) * 100 / file.size);
+        progress.value = value;
+        percent.textContent = value + '%';
+    };
+
+    const queue = plan.parts.slice();
+    const worker = async function() {
+        while (queue.length) {
+            const part = queue.shift();
+            const start = (part.number - 1) * plan.part_size;
+            await putPart(part.url, file.slice(start, start + plan.part_size), function(bytes) {
+                loaded[part.number - 1] = bytes;
+                report();
+            });
+        }
+    };
+    try {
+        await Promise.all(Array.from({length: plan.concurrency}, worker));
+    } catch (error) {
+        queue.length = 0;
+        await post(root.dataset.abortUrl, csrf, new URLSearchParams({token: plan.token}), 'application/x-www-form-urlencoded');
+        result.textContent = error.message;
+        button.disabled = false;
+        return;
+    }
+
+    // La confirmación devuelve el fragmento renderizado por el servidor
+    await htmx.ajax('POST', root.dataset.completeUrl, {
+        target: result,
+        swap: 'innerHTML',
+        values: {token: plan.token},
+        headers: {'X-CSRFToken': csrf},
+    });
+    button.disabled = false;
+};
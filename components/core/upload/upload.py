@@ -0,0 +1,22 @@
+from django.conf import settings
+from django_components import Component, register
+
+@register("upload")
+class Upload(Component):
+    """Formulario de subida directa a S3 con barra de progreso"""
+
+    template_name = "upload.html"
+
+    def get_context_data(self, accept=None, **kwargs):
+        """
+        Props:
+            accept: Tipos aceptados por el selector de archivos (por defecto UPLOAD_CONTENT_TYPES)
+        """
+        return {
+            "accept": accept or ",".join(settings.UPLOAD_CONTENT_TYPES),
+            "max_mb": settings.UPLOAD_MAX_BYTES // (1024 * 1024),
+        }
+
+    class Media:
+        css = ["core/upload/upload.css"]
+        js = ["core/upload/upload.js"]
@@ -0,0 +1,125 @@
+"""
+Control de admisión con un límite de concurrencia adaptativo (AIMD).
+
+Sin control de admisión, ante una ráfaga las requests se acumulan en los hilos del
+worker hasta que vencen todas, incluidas las verificaciones de salud, y App Runner
+recicla instancias que estaban sanas. `AdmissionMiddleware` cuenta las requests en curso
+del worker y rechaza al instante con 503 y `Retry-After` las que superan el límite, de
+modo que las admitidas terminan a tiempo.
+
+El límite se ajusta con cada request terminada:
+
+- Si tardó más que `ADMISSION_LATENCY_TARGET`, el límite se multiplica por
+  `ADMISSION_BACKOFF`. Solo se reduce una vez por episodio: las requests que empezaron
+  antes de la última reducción ya no reflejan el límite vigente.
+- Si terminó a tiempo y el límite estaba en uso (al menos la mitad ocupado), crece en
+  `1 / límite`, es decir, alrededor de una unidad por cada `límite` requests.
+
+El límite se mantiene entre `ADMISSION_MIN_LIMIT` y `ADMISSION_MAX_LIMIT`. Las vistas de
+`ADMISSION_EXEMPT_VIEWS` (`health` y `db_health_check`) se admiten siempre y no cuentan.
+Las lecturas (GET, HEAD, OPTIONS) son de prioridad baja y se rechazan primero; las
+escrituras disponen de `ADMISSION_HEADROOM` de margen sobre el límite.
+"""
+import threading
+import time
+
+from django.conf import settings
+from loguru import logger
+
+LOW, HIGH = 'low', 'high'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class AdaptiveLimiter:
+    """
+    Límite de concurrencia AIMD de un worker.
+
+    Los parámetros omitidos se leen de la configuración `ADMISSION_*` al reiniciar.
+
+    Args:
+        initial: Límite inicial
+        min_limit: Límite mínimo
+        max_limit: Límite máximo
+        latency_target: Segundos por encima de los cuales una request indica congestión
+        backoff: Factor de reducción del límite (entre 0 y 1)
+        headroom: Fracción del límite que las requests de prioridad alta pueden exceder
+    """
+
+    def __init__(self, initial=None, min_limit=None, max_limit=None, latency_target=None, backoff=None, headroom=None):
+        self.options = {
+            'initial': initial, 'min_limit': min_limit, 'max_limit': max_limit,
+            'latency_target': latency_target, 'backoff': backoff, 'headroom': headroom,
+        }
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        option = self.options.get
+        with self._lock:
+            self.min_limit = option('min_limit') or settings.ADMISSION_MIN_LIMIT
+            self.max_limit = option('max_limit') or settings.ADMISSION_MAX_LIMIT
+            self.latency_target = option('latency_target') or settings.ADMISSION_LATENCY_TARGET
+            self.backoff = option('backoff') or settings.ADMISSION_BACKOFF
+            headroom = option('headroom')
+            self.headroom = settings.ADMISSION_HEADROOM if headroom is None else headroom
+            initial = option('initial') or settings.ADMISSION_INITIAL_LIMIT
+            self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+            self.in_flight = 0
+            self.admitted = 0
+            self.shed = {LOW: 0, HIGH: 0}
+            self.decreases = 0
+            self._last_decrease = float('-inf')
+
+    def capacity(self, priority):
+        return self.limit * (1 + self.headroom) if priority == HIGH else self.limit
+
+    def acquire(self, priority=LOW):
+        """
+        Admite una request si hay lugar para su prioridad.
+
+        Returns:
+            float | None: Instante de admisión para `release()`, o None si se rechaza
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity(priority):
+                self.shed[priority] += 1
+                return None
+            self.in_flight += 1
+            self.admitted += 1
+        return time.monotonic()
+
+    def release(self, started):
+        """Libera el lugar de una request admitida en `started` y ajusta el límite según su duración."""
+        now = time.monotonic()
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            if now - started > self.latency_target:
+                if started < self._last_decrease:
+                    return
+                previous = self.limit
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+            else:
+                if in_flight * 2 >= self.limit:
+                    self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                return
+        logger.warning(
+            f"Límite de concurrencia reducido de {previous:.1f} a {self.limit:.1f} "
+            f"(request de {now - started:.2f}s)"
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'admitted': self.admitted,
+                'shed_low': self.shed[LOW],
+                'shed_high': self.shed[HIGH],
+                'decreases': self.decreases,
+            }
+
+
+limiter = AdaptiveLimiter()
@@ -1,4 +1,13 @@
-from django.apps import AppConfig
+from pathlib import Path
+
+from django.apps import AppConfig, apps
+from django.conf import settings
+
+
+def project_apps():
+    """Devuelve las aplicaciones instaladas que pertenecen al proyecto (no a site-packages)."""
+    base_dir = Path(settings.BASE_DIR).resolve()
+    return [app for app in apps.get_app_configs() if base_dir in Path(app.path).resolve().parents]
 
 
 class CoreConfig(AppConfig):
@@ -12,8 +21,7 @@ class CoreConfig(AppConfig):
     name = 'core'
 
     def ready(self):
-        """Importar componentes para registrarlos"""
-        try:
-            from components.core.ping import ping
-        except ImportError:
-            pass
+        """Importar componentes para registrarlos desde el índice precalculado (ver core/warmup.py)"""
+        from .warmup import register_components
+
+        register_components()
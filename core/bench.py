@@ -0,0 +1,240 @@
+"""
+Benchmark en proceso de las URLs del proyecto.
+
+Recorre `ROOT_URLCONF` (incluye `core.urls`), toma cada ruta con nombre y sin
+parámetros y la ejecuta con el cliente de pruebas de Django, con y sin la cabecera
+`HX-Request`. Las rutas de `SKIPPED_URL_NAMES` solo se miden si se piden por nombre.
+Por cada variante mide:
+
+- Throughput, latencias p50/p95/p99 y tiempo de CPU por request con `concurrency`
+  hilos, cada uno con su cliente.
+- Queries, pico de memoria asignada (`tracemalloc`, sobre lo ya asignado al empezar) y
+  bytes enviados (con compresión) por request, en una pasada secuencial aparte para que
+  `tracemalloc` no distorsione las latencias.
+
+Las requests se envían como un navegador (`Accept-Encoding` y `Sec-Fetch-Site`), de
+modo que los bytes medidos son los que viajarían por la red.
+
+Usa la base de datos configurada (SQLite o Postgres local); no requiere AWS.
+"""
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, URLResolver, get_resolver, reverse
+
+from .budgets import response_size
+
+BENCH_HOST = 'localhost'
+HTMX_HEADERS = {'HTTP_HX_REQUEST': 'true'}
+BROWSER_HEADERS = {'HTTP_ACCEPT_ENCODING': 'br, gzip', 'HTTP_SEC_FETCH_SITE': 'same-origin'}
+EXCLUDED_NAMESPACES = ('admin',)
+# Rutas que un GET anónimo no mide: solo POST, de diagnóstico (`internal_only`) o el stream
+# SSE, que con WSGI responde 501 y con ASGI no termina. Se miden solo si se piden por nombre
+INTERNAL_URL_NAMES = ('metrics', 'db_pool_stats')
+SKIPPED_URL_NAMES = ('upload_start', 'upload_complete', 'upload_abort', 'events', *INTERNAL_URL_NAMES)
+# Margen absoluto para no reportar como regresión el ruido de latencias muy bajas
+LATENCY_SLACK_MS = 1.0
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Variante de una URL a medir."""
+
+    name: str
+    path: str
+    htmx: bool = False
+
+    @property
+    def key(self):
+        return f'{self.name}[htmx]' if self.htmx else self.name
+
+    @property
+    def headers(self):
+        headers = {**BROWSER_HEADERS, **HTMX_HEADERS} if self.htmx else dict(BROWSER_HEADERS)
+        if self.name in INTERNAL_URL_NAMES and settings.METRICS_TOKEN:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {settings.METRICS_TOKEN}'
+        return headers
+
+
+def iter_url_names(patterns, namespace=None):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace in EXCLUDED_NAMESPACES:
+                continue
+            child = pattern.namespace
+            nested = f'{namespace}:{child}' if namespace and child else (child or namespace)
+            yield from iter_url_names(pattern.url_patterns, nested)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+def discover_endpoints(names=None, htmx=True):
+    """
+    Devuelve las variantes a medir de las URLs con nombre y sin parámetros.
+
+    Args:
+        names: Si se indica, solo se incluyen esos nombres de URL (también los de `SKIPPED_URL_NAMES`)
+        htmx: Incluir también la variante con `HX-Request`
+
+    Returns:
+        list[Endpoint]: Variantes en el orden de `ROOT_URLCONF`
+    """
+    endpoints, seen = [], set()
+    for name in iter_url_names(get_resolver().url_patterns):
+        if name in seen or (names and name not in names) or (not names and name in SKIPPED_URL_NAMES):
+            continue
+        seen.add(name)
+        try:
+            path = reverse(name)
+        except NoReverseMatch:
+            continue  # Requiere parámetros
+        endpoints.append(Endpoint(name, path))
+        if htmx:
+            endpoints.append(Endpoint(name, path, htmx=True))
+    return endpoints
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista ordenada."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(fraction * len(values) + 0.5) - 1))
+    return values[index]
+
+
+def run_requests(endpoint, count, close_connections=True):
+    """Ejecuta `count` requests con un cliente propio y devuelve (latencias en ms, estados)."""
+    client = Client(HTTP_HOST=BENCH_HOST)
+    latencies, statuses = [], {}
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get(endpoint.path, **endpoint.headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    finally:
+        if close_connections:
+            connections.close_all()
+    return latencies, statuses
+
+
+def measure_latency(endpoint, requests, concurrency, warmup=0):
+    """Mide throughput y latencias repartiendo `requests` entre `concurrency` hilos."""
+    if warmup:
+        run_requests(endpoint, warmup, close_connections=False)
+    shares = [requests // concurrency + (1 if index < requests % concurrency else 0) for index in range(concurrency)]
+    shares = [share for share in shares if share]
+    start, cpu_start = time.perf_counter(), time.process_time()
+    if len(shares) == 1:
+        # Sin concurrencia se mide en el hilo actual (y con su conexión)
+        results = [run_requests(endpoint, shares[0], close_connections=False)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(shares)) as pool:
+            results = list(pool.map(lambda share: run_requests(endpoint, share), shares))
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+    latencies, statuses = [], {}
+    for thread_latencies, thread_statuses in results:
+        latencies.extend(thread_latencies)
+        for status, count in thread_statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': len(shares),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'cpu_ms_per_request': round(cpu * 1000 / len(latencies), 3) if latencies else 0.0,
+        'statuses': statuses,
+    }
+
+
+def measure_costs(endpoint, samples):
+    """Mide queries, pico de bytes asignados y bytes de respuesta por request en el hilo actual."""
+    client = Client(HTTP_HOST=BENCH_HOST)
+    peak = wire = 0
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(samples):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                response = client.get(endpoint.path, **endpoint.headers)
+                wire += response_size(response)
+                peak += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return {
+        'queries_per_request': round(len(queries) / samples, 2),
+        'peak_alloc_bytes_per_request': peak // samples,
+        'wire_bytes_per_request': wire // samples,
+    }
+
+
+def run_benchmark(endpoints, requests=200, concurrency=4, warmup=10, samples=10):
+    """
+    Mide cada variante y devuelve los resultados indexados por `Endpoint.key`.
+
+    Args:
+        endpoints: Variantes devueltas por `discover_endpoints()`
+        requests: Requests por variante para las latencias
+        concurrency: Hilos concurrentes
+        warmup: Requests descartadas antes de medir
+        samples: Requests secuenciales para medir queries y memoria
+    """
+    results = {}
+    for endpoint in endpoints:
+        result = {'path': endpoint.path, **measure_latency(endpoint, requests, concurrency, warmup)}
+        result.update(measure_costs(endpoint, samples))
+        results[endpoint.key] = result
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Compara los resultados con una línea base.
+
+    La latencia p95, la memoria y los bytes enviados pueden crecer hasta `tolerance`;
+    las queries por request no pueden crecer. El p99 se informa pero no se compara por ser muy ruidoso
+    con pocas requests. Las variantes nuevas o ausentes no se comparan.
+
+    Returns:
+        list[str]: Descripción de cada presupuesto excedido
+    """
+    regressions = []
+    for key, base in baseline.items():
+        current = results.get(key)
+        if current is None:
+            continue
+        limit = base['p95_ms'] * (1 + tolerance) + LATENCY_SLACK_MS
+        if current['p95_ms'] > limit:
+            regressions.append(f"{key}: p95_ms {current['p95_ms']:.2f} > {limit:.2f} (base {base['p95_ms']:.2f})")
+        if current['queries_per_request'] > base['queries_per_request']:
+            regressions.append(
+                f"{key}: queries_per_request {current['queries_per_request']} > {base['queries_per_request']}"
+            )
+        limit = base['peak_alloc_bytes_per_request'] * (1 + tolerance)
+        if current['peak_alloc_bytes_per_request'] > limit:
+            regressions.append(
+                f"{key}: peak_alloc_bytes_per_request {current['peak_alloc_bytes_per_request']} > {int(limit)} "
+                f"(base {base['peak_alloc_bytes_per_request']})"
+            )
+        if 'wire_bytes_per_request' in base and 'wire_bytes_per_request' in current:
+            limit = base['wire_bytes_per_request'] * (1 + tolerance)
+            if current['wire_bytes_per_request'] > limit:
+                regressions.append(
+                    f"{key}: wire_bytes_per_request {current['wire_bytes_per_request']} > {int(limit)} "
+                    f"(base {base['wire_bytes_per_request']})"
+                )
+    return regressions
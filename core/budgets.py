@@ -0,0 +1,110 @@
+"""
+Presupuestos de rendimiento por nombre de URL.
+
+Cada ruta de `core.urls` declara el máximo de queries, el tamaño máximo de la respuesta
+y el tiempo máximo de respuesta. `core.testing.ViewBudgetMixin` los verifica en la suite
+de pruebas, con y sin `HX-Request`, para detectar N+1, accesos extra a sesiones o
+respuestas infladas antes de llegar a producción.
+
+Las queries se cuentan para un visitante nuevo (incluye crear la sesión y su escritura
+en el caché compartido) con el caché de respuestas desactivado, de modo que se mide el
+trabajo real de la vista. El tiempo es el mejor de varias ejecuciones para tolerar el
+ruido del entorno de pruebas.
+"""
+import time
+from dataclasses import dataclass
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+HTMX_HEADERS = {'HTTP_HX_REQUEST': 'true'}
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Límites de una ruta."""
+
+    max_queries: int
+    max_bytes: int
+    max_ms: float
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Peor caso de queries y tamaño, y mejor tiempo de una ruta."""
+
+    queries: int
+    bytes: int
+    ms: float
+
+
+VIEW_BUDGETS = {
+    'health': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+    'db_health_check': Budget(max_queries=1, max_bytes=1024, max_ms=100),
+    'db_pool_stats': Budget(max_queries=0, max_bytes=2048, max_ms=50),
+    'metrics': Budget(max_queries=0, max_bytes=64 * 1024, max_ms=100),
+    # Visitante nuevo: existencia de la sesión y su escritura en el caché compartido (DatabaseCache)
+    'home': Budget(max_queries=7, max_bytes=32 * 1024, max_ms=200),
+    'hello_world': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+    'htmx_demo': Budget(max_queries=0, max_bytes=4096, max_ms=50),
+    # Con el cliente WSGI de pruebas responde 501; el stream solo se sirve con ASGI
+    'events': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+    # Igual que `home`: el token CSRF del formulario crea la sesión
+    'upload': Budget(max_queries=7, max_bytes=16 * 1024, max_ms=200),
+    # Solo POST: con GET se mide la respuesta 405
+    'upload_start': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+    'upload_complete': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+    'upload_abort': Budget(max_queries=0, max_bytes=1024, max_ms=50),
+}
+
+LIMITS = (('queries', 'max_queries'), ('bytes', 'max_bytes'), ('ms', 'max_ms'))
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def measure(path, headers=None, repeat=3):
+    """
+    Mide una ruta `repeat` veces, cada una con un cliente nuevo.
+
+    Returns:
+        Measurement: Máximo de queries y bytes, y mínimo de milisegundos
+    """
+    queries, size, best = 0, 0, float('inf')
+    for _ in range(repeat):
+        client = Client()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(path, **(headers or {}))
+            size = max(size, response_size(response))
+            elapsed = (time.perf_counter() - start) * 1000
+        queries = max(queries, len(captured))
+        best = min(best, elapsed)
+    return Measurement(queries=queries, bytes=size, ms=round(best, 2))
+
+
+def violations(budget, measurement):
+    """Devuelve [(métrica, medido, límite)] de los límites excedidos."""
+    exceeded = []
+    for metric, limit in LIMITS:
+        value, maximum = getattr(measurement, metric), getattr(budget, limit)
+        if value > maximum:
+            exceeded.append((metric, value, maximum))
+    return exceeded
+
+
+def format_violations(rows):
+    """
+    Formatea los presupuestos excedidos como tabla.
+
+    Args:
+        rows: Iterable de (ruta, métrica, medido, límite)
+    """
+    lines = ['Presupuestos excedidos:', f"  {'ruta':<24} {'métrica':<8} {'medido':>10} {'límite':>10} {'diferencia':>11}"]
+    for route, metric, value, maximum in rows:
+        lines.append(f'  {route:<24} {metric:<8} {value:>10} {maximum:>10} {value - maximum:>+11.2f}')
+    return '\n'.join(lines)
@@ -0,0 +1,140 @@
+"""
+Media de los componentes empaquetado con Vite.
+
+`manage.py componentbundles` genera por cada componente registrado con `Media` una
+entrada `frontend/components/<nombre>.js` que importa sus CSS y JS, y el índice
+`frontend/components/bundles.json` que `vite.config.mjs` agrega como inputs. Vite las
+minifica y les agrega hash, y quedan en `static/dist/manifest.json`.
+
+En tiempo de ejecución `core.extensions.ViteBundleExtension` reemplaza el `Media` de
+cada componente con entrada por las etiquetas de su chunk, resueltas con el manifiesto
+de `DJANGO_VITE`. Como django-components solo inserta el Media de los componentes
+renderizados, cada página referencia únicamente los chunks que usa.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django_components import get_component_dirs, registry
+from django_components.util.misc import get_module_info
+
+from .vite import script_tag, stylesheet_tags
+
+ENTRY_HEADER = '// Generado por `manage.py componentbundles`; no editar.\n'
+
+
+def bundles_dir():
+    return Path(settings.BASE_DIR) / 'frontend' / 'components'
+
+
+def bundles_index_path():
+    return bundles_dir() / 'bundles.json'
+
+
+def load_bundles():
+    """Devuelve {nombre: {'entry', 'sources'}} o {} si no se generó el índice."""
+    try:
+        return json.loads(bundles_index_path().read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def source_media(component_cls):
+    """Media declarado por el componente (antes de reemplazarlo por su chunk)."""
+    return getattr(component_cls, '_source_media', None) or getattr(component_cls, 'Media', None)
+
+
+def resolve_source(component_cls, path):
+    """Ruta del archivo de un Media: relativa al módulo del componente o a COMPONENTS.dirs."""
+    _, _, module_file = get_module_info(component_cls)
+    candidates = [Path(module_file).parent / path] if module_file else []
+    candidates += [Path(directory) / path for directory in get_component_dirs(include_apps=False)]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def media_sources(component_cls):
+    """Archivos CSS y JS locales del Media de un componente, relativos a BASE_DIR."""
+    media = source_media(component_cls)
+    if media is None:
+        return []
+    css = getattr(media, 'css', None) or []
+    if isinstance(css, dict):
+        css = [path for paths in css.values() for path in paths]
+    js = getattr(media, 'js', None) or []
+    base_dir = Path(settings.BASE_DIR).resolve()
+    sources = []
+    for path in [*([css] if isinstance(css, str) else css), *([js] if isinstance(js, str) else js)]:
+        if not isinstance(path, str):
+            continue
+        resolved = resolve_source(component_cls, path)
+        if resolved is not None and base_dir in resolved.parents:
+            sources.append(resolved.relative_to(base_dir).as_posix())
+    return sources
+
+
+def build_bundles():
+    """
+    Calcula las entradas de Vite de los componentes registrados.
+
+    Returns:
+        tuple: (índice {nombre: {'entry', 'sources'}}, {ruta de entrada: contenido})
+    """
+    index, files = {}, {}
+    base_dir = Path(settings.BASE_DIR)
+    for name, component_cls in sorted(registry.all().items()):
+        sources = media_sources(component_cls)
+        if not sources:
+            continue
+        entry = bundles_dir() / f'{name}.js'
+        relative_entry = entry.relative_to(base_dir).as_posix()
+        imports = ''.join(
+            f"import '{Path('../..', source).as_posix()}';\n" for source in sources
+        )
+        index[name] = {'entry': relative_entry, 'sources': sources}
+        files[relative_entry] = ENTRY_HEADER + imports
+    return index, files
+
+
+def write_bundles(index, files):
+    """Escribe las entradas y el índice, eliminando entradas de componentes que ya no existen."""
+    directory = bundles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob('*.js'):
+        if stale.relative_to(settings.BASE_DIR).as_posix() not in files:
+            stale.unlink()
+    for path, content in files.items():
+        (Path(settings.BASE_DIR) / path).write_text(content)
+    bundles_index_path().write_text(json.dumps(index, indent=2) + '\n')
+
+
+def bundles_outdated(index, files):
+    """Indica si el índice o alguna entrada guardada difiere de lo calculado."""
+    if load_bundles() != index:
+        return True
+    return any(
+        not (Path(settings.BASE_DIR) / path).is_file() or (Path(settings.BASE_DIR) / path).read_text() != content
+        for path, content in files.items()
+    )
+
+
+class LazyTags:
+    """Descriptor que calcula las etiquetas al resolver el Media (después de cargar settings)."""
+
+    def __init__(self, build):
+        self.build = build
+
+    def __get__(self, instance, owner):
+        return self.build()
+
+
+def bundled_media(entry):
+    """Clase `Media` que referencia solo el chunk de Vite de una entrada."""
+
+    class BundledMedia:
+        js = LazyTags(lambda: [script_tag(entry)])
+        css = LazyTags(lambda: {'all': stylesheet_tags(entry)})
+
+    return BundledMedia
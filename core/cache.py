@@ -0,0 +1,285 @@
+"""
+Backend de caché en dos niveles: LRU en memoria del proceso sobre un caché compartido.
+
+El nivel local está acotado por cantidad de entradas y por bytes, y guarda cada valor
+como mucho `LOCAL_TIMEOUT` segundos para limitar la inconsistencia entre procesos. Las
+lecturas consultan primero el nivel local y luego el compartido (read-through); las
+escrituras van a ambos niveles (write-through). `get_or_set` evita la estampida de
+fallos concurrentes calculando el valor una sola vez por proceso y, mediante un
+candado en el nivel compartido, una sola vez entre procesos.
+
+Junto a cada valor se guarda en el nivel compartido su vencimiento (`tiered-expires:<clave>`),
+de modo que un acierto del compartido se copia al nivel local como mucho por el tiempo que
+le queda a la entrada: un valor con un timeout corto no sobrevive en otros procesos. Las
+entradas sin vencimiento registrado (escritas fuera de este backend) usan `LOCAL_TIMEOUT`.
+
+`delete`, `incr` y `touch` descartan la copia local solo en el proceso que los ejecuta; los
+demás procesos pueden seguir leyendo el valor anterior hasta que venza su copia (como mucho
+`LOCAL_TIMEOUT` segundos). Entre procesos estas operaciones son eventualmente consistentes;
+lo que necesite leer sus propias escrituras desde cualquier worker debe usar directamente el
+caché compartido (como las sesiones).
+
+Ejemplo de configuración:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.TieredCache',
+            'OPTIONS': {'SHARED': 'shared', 'LOCAL_MAX_ENTRIES': 1000, 'LOCAL_MAX_BYTES': 16 * 1024 * 1024},
+        },
+        'shared': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'},
+    }
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from loguru import logger
+
+STAT_NAMES = ('local_hits', 'shared_hits', 'misses', 'sets', 'evictions')
+KEY_LOCK_STRIPES = 64
+_MISSING = object()
+
+
+class LocalTier:
+    """Estado del nivel local, compartido por todos los hilos del proceso."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.RLock()
+        self.key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self.stats = defaultdict(lambda: dict.fromkeys(STAT_NAMES, 0))
+
+
+# Django crea una instancia del backend por hilo; el nivel local se comparte por LOCATION
+_local_tiers = {}
+_local_tiers_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    Caché con nivel local LRU acotado y nivel compartido configurable.
+
+    `LOCATION` identifica el nivel local del proceso (instancias con el mismo LOCATION lo comparten).
+
+    Opciones (`OPTIONS`):
+        SHARED: Alias del caché compartido en CACHES (None para usar solo el nivel local)
+        LOCAL_MAX_ENTRIES: Entradas máximas del nivel local
+        LOCAL_MAX_BYTES: Bytes máximos (valores serializados) del nivel local
+        LOCAL_TIMEOUT: Segundos máximos que una entrada vive en el nivel local
+        STAMPEDE_WAIT: Segundos que `get_or_set` espera a que otro proceso calcule el valor
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED')
+        self.local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 1000))
+        self.local_max_bytes = int(options.get('LOCAL_MAX_BYTES', 16 * 1024 * 1024))
+        self.local_timeout = float(options.get('LOCAL_TIMEOUT', 30))
+        self.stampede_wait = float(options.get('STAMPEDE_WAIT', 2))
+        with _local_tiers_lock:
+            self._tier = _local_tiers.setdefault(location or 'default', LocalTier())
+        self._local = self._tier.entries
+        self._lock = self._tier.lock
+        self._stats = self._tier.stats
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias] if self.shared_alias else None
+
+    # Estadísticas
+
+    def _record(self, key, stat):
+        prefix = key.split(':', 1)[0] if ':' in key else '-'
+        with self._lock:
+            self._stats[prefix][stat] += 1
+
+    def stats(self):
+        """
+        Devuelve los contadores por prefijo de clave y la ocupación del nivel local.
+
+        Returns:
+            dict: {'prefixes': {prefijo: contadores}, 'local_entries': int, 'local_bytes': int}
+        """
+        with self._lock:
+            return {
+                'prefixes': {prefix: dict(counters) for prefix, counters in self._stats.items()},
+                'local_entries': len(self._local),
+                'local_bytes': self._tier.bytes,
+            }
+
+    # Nivel local
+
+    def _local_get(self, full_key):
+        with self._lock:
+            item = self._local.get(full_key)
+            if item is None:
+                return _MISSING
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                self._local_pop(full_key)
+                return _MISSING
+            self._local.move_to_end(full_key)
+        return pickle.loads(payload)
+
+    def _local_set(self, full_key, key, value, timeout):
+        payload = pickle.dumps(value, self.pickle_protocol)
+        if len(payload) > self.local_max_bytes:
+            return
+        ttl = self.local_timeout if timeout is None else min(self.local_timeout, timeout)
+        with self._lock:
+            self._local_pop(full_key)
+            self._local[full_key] = (time.monotonic() + ttl, payload)
+            self._tier.bytes += len(payload)
+            while len(self._local) > self.local_max_entries or self._tier.bytes > self.local_max_bytes:
+                evicted, (_, evicted_payload) = self._local.popitem(last=False)
+                self._tier.bytes -= len(evicted_payload)
+                self._record(evicted.split(':', 2)[-1], 'evictions')
+
+    def _local_pop(self, full_key):
+        with self._lock:
+            item = self._local.pop(full_key, None)
+            if item is not None:
+                self._tier.bytes -= len(item[1])
+
+    # Nivel compartido (los errores degradan a solo nivel local)
+
+    def _shared_call(self, method, *args, default=None, **kwargs):
+        shared = self.shared
+        if shared is None:
+            return default
+        try:
+            return getattr(shared, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Caché compartido no disponible ({method}): {e}")
+            return default
+
+    def _local_ttl(self, timeout):
+        return self._remaining(self.get_backend_timeout(timeout))
+
+    @staticmethod
+    def _remaining(expires_at):
+        return None if expires_at is None else max(0.0, expires_at - time.time())
+
+    @staticmethod
+    def _expires_key(key):
+        return f'tiered-expires:{key}'
+
+    def _shared_set_expiry(self, key, timeout, version):
+        """Registra en el nivel compartido el vencimiento de `key` para los demás procesos."""
+        self._shared_call('set', self._expires_key(key), self.get_backend_timeout(timeout), timeout, version=version)
+
+    # API de Django
+
+    def get(self, key, default=None, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        value = self._local_get(full_key)
+        if value is not _MISSING:
+            self._record(key, 'local_hits')
+            return value
+        expires_key = self._expires_key(key)
+        values = self._shared_call('get_many', [key, expires_key], version=version, default={})
+        if key not in values:
+            self._record(key, 'misses')
+            return default
+        value = values[key]
+        self._record(key, 'shared_hits')
+        ttl = self._remaining(values[expires_key]) if expires_key in values else None
+        self._local_set(full_key, key, value, ttl)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self._shared_call(
+            'set_many', {key: value, self._expires_key(key): self.get_backend_timeout(timeout)}, timeout,
+            version=version,
+        )
+        self._local_set(full_key, key, value, self._local_ttl(timeout))
+        self._record(key, 'sets')
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        if self.shared is None:
+            if self._local_get(full_key) is not _MISSING:
+                return False
+            added = True
+        else:
+            added = self._shared_call('add', key, value, timeout, version=version, default=False)
+            if added:
+                self._shared_set_expiry(key, timeout, version)
+        if added:
+            self._local_set(full_key, key, value, self._local_ttl(timeout))
+            self._record(key, 'sets')
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        self._local_pop(full_key)
+        if self.shared is None:
+            return False
+        touched = self._shared_call('touch', key, timeout, version=version, default=False)
+        if touched:
+            self._shared_set_expiry(key, timeout, version)
+        return touched
+
+    def delete(self, key, version=None):
+        full_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            existed = full_key in self._local
+            self._local_pop(full_key)
+        self._shared_call('delete', self._expires_key(key), version=version)
+        return bool(self._shared_call('delete', key, version=version, default=False)) or existed
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        """Incrementa en el nivel compartido; los demás procesos ven el nuevo valor al vencer su copia local."""
+        full_key = self.make_and_validate_key(key, version=version)
+        self._local_pop(full_key)
+        if self.shared is None:
+            return super().incr(key, delta, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+            self._tier.bytes = 0
+        self._shared_call('clear')
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        """Obtiene o calcula un valor evitando cálculos concurrentes del mismo fallo."""
+        value = self.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        full_key = self.make_and_validate_key(key, version=version)
+        with self._tier.key_locks[hash(full_key) % KEY_LOCK_STRIPES]:
+            value = self.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                return value
+            lock_key = f'tiered-lock:{key}'
+            if self.shared is not None and not self._shared_call('add', lock_key, 1, self.stampede_wait, version=version, default=True):
+                value = self._wait_for_value(key, version)
+                if value is not _MISSING:
+                    return value
+            value = default() if callable(default) else default
+            if value is not None:
+                self.set(key, value, timeout, version=version)
+            self._shared_call('delete', lock_key, version=version)
+            return value
+
+    def _wait_for_value(self, key, version):
+        """Espera a que otro proceso publique el valor en el nivel compartido."""
+        deadline = time.monotonic() + self.stampede_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = self._shared_call('get', key, _MISSING, version=version, default=_MISSING)
+            if value is not _MISSING:
+                return value
+        return _MISSING
@@ -0,0 +1,95 @@
+"""
+Compresión brotli/gzip compartida por los estáticos y las respuestas dinámicas.
+
+`brotli` es opcional: sin el paquete solo se usa gzip.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Sin brotli solo se usa gzip
+    brotli = None
+
+# Codificaciones disponibles en orden de preferencia
+AVAILABLE_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+REJECTED_QUALITIES = ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+
+
+def accepted_encodings(request):
+    """Codificaciones aceptadas por el cliente (sin las marcadas con q=0)."""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in REJECTED_QUALITIES:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def negotiate(request, encodings=AVAILABLE_ENCODINGS):
+    """Primera codificación de `encodings` aceptada por el cliente, o None."""
+    accepted = accepted_encodings(request)
+    return next((encoding for encoding in encodings if encoding in accepted), None)
+
+
+class GzipEncoder:
+    """Compresor gzip incremental."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        """Vacía lo pendiente para que el cliente pueda descomprimir lo recibido."""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """Compresor brotli incremental."""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def encoder(encoding, level):
+    """Crea el compresor de una codificación con el nivel (gzip 1-9) o calidad (brotli 0-11) indicado."""
+    return BrotliEncoder(level) if encoding == 'br' else GzipEncoder(level)
+
+
+def compress(data, encoding, level):
+    compressor = encoder(encoding, level)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, encoding, level):
+    """Comprime un iterable de bytes vaciando el compresor en cada fragmento (no retiene datos)."""
+    compressor = encoder(encoding, level)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding, level):
+    """Versión asíncrona de `compress_stream`."""
+    compressor = encoder(encoding, level)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
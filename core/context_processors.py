@@ -0,0 +1,13 @@
+from .response_cache import CSRF_TOKEN_PLACEHOLDER
+
+
+def response_cache(request):
+    """
+    Reemplaza el token CSRF por un marcador cuando la respuesta se va a cachear.
+
+    `core.response_cache.cache_response(csrf=True)` inserta el token real de cada
+    request al servir la respuesta cacheada.
+    """
+    if getattr(request, 'response_cache_csrf', False):
+        return {'csrf_token': CSRF_TOKEN_PLACEHOLDER}
+    return {}
@@ -0,0 +1,54 @@
+"""
+Métricas del pool de conexiones a la base de datos.
+
+Con `DB_POOL=True` Django mantiene un `psycopg_pool.ConnectionPool` por proceso y por
+alias; este módulo traduce sus estadísticas a nombres estables (esperas, checkouts,
+desbordes) para exponerlas en los endpoints de salud y métricas.
+"""
+from django.db import connections
+
+POOL_STAT_NAMES = {
+    'pool_min': 'min_size',
+    'pool_max': 'max_size',
+    'pool_size': 'size',
+    'pool_available': 'available',
+    'requests_waiting': 'waiting',
+    'requests_num': 'checkouts',
+    'requests_queued': 'overflow',
+    'requests_wait_ms': 'wait_ms',
+    'requests_errors': 'checkout_errors',
+    'returns_bad': 'returns_bad',
+    'connections_num': 'connections_opened',
+    'connections_ms': 'connect_ms',
+    'connections_errors': 'connect_errors',
+    'connections_lost': 'connections_lost',
+    'usage_ms': 'usage_ms',
+}
+# Contadores acumulados que psycopg_pool omite mientras valen cero
+POOL_COUNTERS = (
+    'checkouts', 'overflow', 'wait_ms', 'checkout_errors', 'returns_bad',
+    'connections_opened', 'connect_ms', 'connect_errors', 'connections_lost', 'usage_ms',
+)
+
+
+def pool_stats(alias='default'):
+    """
+    Devuelve las estadísticas del pool de conexiones de un alias.
+
+    Args:
+        alias: Alias de la base de datos en DATABASES
+
+    Returns:
+        dict: Modo de conexión y, si hay pool, sus contadores normalizados
+    """
+    connection = connections[alias]
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return {
+            'mode': 'persistent' if connection.settings_dict.get('CONN_MAX_AGE') else 'per_request',
+            'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+        }
+    stats = {'mode': 'pool', **dict.fromkeys(POOL_COUNTERS, 0)}
+    for key, value in pool.get_stats().items():
+        stats[POOL_STAT_NAMES.get(key, key)] = value
+    return stats
@@ -0,0 +1,296 @@
+"""
+Descargas de media con soporte de rangos y memoria acotada.
+
+Ningún camino carga el archivo completo en el worker:
+
+- Storage local (`FileSystemStorage`): `FileResponse` sobre el archivo abierto. Con
+  Gunicorn (`wsgi.file_wrapper`) el cuerpo se envía con `sendfile` sin pasar por Python;
+  en otros servidores se lee por bloques de `MEDIA_STREAM_CHUNK_SIZE`. `Range` (un solo
+  rango) responde 206 con el archivo posicionado en el inicio del rango, e `If-Range`
+  descarta el rango si el archivo cambió.
+- Storage S3: con `MEDIA_DOWNLOAD_MODE='redirect'` se redirige a una URL prefirmada de
+  `MEDIA_URL_EXPIRES` segundos y el cliente descarga directo del bucket; con `'stream'`
+  el objeto se pide a S3 con el mismo rango y se reenvía en fragmentos de
+  `MEDIA_STREAM_CHUNK_SIZE`, que es el techo de memoria por descarga.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """El rango pedido queda fuera del archivo."""
+
+
+def parse_range(header, size):
+    """
+    Interpreta una cabecera `Range` de un solo rango.
+
+    Returns:
+        tuple | None: (inicio, fin inclusivo), o None si no hay rango o no se soporta
+        (varios rangos o sintaxis inválida), en cuyo caso se envía el archivo completo
+
+    Raises:
+        RangeNotSatisfiable: Si el rango no se solapa con el archivo
+    """
+    match = RANGE_RE.match((header or '').strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Sufijo: los últimos N bytes
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """Indica si el rango sigue siendo válido según `If-Range` (ETag fuerte o fecha exacta)."""
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return not value.startswith('W/') and value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and last_modified is not None and int(last_modified) == date
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+class RangeFile:
+    """
+    Vista de solo lectura de `length` bytes de un archivo a partir de su posición actual.
+
+    Expone `fileno()` para que `sendfile` de Gunicorn parta del desplazamiento del archivo
+    y envíe `Content-Length` bytes; sin `sendfile`, `read()` no pasa del final del rango.
+    No expone `tell()` ni `seek()`, por lo que `FileResponse` respeta el `Content-Length`
+    del rango.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def apply_range(response, byte_range, size):
+    start, end = byte_range
+    response.status_code = 206
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+
+
+def range_not_satisfiable(size):
+    response = HttpResponse(status=416)
+    response['Content-Range'] = f'bytes */{size}'
+    return response
+
+
+def serve_file(request, path, as_attachment=False, filename=None):
+    """
+    Sirve un archivo local con validadores, `Range` e `If-Range`.
+
+    Args:
+        request: Objeto HttpRequest de Django
+        path: Ruta absoluta del archivo
+        as_attachment: Enviar `Content-Disposition: attachment`
+        filename: Nombre ofrecido al descargar (por defecto el del archivo)
+    """
+    try:
+        file = open(path, 'rb')
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise Http404(f'"{path}" no existe')
+    stat = os.fstat(file.fileno())
+    etag, size = file_etag(stat), stat.st_size
+
+    response = get_conditional_response(request, etag=etag, last_modified=stat.st_mtime)
+    if response is not None:
+        file.close()
+        return response
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except RangeNotSatisfiable:
+        file.close()
+        return range_not_satisfiable(size)
+    if byte_range and not if_range_matches(request, etag, stat.st_mtime):
+        byte_range = None
+
+    content_type, _ = mimetypes.guess_type(path)
+    if byte_range:
+        file.seek(byte_range[0])
+        body = RangeFile(file, byte_range[1] - byte_range[0] + 1)
+    else:
+        body = file
+    response = FileResponse(
+        body, as_attachment=as_attachment, filename=filename or os.path.basename(path),
+        content_type=content_type or 'application/octet-stream',
+    )
+    response.block_size = settings.MEDIA_STREAM_CHUNK_SIZE
+    response['Content-Length'] = str(size)
+    if byte_range:
+        apply_range(response, byte_range, size)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+def s3_key(storage, name):
+    return posixpath.join(storage.location, name) if storage.location else name
+
+
+def signed_url(storage, name, as_attachment=False, filename=None):
+    """URL prefirmada de `get_object`, incluso si el storage usa un dominio propio (CDN)."""
+    params = {'Bucket': storage.bucket_name, 'Key': s3_key(storage, name)}
+    if disposition := content_disposition_header(as_attachment, filename or posixpath.basename(name)):
+        params['ResponseContentDisposition'] = disposition
+    return storage.connection.meta.client.generate_presigned_url(
+        'get_object', Params=params, ExpiresIn=settings.MEDIA_URL_EXPIRES,
+    )
+
+
+def object_headers(response, obj):
+    """Copia a la respuesta los metadatos de un `get_object`/`head_object`."""
+    response['Content-Length'] = str(obj['ContentLength'])
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = obj['ETag']
+    response['Last-Modified'] = http_date(obj['LastModified'].timestamp())
+    if obj.get('ContentRange'):
+        response.status_code = 206
+        response['Content-Range'] = obj['ContentRange']
+
+
+def s3_error_response(error, storage, name):
+    """Traduce los errores de S3 a 404, 304 o 416; el resto se propaga."""
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    code = error.response.get('Error', {}).get('Code')
+    if status == 304 or code == 'NotModified':
+        return HttpResponseNotModified()
+    if status == 416 or code == 'InvalidRange':
+        size = storage.size(name)
+        return range_not_satisfiable(size)
+    if status == 404 or code in ('NoSuchKey', '404'):
+        raise Http404(f'"{name}" no existe')
+    raise error
+
+
+def stream_object(request, storage, name, as_attachment=False, filename=None):
+    """
+    Reenvía un objeto de S3 en fragmentos de `MEDIA_STREAM_CHUNK_SIZE`.
+
+    `Range`, `If-None-Match` e `If-Modified-Since` se delegan a S3. `If-Range` se evalúa
+    con un `head_object` previo, solo cuando la request lo incluye junto con `Range`.
+    """
+    client, key = storage.connection.meta.client, s3_key(storage, name)
+    params = {'Bucket': storage.bucket_name, 'Key': key}
+    if etag := request.headers.get('If-None-Match'):
+        params['IfNoneMatch'] = etag
+    elif since := parse_http_date_safe(request.headers.get('If-Modified-Since', '')):
+        params['IfModifiedSince'] = since
+    byte_range = request.headers.get('Range')
+    try:
+        if byte_range and request.headers.get('If-Range'):
+            head = client.head_object(Bucket=storage.bucket_name, Key=key)
+            if not if_range_matches(request, head['ETag'], head['LastModified'].timestamp()):
+                byte_range = None
+        if byte_range and RANGE_RE.match(byte_range.strip()):
+            params['Range'] = byte_range
+        if request.method == 'HEAD':
+            obj = client.head_object(**{param: value for param, value in params.items() if param != 'Range'})
+        else:
+            obj = client.get_object(**params)
+    except ClientError as error:
+        return s3_error_response(error, storage, name)
+
+    content_type = obj.get('ContentType') or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    else:
+        body = obj['Body']
+        response = StreamingHttpResponse(
+            body.iter_chunks(chunk_size=settings.MEDIA_STREAM_CHUNK_SIZE), content_type=content_type,
+        )
+        response._resource_closers.append(body.close)
+    object_headers(response, obj)
+    if disposition := content_disposition_header(as_attachment, filename or posixpath.basename(name)):
+        response['Content-Disposition'] = disposition
+    return response
+
+
+def clean_name(name):
+    """Normaliza el nombre pedido y rechaza las rutas fuera del storage con 404."""
+    name = posixpath.normpath(name).lstrip('/')
+    if name in ('.', '..') or name.startswith('../'):
+        raise Http404(f'"{name}" no existe')
+    return name
+
+
+def can_download(user, name):
+    """
+    Indica si el usuario puede descargar el archivo.
+
+    Los archivos subidos con `core.uploads` (`UPLOAD_PREFIX/<usuario>/...`) son privados de
+    su dueño y del staff; el resto de la media es pública.
+    """
+    prefix = f'{settings.UPLOAD_PREFIX}/'
+    if not clean_name(name).startswith(prefix):
+        return True
+    owner = clean_name(name)[len(prefix):].split('/', 1)[0]
+    return user.is_authenticated and (user.is_staff or str(user.pk) == owner)
+
+
+def serve_storage(request, name, storage=None, as_attachment=False, filename=None):
+    """
+    Sirve un archivo del storage sin cargarlo completo en memoria.
+
+    Args:
+        request: Objeto HttpRequest de Django
+        name: Nombre del archivo en el storage
+        storage: Storage a usar (por defecto `default_storage`)
+        as_attachment: Enviar `Content-Disposition: attachment`
+        filename: Nombre ofrecido al descargar
+
+    Returns:
+        HttpResponse: Archivo local, redirección a una URL prefirmada o streaming desde S3
+    """
+    storage = storage or default_storage
+    name = clean_name(name)
+    if not getattr(storage, 'bucket_name', None):
+        return serve_file(request, storage.path(name), as_attachment=as_attachment, filename=filename)
+    if settings.MEDIA_DOWNLOAD_MODE == 'redirect':
+        return HttpResponseRedirect(signed_url(storage, name, as_attachment=as_attachment, filename=filename))
+    return stream_object(request, storage, name, as_attachment=as_attachment, filename=filename)
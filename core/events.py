@@ -0,0 +1,183 @@
+"""
+Server-Sent Events para actualizaciones en vivo con HTMX.
+
+`/core/events/` mantiene una conexión abierta por cliente y le envía fragmentos HTML como
+eventos con nombre, que la extensión `hx-sse` de HTMX intercambia en la página
+(`sse-swap="<evento>"`). Reemplaza el polling: un solo request por pestaña en lugar de
+un ciclo completo por el stack de middleware en cada actualización.
+
+- `broadcaster` (uno por worker) reparte cada evento a todas las suscripciones; el
+  mensaje se serializa una sola vez. `publish()` se puede llamar desde cualquier hilo.
+- Cada suscripción tiene una cola acotada (`SSE_QUEUE_SIZE`). El servidor ASGI aplica
+  control de flujo al enviar, así que un cliente lento deja de consumir su cola; al
+  llenarse se desconecta en lugar de acumular memoria o frenar a los demás, y el
+  navegador se reconecta solo tras `SSE_RETRY_MS`.
+- Sin eventos, cada `SSE_HEARTBEAT` segundos se envía un comentario para que proxies y
+  balanceadores no cierren la conexión por inactividad.
+- `SSE_MAX_CONNECTIONS` limita las conexiones por worker; por encima se responde 503.
+
+Solo se sirve en modo ASGI: con WSGI cada conexión ocuparía un hilo del worker.
+"""
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+
+HEARTBEAT = b': ping\n\n'
+
+
+class TooManyConnections(Exception):
+    """El worker alcanzó `SSE_MAX_CONNECTIONS`."""
+
+
+def format_event(data, event=None, id=None):
+    """Serializa un evento SSE; cada línea de `data` va en su propio campo `data:`."""
+    lines = []
+    if id is not None:
+        lines.append(f'id: {id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines += [f'data: {line}' for line in str(data).splitlines() or ['']]
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class Subscription:
+    """Cola acotada de mensajes pendientes de una conexión, ligada a su event loop."""
+
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+
+    def offer(self, message):
+        """Encola el mensaje; si la cola está llena descarta lo pendiente y cierra la conexión."""
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class Broadcaster:
+    """Reparte eventos a las conexiones SSE abiertas en el worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._subscriptions.clear()
+            self.published = self.delivered = self.disconnected = self.rejected = 0
+
+    def subscribe(self):
+        """
+        Registra una conexión en el event loop actual.
+
+        Raises:
+            TooManyConnections: Si el worker ya tiene `SSE_MAX_CONNECTIONS` conexiones
+        """
+        subscription = Subscription(settings.SSE_QUEUE_SIZE)
+        with self._lock:
+            if len(self._subscriptions) >= settings.SSE_MAX_CONNECTIONS:
+                self.rejected += 1
+                raise TooManyConnections()
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def connections(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _offer(self, subscription, message):
+        if subscription.offer(message):
+            self.delivered += 1
+        elif subscription.overflowed:
+            self.disconnected += 1
+            self.unsubscribe(subscription)
+
+    def publish(self, data, event=None, id=None):
+        """
+        Envía un evento a todas las conexiones del worker.
+
+        Returns:
+            int: Conexiones a las que se envió
+        """
+        message = format_event(data, event, id)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            self.published += 1
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        for subscription in subscriptions:
+            if subscription.loop is current_loop:
+                self._offer(subscription, message)
+            else:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, message)
+        return len(subscriptions)
+
+    async def stream(self, subscription):
+        """Genera los bytes de la conexión: reintento, eventos y heartbeats hasta desconectar."""
+        try:
+            yield f'retry: {settings.SSE_RETRY_MS}\n\n'.encode()
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), settings.SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self):
+        return {
+            'connections': self.connections(),
+            'published': self.published,
+            'delivered': self.delivered,
+            'disconnected': self.disconnected,
+            'rejected': self.rejected,
+        }
+
+
+broadcaster = Broadcaster()
+
+
+class Ticker:
+    """
+    Publica un evento cada `interval` segundos mientras haya conexiones abiertas.
+
+    Se inicia con `ensure_started()` desde la vista de eventos y termina solo cuando
+    el worker se queda sin conexiones, de modo que no consume nada sin clientes.
+    """
+
+    def __init__(self, event, render, interval):
+        self.event = event
+        self.render = render
+        self.interval = interval
+        self._task = None
+
+    def ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        while broadcaster.connections():
+            broadcaster.publish(self.render(int(time.time())), event=self.event)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,178 @@
+"""
+Extensiones de django-components del proyecto.
+
+Se registran en `COMPONENTS.extensions` (ver settings).
+"""
+import hashlib
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django_components import ComponentExtension, ExtensionComponentConfig
+
+from .bundles import bundled_media, load_bundles
+from .metrics import current_timings
+from .vite import rendered_entries
+
+# Ruta de la plantilla de cada clase de componente (None si usa una plantilla en línea)
+_template_paths = {}
+_template_versions = {}
+
+
+class InstrumentationExtension(ComponentExtension):
+    """
+    Mide el tiempo de render de cada componente en las requests muestreadas.
+
+    El tiempo va desde que el componente recibe sus entradas hasta que termina de
+    renderizarse, por lo que incluye a los componentes anidados.
+    """
+
+    name = "instrumentation"
+
+    def on_component_input(self, ctx):
+        timings = current_timings.get()
+        if timings is not None:
+            timings.component_starts[ctx.component_id] = time.perf_counter()
+
+    def on_component_rendered(self, ctx):
+        timings = current_timings.get()
+        if timings is None:
+            return
+        start = timings.component_starts.pop(ctx.component_id, None)
+        if start is not None:
+            timings.components[ctx.component.name] += (time.perf_counter() - start) * 1000
+
+
+def template_version(component_cls):
+    """
+    Versión de la plantilla de un componente para la clave de caché.
+
+    En DEBUG se consulta la fecha de modificación en cada render, de modo que editar la
+    plantilla invalida los fragmentos cacheados; en producción se calcula una vez por proceso.
+    """
+    if component_cls not in _template_paths:
+        name = component_cls.template_file
+        _template_paths[component_cls] = get_template(name).origin.name if name else None
+    path = _template_paths[component_cls]
+    if path is None:
+        return ''
+    if settings.DEBUG or component_cls not in _template_versions:
+        try:
+            _template_versions[component_cls] = str(os.stat(path).st_mtime_ns)
+        except OSError:
+            _template_versions[component_cls] = ''
+    return _template_versions[component_cls]
+
+
+def user_key(context):
+    request = context.get('request')
+    user = getattr(request, 'user', None)
+    return f'user-{user.pk}' if user is not None and user.is_authenticated else 'anon'
+
+
+class RenderCache(ExtensionComponentConfig):
+    """
+    Política de caché de render de un componente (clase anidada `RenderCache`).
+
+    Ejemplo:
+
+        class Ping(Component):
+            class RenderCache:
+                enabled = True
+                ttl = 600
+                key_props = ['ping']
+
+    Atributos:
+        enabled: Activa la caché para el componente
+        ttl: Segundos de validez de un fragmento (None usa `COMPONENT_CACHE_TTL`)
+        key_props: Props (kwargs) que forman la clave; None usa todos. Los argumentos
+            posicionales siempre forman parte de la clave
+        vary_on_user: Separa los fragmentos por usuario autenticado
+        cache_name: Alias de CACHES donde guardar los fragmentos
+    """
+
+    enabled = False
+    ttl = None
+    key_props = None
+    vary_on_user = False
+    cache_name = 'components'
+
+    def get_cache(self):
+        return caches[self.cache_name]
+
+    def get_cache_key(self, args, kwargs, context):
+        """Clave `component.<nombre>:<hash>`; el prefijo agrupa las estadísticas por componente."""
+        component_cls = type(self.component)
+        props = kwargs if self.key_props is None else {name: kwargs.get(name) for name in self.key_props}
+        parts = [component_cls.class_id, template_version(component_cls), repr(args), repr(sorted(props.items()))]
+        if self.vary_on_user:
+            parts.append(user_key(context))
+        digest = hashlib.sha256('\0'.join(parts).encode()).hexdigest()[:32]
+        return f'component.{self.component.name}:{digest}'
+
+
+class RenderCacheExtension(ComponentExtension):
+    """
+    Memoiza el HTML renderizado de los componentes que declaran `RenderCache.enabled`.
+
+    Un acierto evita `get_template_data`/`get_context_data` y el render de la plantilla.
+    Los componentes con slots rellenados no se cachean, ya que su contenido no forma
+    parte de la clave. Los fragmentos se guardan en `CACHES['components']`, acotado por
+    entradas y bytes, cuyas estadísticas por prefijo dan la tasa de aciertos de cada
+    componente (`caches['components'].stats()` y `/core/metrics/`).
+    """
+
+    name = "render_cache"
+
+    ComponentConfig = RenderCache
+
+    def on_component_input(self, ctx):
+        config = ctx.component.render_cache
+        if not (config.enabled and settings.COMPONENT_CACHE_ENABLED) or ctx.slots:
+            return None
+        config.key = config.get_cache_key(ctx.args, ctx.kwargs, ctx.context)
+        return config.get_cache().get(config.key)
+
+    def on_component_rendered(self, ctx):
+        config = ctx.component.render_cache
+        key = getattr(config, 'key', None)
+        if key is None or ctx.error is not None or ctx.result is None:
+            return
+        ttl = config.ttl if config.ttl is not None else settings.COMPONENT_CACHE_TTL
+        config.get_cache().set(key, ctx.result, timeout=ttl)
+
+
+class ViteBundleExtension(ComponentExtension):
+    """
+    Sirve el Media de los componentes desde sus chunks de Vite (ver `core/bundles.py`).
+
+    Al registrarse un componente con entrada en `frontend/components/bundles.json` su
+    `Media` se reemplaza por el `<script type="module">` y los `<link>` de su chunk,
+    con hash y minificado, en lugar de un request por cada CSS y JS sin procesar. El
+    `Media` original queda en `_source_media` para regenerar las entradas.
+
+    Cada render anota la entrada del componente en `core.vite.rendered_entries` para las
+    cabeceras de precarga. Debe ir antes de `RenderCacheExtension`, cuyos aciertos omiten
+    los hooks de las extensiones siguientes.
+    """
+
+    name = "vite_bundle"
+
+    def on_component_input(self, ctx):
+        entries = rendered_entries.get()
+        entry = getattr(ctx.component_cls, '_vite_entry', None)
+        if entries is not None and entry is not None:
+            entries.append(entry)
+
+    def on_component_registered(self, ctx):
+        if not settings.COMPONENT_BUNDLES_ENABLED:
+            return
+        bundle = load_bundles().get(ctx.name)
+        component_cls = ctx.component_cls
+        if bundle is None or '_source_media' in component_cls.__dict__:
+            return
+        component_cls._source_media = component_cls.Media
+        component_cls._vite_entry = bundle['entry']
+        component_cls.Media = bundled_media(bundle['entry'])
@@ -0,0 +1,134 @@
+"""
+Carril rápido para los endpoints de salud en la entrada WSGI/ASGI.
+
+Las sondas de App Runner llegan con mucha frecuencia; atenderlas con el stack completo
+implica middleware de sesiones, CSRF, autenticación, validación de ALLOWED_HOSTS y
+resolución de URLs. Estos envoltorios responden las rutas registradas antes de entrar
+a Django:
+
+- `health`: bytes de respuesta precalculados.
+- `db_health_check`: el resultado cacheado del monitor de base de datos. Si hace falta
+  una verificación en vivo (`?fresh=1`, sin resultado o vencido), la request sigue el
+  camino normal de Django.
+"""
+import json
+
+from django.urls import reverse
+
+from .health import db_monitor
+from .views import HEALTH_OK, db_health_payload
+
+STATUS_LINES = {200: '200 OK', 500: '500 Internal Server Error'}
+BASE_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('X-Content-Type-Options', 'nosniff'),
+    ('Cache-Control', 'no-store'),
+]
+
+
+def json_result(payload, status=200):
+    """Serializa igual que JsonResponse y devuelve (status, headers, body)."""
+    body = json.dumps(payload).encode()
+    return status, [*BASE_HEADERS, ('Content-Length', str(len(body)))], body
+
+
+LIVENESS_RESULT = json_result(HEALTH_OK)
+
+
+def liveness_probe(query_string):
+    return LIVENESS_RESULT
+
+
+def db_probe(query_string):
+    """Sirve el estado cacheado de la base de datos, o None para delegar en Django."""
+    db_monitor.ensure_started()
+    if 'fresh=1' in query_string.split('&') or db_monitor.needs_check():
+        return None
+    payload, status = db_health_payload(db_monitor.cached())
+    return json_result(payload, status)
+
+
+class ProbeRegistry:
+    """Mapa ruta -> sonda, resuelto de forma diferida a partir de los nombres de URL."""
+
+    url_names = {
+        'health': liveness_probe,
+        'db_health_check': db_probe,
+    }
+
+    def __init__(self):
+        self._probes = None
+
+    def get(self, path):
+        if self._probes is None:
+            self._probes = {reverse(name): probe for name, probe in self.url_names.items()}
+        return self._probes.get(path)
+
+    def answer(self, method, path, query_string):
+        """Devuelve (status, headers, body) si la request es una sonda registrada, o None."""
+        if method not in ('GET', 'HEAD'):
+            return None
+        probe = self.get(path)
+        if probe is None:
+            return None
+        result = probe(query_string)
+        if result is not None and method == 'HEAD':
+            return result[0], result[1], b''
+        return result
+
+
+class FastPathWSGI:
+    """Envoltorio WSGI que responde las sondas registradas sin pasar por Django."""
+
+    def __init__(self, application, registry=None):
+        self.application = application
+        self.registry = registry or ProbeRegistry()
+
+    def __call__(self, environ, start_response):
+        result = self.registry.answer(
+            environ.get('REQUEST_METHOD', 'GET'), environ.get('PATH_INFO', ''), environ.get('QUERY_STRING', '')
+        )
+        if result is None:
+            return self.application(environ, start_response)
+        status, headers, body = result
+        start_response(STATUS_LINES[status], headers)
+        return [body]
+
+
+class FastPathASGI:
+    """
+    Envoltorio ASGI que responde las sondas registradas sin pasar por Django.
+
+    Si el servidor soporta la extensión `http.response.early_hint`, agrega al scope
+    `early_hints` para que el middleware pueda enviar un 103 antes de la respuesta.
+    """
+
+    def __init__(self, application, registry=None):
+        self.application = application
+        self.registry = registry or ProbeRegistry()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            query_string = scope.get('query_string', b'').decode('latin-1')
+            result = self.registry.answer(scope['method'], scope['path'], query_string)
+            if result is not None:
+                status, headers, body = result
+                await send({
+                    'type': 'http.response.start',
+                    'status': status,
+                    'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+                })
+                await send({'type': 'http.response.body', 'body': body})
+                return
+            if 'http.response.early_hint' in scope.get('extensions', {}):
+                scope['early_hints'] = early_hints_sender(send)
+        await self.application(scope, receive, send)
+
+
+def early_hints_sender(send):
+    """Envía un 103 Early Hints con la extensión ASGI; `core.middleware.PreloadMiddleware` lo usa."""
+
+    async def send_early_hints(links):
+        await send({'type': 'http.response.early_hint', 'links': [link.encode('latin-1') for link in links]})
+
+    return send_early_hints
@@ -0,0 +1,138 @@
+"""
+Monitor de salud de la base de datos con resultado cacheado por proceso.
+
+Un hilo de fondo ejecuta `SELECT 1` cada `HEALTH_DB_INTERVAL` segundos y guarda el
+último resultado, su latencia y una tasa de error móvil. El endpoint de salud sirve
+ese resultado sin tocar la base de datos, salvo que se pida una verificación en vivo
+(`?fresh=1`) o que el resultado cacheado esté vencido.
+"""
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+
+
+@dataclass(frozen=True)
+class HealthResult:
+    """Resultado de una verificación de la base de datos."""
+
+    ok: bool
+    checked_at: float
+    latency_ms: float
+
+
+class DatabaseHealthMonitor:
+    """
+    Verifica periódicamente la conexión a la base de datos y cachea el resultado.
+
+    Args:
+        alias: Alias de la base de datos a verificar
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Descarta el resultado cacheado y el historial de errores (usado en pruebas y tras fork)."""
+        with self._lock:
+            self._last = None
+            self._history = deque(maxlen=settings.HEALTH_DB_WINDOW)
+            self._stop = threading.Event()
+            self._thread = None
+            self._pid = os.getpid()
+
+    @property
+    def interval(self):
+        return settings.HEALTH_DB_INTERVAL
+
+    def ping(self):
+        """Ejecuta `SELECT 1` con la conexión del hilo actual."""
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    def check(self):
+        """Ejecuta una verificación en vivo y actualiza el resultado cacheado."""
+        start = time.perf_counter()
+        try:
+            self.ping()
+            ok = True
+        except Exception:
+            ok = False
+        result = HealthResult(ok=ok, checked_at=time.time(), latency_ms=(time.perf_counter() - start) * 1000)
+        with self._lock:
+            self._last = result
+            self._history.append(ok)
+        return result
+
+    def needs_check(self, fresh=False):
+        """Indica si hace falta una verificación en vivo (sin resultado, vencido o forzado)."""
+        last = self._last
+        if fresh or last is None:
+            return True
+        max_age = max(self.interval * 2, 1.0) if self.interval > 0 else settings.HEALTH_DB_MAX_AGE
+        return time.time() - last.checked_at > max_age
+
+    def snapshot(self, fresh=False):
+        """
+        Devuelve el estado de la base de datos, verificando en vivo solo si es necesario.
+
+        Args:
+            fresh: Fuerza una verificación en vivo
+
+        Returns:
+            dict: Estado, antigüedad del resultado, latencia y tasa de error móvil
+        """
+        self.ensure_started()
+        if self.needs_check(fresh):
+            return self.describe(self.check(), live=True)
+        return self.cached()
+
+    def cached(self):
+        """Devuelve el último resultado sin verificar en vivo (requiere que `needs_check()` sea False)."""
+        return self.describe(self._last, live=False)
+
+    def describe(self, result, live):
+        with self._lock:
+            history = list(self._history)
+        return {
+            'ok': result.ok,
+            'source': 'live' if live else 'cache',
+            'age_s': round(max(0.0, time.time() - result.checked_at), 3),
+            'latency_ms': round(result.latency_ms, 3),
+            'error_rate': round(history.count(False) / len(history), 3) if history else 0.0,
+            'samples': len(history),
+        }
+
+    def ensure_started(self):
+        """Inicia el hilo de fondo del proceso actual si está habilitado."""
+        if self.interval <= 0 or (self._thread is not None and self._pid == os.getpid()):
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._thread, self._pid = None, os.getpid()
+                self._stop = threading.Event()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='db-health-monitor', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo de fondo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval if self._last else 0):
+            self.check()
+            # Devuelve la conexión (al pool o cerrándola) para no retenerla entre verificaciones
+            connections[self.alias].close()
+
+
+db_monitor = DatabaseHealthMonitor()
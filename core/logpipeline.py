@@ -0,0 +1,124 @@
+"""
+Formato y muestreo de los logs de la aplicación.
+
+Con `LOG_FORMAT=json` cada registro se emite como una línea de JSON compacto:
+
+    {"ts":"2025-01-01T12:00:00.000Z","level":"INFO","logger":"access","msg":"GET /core/home/ 200",
+     "src":"core.middleware:finish:98","method":"GET","path":"/core/home/","status":200,...}
+
+Los campos de `extra` (`logger.bind()` o argumentos con nombre) se agregan a la línea.
+`logger` es el módulo que emitió el registro, salvo que se indique otro con
+`logger.bind(logger=...)` (por ejemplo `access`, las líneas de acceso de
+`core.middleware.InstrumentationMiddleware`).
+
+`Sampler` conserva solo una fracción de los registros DEBUG e INFO de cada logger
+(`LOG_SAMPLE_RATE` y `LOG_SAMPLE_RATES`); WARNING y superiores se emiten siempre. La
+decisión se toma una vez por registro en el `patcher`, de modo que todos los handlers
+emiten el mismo subconjunto, y los registros conservados llevan `sample_rate` para poder
+reponderar los conteos.
+
+Este módulo no depende de Django porque se usa desde `project/settings.py`.
+"""
+import json
+import random
+import traceback
+from datetime import timezone
+
+SAMPLED_MAX_LEVEL = 20  # INFO
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+# Claves de `extra` de uso interno que no se copian a la línea JSON
+INTERNAL_EXTRA = ('logger', 'json_line', 'sampled')
+
+
+def record_logger(record):
+    return record['extra'].get('logger') or record['name']
+
+
+def json_line(record):
+    """Serializa un registro de Loguru como JSON compacto."""
+    payload = {
+        'ts': record['time'].astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+        'level': record['level'].name,
+        'logger': record_logger(record),
+        'msg': record['message'],
+        'src': f"{record['name']}:{record['function']}:{record['line']}",
+    }
+    for key, value in record['extra'].items():
+        if key not in INTERNAL_EXTRA:
+            payload[key] = value
+    if record['exception'] is not None:
+        kind, error, trace = record['exception']
+        payload['exc'] = ''.join(traceback.format_exception(kind, error, trace))
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def json_format(record):
+    """Formato de Loguru que emite `json_line()` (las llaves del JSON no se interpretan)."""
+    record['extra']['json_line'] = json_line(record)
+    return '{extra[json_line]}\n'
+
+
+def parse_rates(value):
+    """
+    Interpreta `LOG_SAMPLE_RATES`.
+
+    Args:
+        value: Pares `logger=tasa` separados por comas, p. ej. `access=0.1,core.cache=0.5`
+
+    Returns:
+        dict: Prefijo de logger -> tasa entre 0 y 1
+    """
+    rates = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition('=')
+        rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class Sampler:
+    """
+    Muestreo por logger de los registros DEBUG e INFO.
+
+    Args:
+        rate: Tasa por defecto entre 0 y 1
+        rates: Tasas por prefijo de logger (gana el prefijo más largo)
+    """
+
+    def __init__(self, rate=1.0, rates=None):
+        self.rate = rate
+        self.rates = dict(rates or {})
+        self._cache = {}
+        self.dropped = 0
+
+    def rate_for(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(f'{prefix}.')]
+            rate = self.rates[max(matches, key=len)] if matches else self.rate
+            self._cache[name] = rate
+        return rate
+
+    def patch(self, record):
+        """`patcher` de Loguru: decide una vez si el registro se conserva."""
+        if record['level'].no > SAMPLED_MAX_LEVEL:
+            return
+        rate = self.rate_for(record_logger(record))
+        if rate >= 1.0:
+            return
+        if random.random() < rate:
+            record['extra']['sample_rate'] = rate
+        else:
+            record['extra']['sampled'] = False
+            self.dropped += 1
+
+    def filter(self, record):
+        """`filter` de cada handler: descarta los registros que el muestreo no conservó."""
+        return record['extra'].get('sampled', True)
+
+    def stats(self):
+        return {'sampled_out': self.dropped}
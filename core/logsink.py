@@ -0,0 +1,264 @@
+"""
+Sinks de Loguru que escriben los logs en segundo plano.
+
+Los registros se encolan sin bloquear el hilo de la request y un hilo de fondo los
+escribe. La cola está acotada y, al llenarse, se descartan registros (`policy="drop"`)
+o se espera un tiempo máximo (`policy="block"`).
+
+- `StreamLogSink`: escribe en un stream (stdout) agrupando los registros disponibles en
+  una sola escritura.
+- `S3LogSink`: agrupa por tamaño y tiempo, comprime cada lote con gzip y lo sube a S3
+  como un objeto independiente.
+
+Este módulo no depende de Django porque se instancia desde `project/settings.py`.
+"""
+import atexit
+import gzip
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+
+
+class QueuedSink:
+    """
+    Base de los sinks con cola acotada y un hilo de fondo por proceso.
+
+    Las subclases implementan `_run()`, que consume `self._queue` (un `None` despierta al
+    hilo para atender `flush()` o `stop()`) y marca los eventos de `self._flush_requests`
+    una vez escrito todo lo anterior.
+
+    Args:
+        max_queue: Cantidad máxima de registros encolados (memoria acotada)
+        policy: "drop" descarta si la cola está llena; "block" espera hasta `block_timeout`
+        block_timeout: Segundos de espera con la política "block" antes de descartar
+    """
+
+    thread_name = 'log-sink'
+    counters = ('queued', 'dropped')
+
+    def __init__(self, max_queue=10000, policy='drop', block_timeout=0.05):
+        if policy not in ('drop', 'block'):
+            raise ValueError(f"Política de cola desconocida: {policy}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.counters, 0)
+        self._reset()
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """Inicializa la cola y el hilo (también tras un fork, donde el hilo no sobrevive)."""
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._flush_requests = queue.Queue()
+        self._stopping = threading.Event()
+        self._worker = None
+        self._pid = os.getpid()
+        self._sequence = 0
+
+    def __call__(self, message):
+        """Encola un registro ya formateado por Loguru."""
+        self._ensure_worker()
+        try:
+            if self.policy == 'block':
+                self._queue.put(str(message), timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(str(message))
+        except queue.Full:
+            self._increment('dropped')
+        else:
+            self._increment('queued')
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._worker.start()
+
+    def _increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def stats(self):
+        """Devuelve los contadores del sink y la profundidad actual de la cola."""
+        with self._lock:
+            counters = dict(self._counters)
+        counters['pending'] = self._queue.qsize()
+        return counters
+
+    def flush(self, timeout=10.0):
+        """
+        Fuerza la escritura de todo lo encolado y espera a que termine.
+
+        Con la cola llena y el hilo de fondo atascado, el marcador de flush tampoco entra:
+        se espera como mucho `timeout` segundos en total y se devuelve False.
+
+        Returns:
+            bool: True si todo lo encolado antes de la llamada quedó escrito a tiempo
+        """
+        if self._worker is None:
+            return True
+        deadline = time.monotonic() + timeout
+        done = threading.Event()
+        self._flush_requests.put(done)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(max(0.0, deadline - time.monotonic()))
+
+    def stop(self, timeout=10.0):
+        """Escribe los registros pendientes y detiene el hilo de fondo."""
+        if self._worker is None or self._pid != os.getpid():
+            return
+        self.flush(timeout)
+        self._stopping.set()
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(timeout)
+        self._worker = None
+
+    def _run(self):
+        raise NotImplementedError
+
+    def _answer_flushes(self):
+        while not self._flush_requests.empty():
+            self._flush_requests.get_nowait().set()
+
+
+class StreamLogSink(QueuedSink):
+    """
+    Sink invocable para `logger.add()` que escribe en un stream desde un hilo de fondo.
+
+    Cada escritura agrupa hasta `batch_lines` registros disponibles en la cola, de modo
+    que con mucho volumen se hace una llamada al sistema por lote y no por registro.
+
+    Args:
+        stream: Destino (por defecto `sys.stdout`, resuelto en cada escritura)
+        batch_lines: Registros máximos por escritura
+        **kwargs: Opciones de la cola (ver `QueuedSink`)
+    """
+
+    thread_name = 'stream-log-sink'
+    counters = ('queued', 'written', 'dropped', 'writes')
+
+    def __init__(self, stream=None, batch_lines=256, **kwargs):
+        self.stream = stream
+        self.batch_lines = batch_lines
+        super().__init__(**kwargs)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_lines:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                self._write(records)
+            if len(records) < len(batch):
+                # Se alcanzó el marcador de flush(): todo lo anterior ya está escrito
+                self._answer_flushes()
+
+    def _write(self, records):
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(''.join(records))
+            stream.flush()
+        except (OSError, ValueError):
+            self._increment('dropped', len(records))
+            return
+        self._increment('writes')
+        self._increment('written', len(records))
+
+
+class S3LogSink(QueuedSink):
+    """
+    Sink invocable para `logger.add()` que envía lotes comprimidos a S3.
+
+    Args:
+        bucket: Bucket destino
+        prefix: Prefijo de las claves (los objetos quedan en `<prefix>/app_<fecha>/...`)
+        batch_bytes: Tamaño máximo sin comprimir de un lote antes de subirlo
+        flush_interval: Segundos máximos que un registro espera en el buffer
+        client_factory: Callable que devuelve un cliente S3 (útil en pruebas)
+        **kwargs: Opciones de la cola (ver `QueuedSink`)
+    """
+
+    thread_name = 's3-log-sink'
+    counters = ('queued', 'shipped', 'dropped', 'batches', 'failed_batches')
+
+    def __init__(self, bucket, prefix='logs', batch_bytes=1024 * 1024, flush_interval=5.0,
+                 client_factory=None, **kwargs):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.batch_bytes = batch_bytes
+        self.flush_interval = flush_interval
+        self.client_factory = client_factory or (lambda: boto3.client('s3'))
+        self.host = socket.gethostname()
+        super().__init__(**kwargs)
+
+    def _run(self):
+        client = None
+        batch, batch_size, deadline = [], 0, None
+        while not self._stopping.is_set():
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            if record is not None:
+                batch.append(record)
+                batch_size += len(record)
+                deadline = deadline or time.monotonic() + self.flush_interval
+                if batch_size < self.batch_bytes:
+                    continue
+            elif deadline is not None and time.monotonic() < deadline and self._flush_requests.empty():
+                continue
+
+            if batch:
+                client = client or self.client_factory()
+                self._ship(client, batch)
+                batch, batch_size, deadline = [], 0, None
+            self._answer_flushes()
+
+    def _ship(self, client, batch):
+        """Comprime un lote y lo sube como un objeto nuevo; reintenta una vez ante errores."""
+        self._sequence += 1
+        now = datetime.now(timezone.utc)
+        key = (
+            f"{self.prefix}/app_{now:%Y-%m-%d}/"
+            f"{now:%H%M%S}-{self.host}-{self._pid}-{self._sequence:06d}.log.gz"
+        )
+        body = gzip.compress(''.join(batch).encode('utf-8'))
+        for attempt in range(2):
+            try:
+                client.put_object(
+                    Bucket=self.bucket, Key=key, Body=body,
+                    ContentType='text/plain', ContentEncoding='gzip',
+                )
+            except (BotoCoreError, ClientError):
+                if attempt:
+                    self._increment('failed_batches')
+                    self._increment('dropped', len(batch))
+                continue
+            self._increment('batches')
+            self._increment('shipped', len(batch))
+            return
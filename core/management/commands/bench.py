@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bench import compare, discover_endpoints, run_benchmark
+
+
+class Command(BaseCommand):
+    """
+    Benchmark en proceso de todas las URLs con nombre del proyecto.
+
+    Mide throughput, latencias p50/p95/p99, CPU, queries, bytes asignados y bytes
+    enviados por request de cada URL con y sin `HX-Request`, y opcionalmente compara
+    contra una línea base guardada, fallando si se excede algún presupuesto.
+    """
+
+    help = 'Mide el rendimiento de las URLs del proyecto y lo compara con una línea base.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', dest='urls', help='Nombre de URL a medir (repetible; por defecto todas salvo las de SKIPPED_URL_NAMES).')
+        parser.add_argument('--requests', type=int, default=200, help='Requests por variante.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Hilos concurrentes.')
+        parser.add_argument('--warmup', type=int, default=10, help='Requests de calentamiento por variante.')
+        parser.add_argument('--samples', type=int, default=10, help='Requests para medir queries y memoria.')
+        parser.add_argument('--no-htmx', action='store_true', help='Omite la variante con HX-Request.')
+        parser.add_argument('--output', help='Archivo JSON donde guardar los resultados.')
+        parser.add_argument('--baseline', help='Archivo JSON de línea base con el que comparar.')
+        parser.add_argument('--update-baseline', action='store_true', help='Guarda los resultados como nueva línea base.')
+        parser.add_argument('--tolerance', type=float, default=0.2, help='Crecimiento admitido de latencia y memoria (0.2 = 20%%).')
+
+    def handle(self, *args, **options):
+        endpoints = discover_endpoints(names=options['urls'], htmx=not options['no_htmx'])
+        if not endpoints:
+            raise CommandError('No hay URLs para medir.')
+        if options['update_baseline'] and not options['baseline']:
+            raise CommandError('--update-baseline requiere --baseline.')
+
+        results = run_benchmark(
+            endpoints,
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+            warmup=options['warmup'],
+            samples=options['samples'],
+        )
+        self.report(results)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2, sort_keys=True))
+        if not options['baseline']:
+            return
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f'Línea base guardada en {baseline_path}.'))
+            return
+        if not baseline_path.exists():
+            raise CommandError(f'No existe la línea base {baseline_path}; crearla con --update-baseline.')
+        regressions = compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(f'  {regression}')
+            raise CommandError(f'{len(regressions)} presupuestos excedidos respecto a {baseline_path}.')
+        self.stdout.write(self.style.SUCCESS(f'Sin regresiones respecto a {baseline_path}.'))
+
+    def report(self, results):
+        width = max(len(key) for key in results)
+        self.stdout.write(
+            f"{'URL':<{width}}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  "
+            f"{'CPU ms':>7}  {'queries':>7}  {'KB pico':>8}  {'KB red':>7}  estados"
+        )
+        for key, result in results.items():
+            statuses = ' '.join(f'{status}x{count}' for status, count in sorted(result['statuses'].items()))
+            self.stdout.write(
+                f"{key:<{width}}  {result['rps']:>8.1f}  {result['p50_ms']:>8.2f}  {result['p95_ms']:>8.2f}  "
+                f"{result['p99_ms']:>8.2f}  {result['cpu_ms_per_request']:>7.2f}  {result['queries_per_request']:>7}  "
+                f"{result['peak_alloc_bytes_per_request'] / 1024:>8.1f}  {result['wire_bytes_per_request'] / 1024:>7.1f}  {statuses}"
+            )
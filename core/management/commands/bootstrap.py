@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+from core.apps import project_apps
+from core.static_assets import compress_static
+from core.staticsync import sync_static
+
+# El estado vive en una tabla propia de la base de datos (compartida entre instancias,
+# disponible antes de migrar y fuera del storage de estáticos, que es público)
+STATE_TABLE = 'core_bootstrap_state'
+SOURCE_SUFFIXES = ('.py', '.html', '.css', '.js')
+# Pruebas de humo del arranque; los presupuestos de latencia y las pruebas con S3 simulado
+# (moto) se ejecutan en desarrollo y CI, no en el contenedor de producción
+BOOT_TEST_LABELS = ('tests', 'core.tests.test_views', 'core.tests.test_models')
+EXCLUDED_DIRS = {'.venv', 'venv', 'node_modules', 'staticfiles', 'static', 'mediafiles', '__pycache__', '.git'}
+
+
+def hash_files(paths):
+    """
+    Calcula un hash SHA-256 combinado de una colección de archivos.
+
+    Args:
+        paths: Iterable de tuplas (nombre_relativo, ruta_absoluta)
+
+    Returns:
+        str: Digest hexadecimal que cambia si cambia algún nombre o contenido
+    """
+    digest = hashlib.sha256()
+    for name, path in sorted(paths):
+        digest.update(name.encode())
+        digest.update(b'\0')
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(65536), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def models_fingerprint():
+    """Hash de los modelos y migraciones de las apps del proyecto (entradas de makemigrations)."""
+    files = []
+    for app in project_apps():
+        app_path = Path(app.path)
+        candidates = [app_path / 'models.py', *sorted((app_path / 'migrations').glob('*.py'))]
+        files.extend((str(path.relative_to(settings.BASE_DIR)), path) for path in candidates if path.is_file())
+    return hash_files(files)
+
+
+def migration_graph_fingerprint(executor):
+    """Hash del grafo de migraciones: nodos y sus dependencias."""
+    graph = executor.loader.graph
+    nodes = sorted(
+        [list(node), sorted(list(parent) for parent in graph.node_map[node].parents)]
+        for node in graph.nodes
+    )
+    return hashlib.sha256(json.dumps(nodes).encode()).hexdigest()
+
+
+def source_fingerprint():
+    """Hash del código fuente del proyecto (entradas de la suite de pruebas)."""
+    base_dir = Path(settings.BASE_DIR)
+    files = []
+    for root, dirnames, filenames in os.walk(base_dir):
+        # Poda durante el recorrido: no se entra en node_modules, .venv, .git, etc.
+        dirnames[:] = [name for name in dirnames if name not in EXCLUDED_DIRS]
+        for filename in filenames:
+            path = Path(root, filename)
+            if path.suffix in SOURCE_SUFFIXES:
+                files.append((str(path.relative_to(base_dir)), path))
+    return hash_files(files)
+
+
+class Command(BaseCommand):
+    """
+    Ejecuta en un único proceso todos los pasos de arranque de la instancia.
+
+    Reemplaza las múltiples invocaciones de manage.py en scripts/start.sh:
+    makemigrations, migrate, tabla de caché, sincronización y compresión de estáticos, verificación de
+    superusuario, limpieza de sesiones vencidas y pruebas. Cada paso guarda el hash de sus
+    entradas en la tabla `core_bootstrap_state`, de modo que las instancias nuevas omiten
+    los pasos cuyas entradas no cambiaron.
+    """
+
+    help = 'Ejecuta los pasos de arranque en un solo proceso, omitiendo los que no cambiaron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Ejecuta todos los pasos ignorando el estado guardado.')
+        parser.add_argument('--skip-tests', action='store_true', help='No ejecuta la suite de pruebas.')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.state = {} if options['force'] else self.load_state()
+        self.timings = []
+
+        steps = [
+            ('makemigrations', models_fingerprint, self.run_makemigrations),
+            ('migrate', None, self.run_migrate),
+            ('createcachetable', None, self.run_createcachetable),
+            ('staticfiles', None, self.run_staticfiles),
+            ('compressstatic', None, self.run_compressstatic),
+            ('superuser', None, self.run_superuser),
+            ('clearsessions', None, self.run_clearsessions),
+        ]
+        if not options['skip_tests']:
+            steps.append(('tests', source_fingerprint, self.run_tests))
+
+        total_start = time.perf_counter()
+        for name, fingerprint, runner in steps:
+            self.run_step(name, fingerprint, runner)
+        total = time.perf_counter() - total_start
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Resumen de arranque:'))
+        for name, status, elapsed in self.timings:
+            self.stdout.write(f'  {name:<16} {status:<10} {elapsed * 1000:>9.1f} ms')
+        self.stdout.write(self.style.SUCCESS(f'  {"total":<16} {"":<10} {total * 1000:>9.1f} ms'))
+
+    def run_step(self, name, fingerprint, runner):
+        """Ejecuta un paso si su huella cambió y registra su duración."""
+        start = time.perf_counter()
+        self.stdout.write(self.style.MIGRATE_HEADING(f'==> {name}'))
+        digest = fingerprint() if fingerprint else None
+        if digest is not None and self.state.get(name) == digest:
+            status = 'omitido'
+            self.stdout.write('    Sin cambios en las entradas, paso omitido.')
+        else:
+            result = runner(digest)
+            status = 'omitido' if result is False else 'ejecutado'
+            if digest is not None:
+                self.state[name] = digest
+                self.save_state()
+        self.timings.append((name, status, time.perf_counter() - start))
+
+    def run_makemigrations(self, digest):
+        call_command('makemigrations', interactive=False, verbosity=self.verbosity)
+
+    def run_migrate(self, digest):
+        """Migra solo si el grafo cambió o hay migraciones pendientes."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connection)
+        graph_digest = migration_graph_fingerprint(executor)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan and self.state.get('migrate') == graph_digest:
+            self.stdout.write('    Grafo de migraciones sin cambios y sin migraciones pendientes.')
+            return False
+        call_command('migrate', interactive=False, verbosity=self.verbosity)
+        self.state['migrate'] = graph_digest
+        self.save_state()
+
+    def run_createcachetable(self, digest):
+        """Crea la tabla del caché compartido si no existe (no hace nada si ya existe)."""
+        call_command('createcachetable', verbosity=self.verbosity)
+
+    def run_staticfiles(self, digest):
+        """Sincroniza solo los estáticos modificados según el manifiesto del storage."""
+        result = sync_static()
+        self.stdout.write(f'    {len(result.uploaded)} archivos subidos, {result.unchanged} sin cambios.')
+        if not result.uploaded:
+            return False
+
+    def run_compressstatic(self, digest):
+        """Precomprime los estáticos cuando los sirve Django (`STATIC_SERVE`)."""
+        if not settings.STATIC_SERVE:
+            self.stdout.write('    Los estáticos se sirven desde el CDN, paso omitido.')
+            return False
+        written = compress_static()
+        self.stdout.write(f'    {len(written)} variantes comprimidas escritas.')
+        if not written:
+            return False
+
+    def run_superuser(self, digest):
+        """Crea el superusuario desde las variables DJANGO_SUPERUSER_* si no existe."""
+        if get_user_model().objects.filter(is_superuser=True).exists():
+            self.stdout.write('    Superusuario ya existe, omitiendo creación.')
+            return False
+        call_command('createsuperuser', interactive=False, verbosity=self.verbosity)
+
+    def run_clearsessions(self, digest):
+        """Elimina en lotes las sesiones vencidas."""
+        call_command('clearsessions', verbosity=self.verbosity)
+
+    def run_tests(self, digest):
+        """Ejecuta las pruebas de humo (`BOOT_TEST_LABELS`)."""
+        call_command('test', *BOOT_TEST_LABELS, interactive=False, verbosity=2)
+
+    def load_state(self):
+        """Lee el estado guardado en la base de datos (vacío si la tabla todavía no existe)."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        try:
+            if STATE_TABLE not in connection.introspection.table_names():
+                return {}
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT state FROM {connection.ops.quote_name(STATE_TABLE)} WHERE id = 1')
+                row = cursor.fetchone()
+            return json.loads(row[0]) if row else {}
+        except Exception as e:
+            self.stderr.write(f'No se pudo leer el estado de arranque: {e}')
+        return {}
+
+    def save_state(self):
+        """Persiste el estado de arranque reemplazando la versión anterior."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        table = connection.ops.quote_name(STATE_TABLE)
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS), connection.cursor() as cursor:
+                cursor.execute(f'CREATE TABLE IF NOT EXISTS {table} (id integer PRIMARY KEY, state text NOT NULL)')
+                cursor.execute(f'DELETE FROM {table} WHERE id = 1')
+                cursor.execute(f'INSERT INTO {table} (id, state) VALUES (1, %s)', [json.dumps(self.state)])
+        except Exception as e:
+            self.stderr.write(f'No se pudo guardar el estado de arranque: {e}')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bundles import build_bundles, bundles_index_path, bundles_outdated, write_bundles
+
+
+class Command(BaseCommand):
+    """
+    Genera las entradas de Vite con el Media de los componentes registrados (`core.bundles`).
+
+    Debe volver a ejecutarse (y versionarse) al cambiar el `Media` de un componente, antes
+    de `npm run build`, ya que el build de Vite no tiene acceso a la configuración de Django.
+    """
+
+    help = 'Genera frontend/components/ con una entrada de Vite por componente y su índice bundles.json.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Falla si las entradas guardadas están desactualizadas.')
+
+    def handle(self, *args, **options):
+        index, files = build_bundles()
+        if options['check']:
+            if bundles_outdated(index, files):
+                raise CommandError(f'{bundles_index_path()} está desactualizado; ejecutar `manage.py componentbundles`.')
+            self.stdout.write(self.style.SUCCESS('Las entradas de los componentes están actualizadas.'))
+            return
+        write_bundles(index, files)
+        self.stdout.write(self.style.SUCCESS(f'{len(index)} entradas de componentes en {bundles_index_path()}.'))
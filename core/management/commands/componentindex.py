@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.warmup import build_index, index_path, load_index, write_index
+
+
+class Command(BaseCommand):
+    """
+    Genera el índice de componentes y plantillas usado por `core.warmup`.
+
+    Debe volver a ejecutarse (y versionarse) al agregar o quitar componentes o plantillas.
+    """
+
+    help = 'Genera components/index.json con los módulos de componentes y las plantillas del proyecto.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Falla si el índice guardado está desactualizado.')
+
+    def handle(self, *args, **options):
+        index = build_index()
+        if options['check']:
+            if load_index() != index:
+                raise CommandError(f'{index_path()} está desactualizado; ejecutar `manage.py componentindex`.')
+            self.stdout.write(self.style.SUCCESS('El índice de componentes está actualizado.'))
+            return
+        write_index(index)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(index['components'])} componentes y {len(index['templates'])} plantillas en {index_path()}."
+        ))
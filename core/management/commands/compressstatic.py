@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.static_assets import ENCODINGS, compress_static
+
+
+class Command(BaseCommand):
+    """
+    Precomprime los estáticos de `STATICFILES_DIRS` (salidas de Vite) con brotli y gzip.
+
+    Solo reescribe las variantes desactualizadas, por lo que puede ejecutarse en cada build.
+    """
+
+    help = 'Genera variantes .br y .gz de los estáticos comprimibles de STATICFILES_DIRS.'
+
+    def handle(self, *args, **options):
+        written = compress_static()
+        if options['verbosity'] > 1:
+            for path in written:
+                self.stdout.write(f'  {path.relative_to(settings.BASE_DIR)}')
+        encodings = ', '.join(encoding for encoding, _, _ in ENCODINGS)
+        self.stdout.write(self.style.SUCCESS(f'{len(written)} variantes comprimidas escritas ({encodings}).'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core.staticsync import sync_static
+
+
+class Command(BaseCommand):
+    """
+    Sincroniza los archivos estáticos de forma incremental y en paralelo.
+
+    Alternativa a `collectstatic` que sube solo los archivos modificados según el
+    manifiesto guardado en el storage `staticfiles`.
+    """
+
+    help = 'Sube al storage de estáticos solo los archivos modificados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Cantidad de subidas en paralelo.')
+        parser.add_argument('--dry-run', action='store_true', help='Muestra los archivos a subir sin subirlos.')
+        parser.add_argument('--prune', action='store_true', help='Elimina del storage los archivos que ya no existen localmente.')
+
+    def handle(self, *args, **options):
+        result = sync_static(max_workers=options['workers'], dry_run=options['dry_run'], prune=options['prune'])
+        if options['verbosity'] > 1:
+            for name in result.uploaded:
+                self.stdout.write(f'  {name}')
+        verb = 'a subir' if options['dry_run'] else 'subidos'
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(result.uploaded)} archivos {verb}, {result.unchanged} sin cambios, {len(result.stale)} obsoletos '
+            f'({result.elapsed * 1000:.1f} ms).'
+        ))
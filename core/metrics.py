@@ -0,0 +1,313 @@
+"""
+Métricas de requests del proceso en formato de texto de Prometheus.
+
+`core.middleware.InstrumentationMiddleware` registra aquí la duración de cada request
+por nombre de URL (histograma) y, para las requests muestreadas, el desglose de tiempo
+en base de datos, plantillas y componentes. Al renderizar se añaden las estadísticas
+del pool de conexiones, de la caché, del sink de logs, de las conexiones SSE y del
+monitor de salud.
+
+Las métricas son por proceso: con varios workers de Gunicorn cada uno expone las suyas.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from loguru import logger
+
+# Límites superiores (segundos) de los buckets del histograma de latencia
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Desglose de la request en curso; None fuera de una request muestreada
+current_timings = ContextVar('current_timings', default=None)
+
+
+@dataclass
+class RequestTimings:
+    """Tiempos acumulados de una request muestreada (milisegundos)."""
+
+    db_ms: float = 0.0
+    db_queries: int = 0
+    template_ms: float = 0.0
+    template_depth: int = 0
+    components: dict = field(default_factory=lambda: defaultdict(float))
+    component_starts: dict = field(default_factory=dict)
+    compress_ms: float = 0.0
+
+    def server_timing(self, total_ms, view_ms):
+        """Construye el valor de la cabecera `Server-Timing`."""
+        entries = [
+            f'total;dur={total_ms:.1f}',
+            f'mw;dur={max(0.0, total_ms - view_ms):.1f};desc="middleware"',
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'tpl;dur={self.template_ms:.1f};desc="templates"',
+        ]
+        entries += [f'comp-{name};dur={ms:.1f}' for name, ms in self.components.items()]
+        if self.compress_ms:
+            entries.append(f'compress;dur={self.compress_ms:.1f}')
+        return ', '.join(entries)
+
+
+def db_timer(execute, sql, params, many, context):
+    """`execute_wrapper` que acumula el tiempo y la cantidad de queries de la request."""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_ms += (time.perf_counter() - start) * 1000
+        timings.db_queries += 1
+
+
+def time_template_render(render):
+    """Envuelve `Template.render` para medir solo el render más externo de cada request."""
+    def timed_render(self, context):
+        timings = current_timings.get()
+        if timings is None:
+            return render(self, context)
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            timings.template_depth -= 1
+            if timings.template_depth == 0:
+                timings.template_ms += (time.perf_counter() - start) * 1000
+    timed_render.__wrapped__ = render
+    return timed_render
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Devuelve [(límite, conteo acumulado)] incluyendo `+Inf`."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((format_value(bound), total))
+        result.append(('+Inf', self.count))
+        return result
+
+
+class MetricsRegistry:
+    """Acumula las métricas de requests del proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Descarta todas las métricas acumuladas (usado en pruebas)."""
+        with self._lock:
+            self._latency = defaultdict(Histogram)
+            self._responses = defaultdict(int)
+            self._breakdown = defaultdict(lambda: dict.fromkeys(('sampled', 'db_seconds', 'db_queries', 'template_seconds'), 0))
+            self._components = defaultdict(lambda: {'seconds': 0.0, 'renders': 0})
+
+    def observe(self, view, method, status, duration, timings=None):
+        """
+        Registra una request terminada.
+
+        Args:
+            view: Nombre de la URL resuelta (o marcador si no se resolvió)
+            method: Método HTTP
+            status: Código de estado de la respuesta
+            duration: Duración total en segundos
+            timings: Desglose de la request si fue muestreada
+        """
+        with self._lock:
+            self._latency[view].observe(duration)
+            self._responses[(view, method, str(status))] += 1
+            if timings is None:
+                return
+            breakdown = self._breakdown[view]
+            breakdown['sampled'] += 1
+            breakdown['db_seconds'] += timings.db_ms / 1000
+            breakdown['db_queries'] += timings.db_queries
+            breakdown['template_seconds'] += timings.template_ms / 1000
+            for name, ms in timings.components.items():
+                component = self._components[name]
+                component['seconds'] += ms / 1000
+                component['renders'] += 1
+
+    def render(self):
+        """Devuelve todas las métricas en formato de texto de Prometheus."""
+        with self._lock:
+            latency = {view: (histogram.cumulative(), histogram.sum, histogram.count)
+                       for view, histogram in self._latency.items()}
+            responses = dict(self._responses)
+            breakdown = {view: dict(values) for view, values in self._breakdown.items()}
+            components = {name: dict(values) for name, values in self._components.items()}
+
+        lines = []
+        metric(lines, 'django_request_duration_seconds', 'histogram', 'Duración de las requests por nombre de URL')
+        for view, (buckets, total, count) in sorted(latency.items()):
+            for bound, value in buckets:
+                sample(lines, 'django_request_duration_seconds_bucket', value, view=view, le=bound)
+            sample(lines, 'django_request_duration_seconds_sum', total, view=view)
+            sample(lines, 'django_request_duration_seconds_count', count, view=view)
+
+        metric(lines, 'django_responses_total', 'counter', 'Respuestas por nombre de URL, método y estado')
+        for (view, method, status), value in sorted(responses.items()):
+            sample(lines, 'django_responses_total', value, view=view, method=method, status=status)
+
+        breakdown_metrics = (
+            ('sampled', 'django_request_sampled_total', 'Requests muestreadas con desglose de tiempos'),
+            ('db_seconds', 'django_request_db_seconds_total', 'Tiempo en base de datos de las requests muestreadas'),
+            ('db_queries', 'django_request_db_queries_total', 'Queries de las requests muestreadas'),
+            ('template_seconds', 'django_request_template_seconds_total', 'Tiempo de render de plantillas de las requests muestreadas'),
+        )
+        for key, name, description in breakdown_metrics:
+            metric(lines, name, 'counter', description)
+            for view, values in sorted(breakdown.items()):
+                sample(lines, name, values[key], view=view)
+
+        metric(lines, 'django_component_render_seconds_total', 'counter', 'Tiempo de render por componente (incluye componentes anidados)')
+        for name, values in sorted(components.items()):
+            sample(lines, 'django_component_render_seconds_total', values['seconds'], component=name)
+        metric(lines, 'django_component_renders_total', 'counter', 'Requests muestreadas que renderizaron cada componente')
+        for name, values in sorted(components.items()):
+            sample(lines, 'django_component_renders_total', values['renders'], component=name)
+
+        for collector in COLLECTORS:
+            try:
+                collector(lines)
+            except Exception as e:
+                logger.warning(f"No se pudieron recolectar métricas ({collector.__name__}): {e}")
+        return '\n'.join(lines) + '\n'
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def metric(lines, name, kind, description):
+    lines.append(f'# HELP {name} {description}')
+    lines.append(f'# TYPE {name} {kind}')
+
+
+def sample(lines, name, value, **labels):
+    if labels:
+        rendered = ','.join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+        name = f'{name}{{{rendered}}}'
+    lines.append(f'{name} {format_value(value)}')
+
+
+def collect_process(lines):
+    metric(lines, 'django_process_info', 'gauge', 'Proceso que atendió la lectura de métricas')
+    sample(lines, 'django_process_info', 1, pid=os.getpid(), server_mode=settings.SERVER_MODE)
+
+
+def collect_db_pool(lines):
+    from .dbpool import pool_stats
+
+    stats = pool_stats()
+    metric(lines, 'django_db_pool', 'gauge', 'Estadísticas del pool de conexiones (ver core.dbpool)')
+    for key, value in stats.items():
+        if isinstance(value, (int, float)):
+            sample(lines, 'django_db_pool', value, stat=key, mode=stats['mode'])
+
+
+def collect_db_health(lines):
+    from .health import db_monitor
+
+    last = db_monitor._last
+    if last is None:
+        return
+    state = db_monitor.describe(last, live=False)
+    metric(lines, 'django_db_health', 'gauge', 'Último resultado del monitor de salud de la base de datos')
+    for key in ('ok', 'age_s', 'latency_ms', 'error_rate'):
+        sample(lines, 'django_db_health', state[key], stat=key)
+
+
+def collect_cache(lines):
+    from django.core.cache import caches
+
+    tiered = [(alias, caches[alias].stats()) for alias in settings.CACHES if hasattr(caches[alias], 'stats')]
+    metric(lines, 'django_cache_operations_total', 'counter', 'Operaciones de la caché por prefijo de clave')
+    for alias, stats in tiered:
+        for prefix, counters in sorted(stats['prefixes'].items()):
+            for name, value in sorted(counters.items()):
+                sample(lines, 'django_cache_operations_total', value, cache=alias, prefix=prefix, result=name)
+    metric(lines, 'django_cache_local', 'gauge', 'Ocupación del nivel local de la caché')
+    for alias, stats in tiered:
+        sample(lines, 'django_cache_local', stats['local_entries'], cache=alias, stat='entries')
+        sample(lines, 'django_cache_local', stats['local_bytes'], cache=alias, stat='bytes')
+
+
+LOG_SINKS = (('stdout', 'STDOUT_LOG_SINK'), ('s3', 'S3_LOG_SINK'))
+
+
+def collect_log_sink(lines):
+    sinks = [(name, getattr(settings, setting, None)) for name, setting in LOG_SINKS]
+    sinks = [(name, sink) for name, sink in sinks if sink is not None]
+    if sinks:
+        metric(lines, 'django_log_sink', 'gauge', 'Contadores de los sinks de logs en segundo plano')
+        for name, sink in sinks:
+            for key, value in sorted(sink.stats().items()):
+                sample(lines, 'django_log_sink', value, sink=name, stat=key)
+    sampler = getattr(settings, 'LOG_SAMPLER', None)
+    if sampler is not None:
+        metric(lines, 'django_log_sampled_out_total', 'counter', 'Registros DEBUG/INFO descartados por el muestreo')
+        sample(lines, 'django_log_sampled_out_total', sampler.dropped)
+
+
+def collect_events(lines):
+    from .events import broadcaster
+
+    metric(lines, 'django_sse', 'gauge', 'Conexiones y eventos SSE del worker (ver core.events)')
+    for key, value in sorted(broadcaster.stats().items()):
+        sample(lines, 'django_sse', value, stat=key)
+
+
+def collect_admission(lines):
+    from .admission import limiter
+
+    stats = limiter.stats()
+    metric(lines, 'django_admission_limit', 'gauge', 'Límite de concurrencia adaptativo del worker (ver core.admission)')
+    sample(lines, 'django_admission_limit', stats['limit'])
+    metric(lines, 'django_admission_in_flight', 'gauge', 'Requests admitidas en curso en el worker')
+    sample(lines, 'django_admission_in_flight', stats['in_flight'])
+    metric(lines, 'django_admission_shed_total', 'counter', 'Requests rechazadas con 503 por prioridad')
+    sample(lines, 'django_admission_shed_total', stats['shed_low'], priority='low')
+    sample(lines, 'django_admission_shed_total', stats['shed_high'], priority='high')
+    metric(lines, 'django_admission_limit_decreases_total', 'counter', 'Reducciones del límite por latencia')
+    sample(lines, 'django_admission_limit_decreases_total', stats['decreases'])
+
+
+COLLECTORS = [
+    collect_process, collect_db_pool, collect_db_health, collect_cache, collect_log_sink, collect_events,
+    collect_admission,
+]
+
+registry = MetricsRegistry()
@@ -0,0 +1,362 @@
+"""
+Middleware del proyecto.
+"""
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+from django.urls import Resolver404, resolve
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
+from loguru import logger
+
+from .admission import HIGH, LOW, SAFE_METHODS, limiter
+from .compression import acompress_stream, compress, compress_stream, negotiate
+from .metrics import RequestTimings, current_timings, db_timer, registry, time_template_render
+from .vite import preload_links, rendered_entries
+
+access_logger = logger.bind(logger='access')
+
+UNRESOLVED_VIEW = '<unresolved>'
+KNOWN_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+# Valores de Sec-Fetch-Site que un sitio de terceros no puede provocar
+SAME_SITE_FETCHES = ('same-origin', 'none')
+
+
+def install_db_timer(sender, connection, **kwargs):
+    """Agrega `db_timer` a cada conexión nueva (no hace nada fuera de una request muestreada)."""
+    if db_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_timer)
+
+
+def install_template_timer():
+    if not hasattr(Template.render, '__wrapped__'):
+        Template.render = time_template_render(Template.render)
+
+
+def log_access(request, response, view, duration):
+    """Emite la línea de acceso de la request con sus campos estructurados."""
+    status = response.status_code
+    access_logger.bind(
+        method=request.method,
+        path=request.path,
+        status=status,
+        view=view,
+        ms=round(duration * 1000, 2),
+        bytes=None if response.streaming else len(response.content),
+        ip=request.META.get('HTTP_X_FORWARDED_FOR', request.META.get('REMOTE_ADDR', '')).split(',')[0].strip(),
+    ).log('WARNING' if status >= 500 else 'INFO', f'{request.method} {request.path} {status}')
+
+
+class InstrumentationMiddleware:
+    """
+    Mide cada request y la registra en `core.metrics.registry`.
+
+    La duración total se registra siempre en el histograma de su nombre de URL. Una
+    fracción de las requests (`METRICS_SAMPLE_RATE`) se muestrea además con el desglose
+    de queries y tiempo de base de datos, render de plantillas y render de cada
+    componente, y recibe la cabecera `Server-Timing` si `METRICS_SERVER_TIMING` está
+    habilitado. Debe ir primero en MIDDLEWARE para incluir el tiempo del resto.
+
+    Con `LOG_ACCESS` también emite la línea de acceso de la request como un registro
+    estructurado (`logger=access`) en el mismo stream que el resto de los logs, en lugar
+    del access log de Gunicorn. En las respuestas de streaming la duración llega hasta el
+    inicio del envío.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_db_timer, dispatch_uid='core.metrics.db_timer')
+        for connection in connections.all(initialized_only=True):
+            install_db_timer(sender=None, connection=connection)
+        install_template_timer()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(state[2])
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(state[2])
+        return self.finish(request, response, state)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_view_start = time.perf_counter()
+
+    def start(self, request):
+        timings = RequestTimings() if random.random() < settings.METRICS_SAMPLE_RATE else None
+        return time.perf_counter(), timings, current_timings.set(timings)
+
+    def finish(self, request, response, state):
+        start, timings, _ = state
+        end = time.perf_counter()
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED_VIEW
+        method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        registry.observe(view, method, response.status_code, end - start, timings)
+        if settings.LOG_ACCESS:
+            log_access(request, response, view, end - start)
+        if timings is not None and settings.METRICS_SERVER_TIMING:
+            view_start = getattr(request, 'metrics_view_start', end)
+            response['Server-Timing'] = timings.server_timing((end - start) * 1000, (end - view_start) * 1000)
+        return response
+
+
+class AdmissionMiddleware:
+    """
+    Rechaza con 503 y `Retry-After` las requests que superan el límite de concurrencia.
+
+    El límite es adaptativo (`core.admission.limiter`) y se ajusta con la duración de cada
+    request admitida. Las vistas de `ADMISSION_EXEMPT_VIEWS` se admiten siempre, para que
+    las verificaciones de salud respondan aunque el worker esté saturado. Debe ir después
+    de `InstrumentationMiddleware`, para que las requests rechazadas queden en las métricas
+    y en el log de acceso, y antes del resto. En las respuestas de streaming la request
+    ocupa su lugar hasta el inicio del envío.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.ADMISSION_CONTROL or self.exempt(request):
+            return self.get_response(request)
+        started = limiter.acquire(self.priority(request))
+        if started is None:
+            return self.shed_response()
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release(started)
+
+    async def __acall__(self, request):
+        if not settings.ADMISSION_CONTROL or self.exempt(request):
+            return await self.get_response(request)
+        started = limiter.acquire(self.priority(request))
+        if started is None:
+            return self.shed_response()
+        try:
+            return await self.get_response(request)
+        finally:
+            limiter.release(started)
+
+    def exempt(self, request):
+        # La vista resuelta queda en la request para que las rechazadas se registren con su nombre
+        try:
+            request.resolver_match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return request.resolver_match.view_name in settings.ADMISSION_EXEMPT_VIEWS
+
+    def priority(self, request):
+        return LOW if request.method in SAFE_METHODS else HIGH
+
+    def shed_response(self):
+        response = HttpResponse('Servicio saturado, reintente en unos segundos.', status=503, content_type='text/plain')
+        response['Retry-After'] = str(settings.ADMISSION_RETRY_AFTER)
+        add_never_cache_headers(response)
+        return response
+
+
+class PreloadMiddleware:
+    """
+    Anuncia los chunks de Vite de las páginas HTML antes de que el navegador los descubra.
+
+    Para navegaciones (GET que aceptan HTML, sin `HX-Request`) agrega la cabecera `Link`
+    con `preload`/`modulepreload` de las entradas de `VITE_PRELOAD_ENTRIES` (las de
+    `base.html`) y de los componentes renderizados, resueltas con el manifiesto de Vite
+    (`core.vite`). Las entradas de componentes de cada vista se recuerdan, de modo que
+    también se anuncian en las respuestas servidas desde el caché y, si `VITE_EARLY_HINTS`
+    está habilitado y el servidor lo soporta (`wsgi.early_hints` de Gunicorn o la extensión
+    ASGI `http.response.early_hint`), en un 103 Early Hints enviado antes de ejecutar la vista.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Nombre de vista -> entradas de componentes renderizadas la última vez
+        self.view_entries = {}
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.is_navigation(request):
+            return self.get_response(request)
+        links = self.early_links(request)
+        send_early_hints = request.META.get('wsgi.early_hints')
+        if links and send_early_hints is not None:
+            send_early_hints([('Link', ', '.join(links))])
+        token = rendered_entries.set([])
+        try:
+            response = self.get_response(request)
+        finally:
+            entries = rendered_entries.get()
+            rendered_entries.reset(token)
+        return self.finish(request, response, entries)
+
+    async def __acall__(self, request):
+        if not self.is_navigation(request):
+            return await self.get_response(request)
+        links = self.early_links(request)
+        send_early_hints = request.scope.get('early_hints')
+        if links and send_early_hints is not None:
+            await send_early_hints(links)
+        token = rendered_entries.set([])
+        try:
+            response = await self.get_response(request)
+        finally:
+            entries = rendered_entries.get()
+            rendered_entries.reset(token)
+        return self.finish(request, response, entries)
+
+    def is_navigation(self, request):
+        return (
+            request.method == 'GET'
+            and 'HTTP_HX_REQUEST' not in request.META
+            and 'text/html' in request.META.get('HTTP_ACCEPT', '')
+        )
+
+    def early_links(self, request):
+        """Enlaces conocidos antes de ejecutar la vista (vacío si los Early Hints están desactivados)."""
+        if not settings.VITE_EARLY_HINTS:
+            return []
+        try:
+            view = resolve(request.path_info).view_name
+        except Resolver404:
+            return []
+        return preload_links([*settings.VITE_PRELOAD_ENTRIES, *self.view_entries.get(view, ())])
+
+    def finish(self, request, response, entries):
+        content_type = response.get('Content-Type', '')
+        match = request.resolver_match
+        if response.status_code != 200 or not content_type.startswith('text/html') or match is None:
+            return response
+        if entries:
+            self.view_entries[match.view_name] = list(dict.fromkeys(entries))
+        links = preload_links([*settings.VITE_PRELOAD_ENTRIES, *self.view_entries.get(match.view_name, ())])
+        if links:
+            response['Link'] = ', '.join(filter(None, [response.get('Link'), *links]))
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Comprime con brotli o gzip las respuestas de texto según `Accept-Encoding`.
+
+    Solo se comprimen los tipos de `COMPRESSION_CONTENT_TYPES` sin `Content-Encoding`
+    previo ni rangos, ni las `FileResponse` (descargas de `core.downloads`), que el servidor
+    envía con `sendfile` y deben admitir `Range` sobre el archivo. Las respuestas completas
+    menores a `COMPRESSION_MIN_SIZE` o que no se reducen se envían sin comprimir; las de
+    streaming se comprimen fragmento a fragmento vaciando el compresor, sin retener datos.
+    Las respuestas HTML agregan `HX-Request` a `Vary`, ya que las vistas devuelven página
+    completa o fragmento según esa cabecera, y un ETag fuerte pasa a débil porque el cuerpo
+    ya no es idéntico byte a byte.
+
+    Contra BREACH: las páginas que incluyen el token CSRF (enmascarado distinto en cada
+    respuesta) solo se comprimen si `Sec-Fetch-Site` indica una request del mismo origen o
+    iniciada por el usuario, ya que un atacante solo puede provocar requests cross-site.
+    El uso del token se detecta con `CSRF_COOKIE_NEEDS_UPDATE`, que `CsrfViewMiddleware`
+    limpia al procesar la respuesta, por lo que este middleware debe ir debajo de él.
+
+    El tiempo de compresión de las requests muestreadas aparece en `Server-Timing`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+    def compressible(self, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return (
+            content_type in settings.COMPRESSION_CONTENT_TYPES
+            and not response.has_header('Content-Encoding')
+            and not response.has_header('Content-Range')
+            and response.status_code != 206
+            and getattr(response, 'file_to_stream', None) is None
+        )
+
+    def breach_exposed(self, request):
+        """Indica si la respuesta incluye el token CSRF y la request puede venir de otro sitio."""
+        return (
+            request.META.get('CSRF_COOKIE_NEEDS_UPDATE', False)
+            and request.headers.get('Sec-Fetch-Site') not in SAME_SITE_FETCHES
+        )
+
+    def process(self, request, response):
+        if not self.compressible(response):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        vary = ['Accept-Encoding']
+        if response['Content-Type'].startswith('text/html'):
+            vary.append('HX-Request')
+        patch_vary_headers(response, vary)
+        encoding = negotiate(request)
+        if encoding is None or self.breach_exposed(request):
+            return response
+
+        level = settings.COMPRESSION_BROTLI_QUALITY if encoding == 'br' else settings.COMPRESSION_GZIP_LEVEL
+        start = time.perf_counter()
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(response.streaming_content, encoding, level)
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        timings = current_timings.get()
+        if timings is not None:
+            timings.compress_ms += (time.perf_counter() - start) * 1000
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = f'W/{etag}'
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,145 @@
+"""
+Caché de respuestas para vistas de solo lectura con ETag fuerte y GET condicional.
+
+Las respuestas se guardan por ruta, query string y cabeceras relevantes (`HX-Request`,
+etc.). Una visita repetida no vuelve a renderizar la plantilla y una revalidación con
+`If-None-Match` responde 304 sin cuerpo.
+
+Las páginas que incluyen el token CSRF se guardan con un marcador en lugar del token
+(ver `core.context_processors.response_cache`); el token real de cada sesión se
+inserta al servir la respuesta, de modo que nunca se comparte entre usuarios.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+from .vite import rendered_entries
+
+CSRF_TOKEN_PLACEHOLDER = '__response_cache_csrf_token__'
+DEFAULT_VARY = ('HX-Request', 'HX-Target', 'HX-Boosted')
+KEY_PREFIX = 'response-cache'
+CACHED_HEADERS = ('Content-Type', 'Content-Language', 'X-Frame-Options')
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(name=None):
+    return f'{KEY_PREFIX}:version:{name or "*"}'
+
+
+def current_version(cache, name):
+    """Combina la versión global y la de la vista para invalidar sin borrar claves."""
+    keys = [version_key(), version_key(name)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Guardar la versión inicial para que las próximas lecturas acierten en el nivel local
+            cache.add(key, 0, timeout=None)
+    return f'{versions.get(keys[0], 0)}.{versions.get(keys[1], 0)}'
+
+
+def invalidate_response_cache(name=None):
+    """
+    Invalida las respuestas cacheadas.
+
+    Args:
+        name: Nombre del caché de una vista (ver `cache_response`); None invalida todas
+    """
+    cache = get_cache()
+    key = version_key(name)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def build_cache_key(request, name, vary, version):
+    """Clave de caché a partir de la ruta completa y de las cabeceras que varían la respuesta."""
+    parts = [request.get_full_path()]
+    parts.extend(f'{header}={request.headers.get(header, "")}' for header in vary)
+    digest = hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{version}:{name}:{digest}'
+
+
+def cache_response(ttl=None, vary=DEFAULT_VARY, csrf=False, name=None):
+    """
+    Decorador que cachea la respuesta de una vista de solo lectura.
+
+    Args:
+        ttl: Segundos de vida de la entrada (por defecto RESPONSE_CACHE_TTL)
+        vary: Cabeceras de la request que forman parte de la clave y de `Vary`
+        csrf: True si la plantilla incluye el token CSRF; se reemplaza por request
+        name: Nombre usado para la clave y para `invalidate_response_cache()`
+
+    Returns:
+        function: Vista decorada
+    """
+    def decorator(view):
+        cache_name = name or f'{view.__module__}.{view.__name__}'
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not settings.RESPONSE_CACHE_ENABLED:
+                return view(request, *args, **kwargs)
+            timeout = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+            cache = get_cache()
+            key = build_cache_key(request, cache_name, vary, current_version(cache, cache_name))
+            entry = cache.get(key)
+            if entry is None:
+                request.response_cache_csrf = csrf
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming or response.cookies:
+                    return response
+                entry = {
+                    'content': response.content,
+                    'digest': hashlib.sha256(response.content).hexdigest(),
+                    'headers': {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+                    # Chunks de Vite de los componentes renderizados, para la precarga al servir desde el caché
+                    'vite_entries': list(rendered_entries.get() or ()),
+                }
+                cache.set(key, entry, timeout)
+            return serve_entry(request, entry, vary, csrf, timeout)
+
+        wrapper.response_cache_name = cache_name
+        return wrapper
+
+    return decorator
+
+
+def serve_entry(request, entry, vary, csrf, timeout):
+    """Construye la respuesta (200 o 304) a partir de una entrada cacheada."""
+    content = entry['content']
+    etag_source = entry['digest']
+    if csrf:
+        token = get_token(request)
+        content = content.replace(CSRF_TOKEN_PLACEHOLDER.encode(), token.encode())
+        # El ETag depende del secreto CSRF de la sesión: un 304 conserva un token válido
+        etag_source += request.META['CSRF_COOKIE']
+    etag = '"%s"' % hashlib.sha256(etag_source.encode()).hexdigest()[:32]
+    entries = rendered_entries.get()
+    if entries is not None:
+        entries.extend(entry.get('vite_entries', ()))
+
+    # Comparación débil: la compresión convierte el ETag en `W/"..."`
+    if etag in (tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content)
+        for header, value in entry['headers'].items():
+            response[header] = value
+    response['ETag'] = etag
+    patch_vary_headers(response, vary)
+    if csrf:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=timeout)
+    return response
@@ -0,0 +1,157 @@
+"""
+Dimensionamiento de Gunicorn según los límites del contenedor y hooks de fork.
+
+`gunicorn.conf.py` usa `plan_workers()` para elegir la cantidad de workers, hilos y la
+clase de worker a partir de las CPU y la memoria del cgroup (v2 o v1), con respaldo en
+las CPU visibles y la memoria física. Este módulo no importa Django al cargarse, ya que
+Gunicorn lee la configuración antes que la aplicación.
+"""
+import math
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+# Valores de cgroup v1 a partir de los cuales la memoria se considera ilimitada
+UNLIMITED_MEMORY = 1 << 60
+
+
+@dataclass(frozen=True)
+class WorkerPlan:
+    """Configuración calculada de los workers."""
+
+    cpus: float
+    memory_bytes: int
+    workers: int
+    threads: int
+    worker_class: str
+
+    def describe(self):
+        memory = f'{self.memory_bytes / 1024 ** 2:.0f} MiB' if self.memory_bytes else 'sin límite'
+        return (
+            f'{self.workers} workers {self.worker_class} x {self.threads} hilos '
+            f'(CPU {self.cpus:g}, memoria {memory})'
+        )
+
+
+def read_text(path):
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return None
+
+
+def visible_cpus():
+    """CPU en las que puede ejecutarse el proceso (afinidad) o todas las del sistema."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def cgroup_cpus(root=CGROUP_ROOT):
+    """CPU asignadas por la cuota del cgroup (`cpu.max` o `cpu.cfs_quota_us`), o None sin cuota."""
+    root = Path(root)
+    cpu_max = read_text(root / 'cpu.max')
+    if cpu_max:
+        quota, _, period = cpu_max.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+    quota, period = read_text(root / 'cpu' / 'cpu.cfs_quota_us'), read_text(root / 'cpu' / 'cpu.cfs_period_us')
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory(root=CGROUP_ROOT):
+    """Límite de memoria del cgroup (`memory.max` o `memory.limit_in_bytes`) en bytes, o None."""
+    root = Path(root)
+    for path in (root / 'memory.max', root / 'memory' / 'memory.limit_in_bytes'):
+        value = read_text(path)
+        if value is None:
+            continue
+        if value == 'max' or int(value) >= UNLIMITED_MEMORY:
+            return None
+        return int(value)
+    return None
+
+
+def physical_memory():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def env_int(environ, name, default):
+    value = environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def plan_workers(environ=os.environ, root=CGROUP_ROOT):
+    """
+    Calcula workers, hilos y clase de worker para el contenedor actual.
+
+    - CPU: la cuota del cgroup, acotada por las CPU visibles.
+    - Workers: `2 * CPU + 1`, acotados por la memoria disponible a razón de
+      `GUNICORN_WORKER_MEMORY_MB` por worker (al menos 1).
+    - WSGI usa `gthread` con `GUNICORN_THREADS` hilos (o `sync` con un hilo); ASGI
+      usa `uvicorn_worker.UvicornWorker`, que atiende concurrencia con su event loop.
+
+    `GUNICORN_WORKERS`, `GUNICORN_THREADS` y `GUNICORN_WORKER_CLASS` reemplazan los valores
+    calculados.
+    """
+    cpus = visible_cpus()
+    quota = cgroup_cpus(root)
+    if quota is not None:
+        cpus = min(cpus, quota)
+    memory = cgroup_memory(root) or physical_memory()
+
+    workers = max(1, math.floor(2 * cpus + 1))
+    worker_memory = env_int(environ, 'GUNICORN_WORKER_MEMORY_MB', 256) * 1024 ** 2
+    if memory and worker_memory:
+        workers = max(1, min(workers, memory // worker_memory))
+    workers = env_int(environ, 'GUNICORN_WORKERS', workers)
+
+    if environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+        threads, worker_class = 1, 'uvicorn_worker.UvicornWorker'
+    else:
+        threads = env_int(environ, 'GUNICORN_THREADS', 4)
+        worker_class = 'gthread' if threads > 1 else 'sync'
+    worker_class = environ.get('GUNICORN_WORKER_CLASS') or worker_class
+    return WorkerPlan(cpus=round(cpus, 2), memory_bytes=memory, workers=workers, threads=threads, worker_class=worker_class)
+
+
+def close_db_connections():
+    """
+    Cierra las conexiones y pools de base de datos del proceso.
+
+    En el maestro se ejecuta antes de cada fork para que los workers no hereden sockets
+    ni pools de psycopg (cuyos hilos no sobreviven al fork). Sin `preload_app` Django aún
+    no está configurado y no hay nada que cerrar.
+    """
+    from django.conf import settings
+    from django.db import connections
+
+    if not settings.configured:
+        return
+
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+    for connection in connections.all():
+        if getattr(connection, '_connection_pools', {}).get(connection.alias) is not None:
+            connection.close_pool()
+
+
+def start_worker_threads():
+    """Reinicia el estado por proceso heredado del maestro e inicia los hilos de fondo del worker."""
+    from django.conf import settings
+
+    if not settings.configured:
+        return  # Sin `preload_app` los hilos se inician de forma diferida al cargar la aplicación
+    from .health import db_monitor
+    from .metrics import registry
+
+    registry.reset()
+    db_monitor.reset()
+    db_monitor.ensure_started()
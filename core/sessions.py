@@ -0,0 +1,221 @@
+"""
+Motor de sesiones servido desde el caché con escrituras diferidas a la base de datos.
+
+Las lecturas se resuelven en el caché `SESSION_CACHE_ALIAS`, que debe ser un almacén
+compartido fuera de la base de datos (Redis, `SESSION_CACHE_URL`): sin nivel local por
+proceso cada worker lee al instante las escrituras, rotaciones y cierres de sesión de los
+demás, y una sesión presente no cuesta ninguna consulta.
+
+Las escrituras se guardan en el caché de inmediato y en la base de datos de forma
+diferida: los cambios de una misma sesión se combinan en un buffer por proceso que se
+vuelca con un único `INSERT ... ON CONFLICT` al terminar una request, cuando pasaron
+`SESSION_WRITE_INTERVAL` segundos o cuando hay `SESSION_WRITE_BATCH_SIZE` sesiones
+pendientes.
+
+Si el caché no está disponible, la sesión se lee y se guarda directamente en la base de
+datos, igual que el motor `db` de Django.
+"""
+import atexit
+import os
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.cache import caches
+from django.core.signals import request_finished
+from django.utils import timezone
+from loguru import logger
+
+KEY_PREFIX = 'sessions:'
+
+
+class SessionWriteBuffer:
+    """Escrituras de sesión pendientes, combinadas por clave de sesión."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=lambda: self._pending.clear())
+
+    def put(self, session_key, session_data, expire_date):
+        with self._lock:
+            self._pending[session_key] = (session_data, expire_date)
+            full = len(self._pending) >= settings.SESSION_WRITE_BATCH_SIZE
+        if full:
+            self.flush()
+
+    def get(self, session_key):
+        """Devuelve (session_data, expire_date) pendiente de escritura, o None."""
+        with self._lock:
+            return self._pending.get(session_key)
+
+    def discard(self, session_key):
+        with self._lock:
+            self._pending.pop(session_key, None)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def flush_if_due(self, **kwargs):
+        """Vuelca el buffer si pasó el intervalo de escritura (conectado a `request_finished`)."""
+        if self._pending and time.monotonic() - self._last_flush >= settings.SESSION_WRITE_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Escribe todas las sesiones pendientes con una sola consulta."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            return self.write(pending)
+        except Exception as e:
+            logger.error(f"No se pudieron escribir {len(pending)} sesiones: {e}")
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending.setdefault(key, value)
+            return 0
+
+    def write(self, records):
+        """Inserta o actualiza sesiones {session_key: (session_data, expire_date)} en la base de datos."""
+        from django.contrib.sessions.models import Session
+
+        objs = [
+            Session(session_key=key, session_data=data, expire_date=expire_date)
+            for key, (data, expire_date) in records.items()
+        ]
+        Session.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=['session_key'],
+            update_fields=['session_data', 'expire_date'],
+        )
+        return len(objs)
+
+
+write_buffer = SessionWriteBuffer()
+request_finished.connect(write_buffer.flush_if_due, dispatch_uid='core.sessions.flush_if_due')
+atexit.register(write_buffer.flush)
+
+
+class SessionStore(DBStore):
+    """
+    Sesiones con lectura desde caché y escritura diferida a la base de datos.
+    """
+
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        self._cache = caches[settings.SESSION_CACHE_ALIAS]
+        super().__init__(session_key)
+
+    @property
+    def cache_key(self):
+        return self.cache_key_prefix + self._get_or_create_session_key()
+
+    def load(self):
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            data = None
+        if data is not None:
+            return data
+
+        pending = write_buffer.get(self.session_key) if self.session_key else None
+        if pending is not None and pending[1] > timezone.now():
+            data = self.decode(pending[0])
+            expiry = pending[1]
+        else:
+            session = self._get_session_from_db()
+            if not session:
+                return {}
+            data = self.decode(session.session_data)
+            expiry = session.expire_date
+        try:
+            self._cache.set(self.cache_key, data, self.get_expiry_age(expiry=expiry))
+        except Exception:
+            logger.warning(f"No se pudo guardar la sesión en el caché ({settings.SESSION_CACHE_ALIAS})")
+        return data
+
+    def exists(self, session_key):
+        if not session_key:
+            return False
+        try:
+            if (self.cache_key_prefix + session_key) in self._cache:
+                return True
+        except Exception:
+            pass
+        return write_buffer.get(session_key) is not None or super().exists(session_key)
+
+    def create(self):
+        # `_get_new_session_key()` ya verifica que la clave no exista en caché, buffer ni base de datos
+        self._session_key = self._get_new_session_key()
+        self.save(must_create=True)
+        self.modified = True
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        record = (self.encode(data), self.get_expiry_date())
+        try:
+            self._cache.set(self.cache_key, data, self.get_expiry_age())
+        except Exception:
+            logger.warning("Caché de sesiones no disponible, se escribe directo en la base de datos")
+            write_buffer.discard(self.session_key)
+            write_buffer.write({self.session_key: record})
+            return
+        write_buffer.put(self.session_key, *record)
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        write_buffer.discard(session_key)
+        super().delete(session_key)
+        try:
+            self._cache.delete(self.cache_key_prefix + session_key)
+        except Exception:
+            pass
+
+    @classmethod
+    def clear_expired(cls):
+        """Elimina las sesiones vencidas en lotes para no bloquear la tabla."""
+        model = cls.get_model_class()
+        batch_size = settings.SESSION_CLEANUP_BATCH_SIZE
+        deleted = 0
+        while True:
+            keys = list(
+                model.objects.filter(expire_date__lt=timezone.now())
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+
+    # Versiones asíncronas: reutilizan la lógica sincrónica para respetar el buffer
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def aexists(self, session_key):
+        return await sync_to_async(self.exists)(session_key)
+
+    async def acreate(self):
+        return await sync_to_async(self.create)()
+
+    async def asave(self, must_create=False):
+        return await sync_to_async(self.save)(must_create)
+
+    async def adelete(self, session_key=None):
+        return await sync_to_async(self.delete)(session_key)
+
+    @classmethod
+    async def aclear_expired(cls):
+        return await sync_to_async(cls.clear_expired)()
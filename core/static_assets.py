@@ -0,0 +1,174 @@
+"""
+Servicio de estáticos precomprimidos con caché por archivo.
+
+Cuando los estáticos no pasan por el CDN (`STATIC_SERVE`, siempre en local) los sirven
+`PrecompressedStaticHandler`/`ASGIPrecompressedStaticHandler` en `project/wsgi.py` y
+`project/asgi.py`, antes del stack de middleware (sin sesión, CSRF ni `Vary: Cookie`):
+
+- `compress_static()` (`manage.py compressstatic`, también en el bootstrap) genera junto
+  a cada archivo comprimible de `STATICFILES_DIRS` sus variantes `.br` (si `brotli` está
+  instalado) y `.gz`, solo si reducen el tamaño y están desactualizadas.
+- `serve()` elige la mejor variante según `Accept-Encoding` y responde con
+  `Content-Encoding` y `Vary: Accept-Encoding`.
+- `cache_control()` da `immutable` con un año de vida a los archivos con hash de Vite
+  (`STATIC_IMMUTABLE_PATTERN`) y `STATIC_MAX_AGE` al resto. La misma política se aplica
+  por archivo al subir a S3 (`core.storage.StaticS3Storage`).
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler, StaticFilesHandler
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import brotli, compress, negotiate
+
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.mjs', '.json', '.map', '.svg', '.html', '.txt', '.xml', '.ico'}
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def compress_gzip(data):
+    return compress(data, 'gzip', 9)
+
+
+def compress_brotli(data):
+    return compress(data, 'br', 11)
+
+
+# (Content-Encoding, sufijo, compresor) en orden de preferencia; sin brotli solo gzip
+ENCODINGS = [
+    *([('br', '.br', compress_brotli)] if brotli is not None else []),
+    ('gzip', '.gz', compress_gzip),
+]
+# Sufijos de las variantes, que no se suben a S3 (ahí no hay negociación de codificación)
+VARIANT_SUFFIXES = ('.br', '.gz')
+
+
+@lru_cache(maxsize=4)
+def _immutable_pattern(pattern):
+    return re.compile(pattern)
+
+
+def is_immutable(name):
+    """Indica si un estático lleva hash de contenido en el nombre (no cambia nunca)."""
+    return bool(_immutable_pattern(settings.STATIC_IMMUTABLE_PATTERN).search(name))
+
+
+def cache_control(name):
+    """Valor de `Cache-Control` de un estático según tenga hash o no."""
+    if is_immutable(name):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.STATIC_MAX_AGE}'
+
+
+def compress_file(path):
+    """
+    Genera las variantes comprimidas desactualizadas de un archivo.
+
+    Returns:
+        list[Path]: Variantes escritas (vacío si estaban al día o no reducen el tamaño)
+    """
+    path = Path(path)
+    source_mtime = path.stat().st_mtime_ns
+    pending = []
+    for _, suffix, compressor in ENCODINGS:
+        variant = path.with_name(path.name + suffix)
+        if not variant.exists() or variant.stat().st_mtime_ns < source_mtime:
+            pending.append((variant, compressor))
+    if not pending:
+        return []
+    data = path.read_bytes()
+    written = []
+    for variant, compressor in pending:
+        compressed = compressor(data)
+        if len(compressed) < len(data):
+            variant.write_bytes(compressed)
+            written.append(variant)
+        elif variant.exists():
+            variant.unlink()
+    return written
+
+
+def compressible_files():
+    """Archivos de `STATICFILES_DIRS` que conviene comprimir."""
+    for directory in settings.STATICFILES_DIRS:
+        directory = Path(directory[1] if isinstance(directory, (list, tuple)) else directory)
+        if not directory.is_dir():
+            continue
+        for path in directory.rglob('*'):
+            if path.suffix in COMPRESSIBLE_SUFFIXES and path.is_file() and path.stat().st_size >= MIN_COMPRESS_SIZE:
+                yield path
+
+
+def compress_static():
+    """Precomprime los estáticos de `STATICFILES_DIRS` y devuelve las variantes escritas."""
+    return [variant for path in compressible_files() for variant in compress_file(path)]
+
+
+# Ruta pedida -> (archivo, {codificación: variante}); en DEBUG se resuelve en cada request
+_resolved = {}
+
+
+def resolve(path):
+    if path in _resolved and not settings.DEBUG:
+        return _resolved[path]
+    absolute = finders.find(path)
+    if not absolute:
+        return None
+    variants = {}
+    for encoding, suffix, _ in ENCODINGS:
+        variant = absolute + suffix
+        if os.path.isfile(variant):
+            variants[encoding] = variant
+    _resolved[path] = (absolute, variants)
+    return _resolved[path]
+
+
+def serve(request, path):
+    """
+    Sirve un estático con la mejor variante precomprimida y su política de caché.
+
+    A diferencia de `django.contrib.staticfiles.views.serve`, funciona también sin DEBUG.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    resolved = None if path == '..' or path.startswith('../') else resolve(path)
+    if resolved is None:
+        raise Http404(f'"{path}" no existe')
+    absolute, variants = resolved
+    encoding = negotiate(request, variants)
+    filename = variants[encoding] if encoding else absolute
+
+    stat = os.stat(filename)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type, _ = mimetypes.guess_type(absolute)
+        response = FileResponse(open(filename, 'rb'), content_type=content_type or 'application/octet-stream')
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Cache-Control'] = cache_control(path)
+    if variants:
+        response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+class PrecompressedServeMixin:
+    def serve(self, request):
+        return serve(request, self.file_path(request.path))
+
+
+class PrecompressedStaticHandler(PrecompressedServeMixin, StaticFilesHandler):
+    """Envoltorio WSGI que sirve `STATIC_URL` con `serve()` y delega el resto en la aplicación."""
+
+
+class ASGIPrecompressedStaticHandler(PrecompressedServeMixin, ASGIStaticFilesHandler):
+    """Envoltorio ASGI que sirve `STATIC_URL` con `serve()` y delega el resto en la aplicación."""
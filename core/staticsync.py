@@ -0,0 +1,149 @@
+"""
+Sincronización incremental de archivos estáticos hacia el storage `staticfiles`.
+
+En lugar de revisar o subir cada archivo de forma secuencial como `collectstatic`,
+se calcula el hash de las salidas locales (Vite en `static/dist`, media de
+componentes y assets del admin), se compara contra un manifiesto guardado en el
+propio storage y se suben solo los archivos modificados usando un pool de hilos acotado.
+
+Los archivos que ya no existen localmente salen del manifiesto y se informan en el log;
+sus objetos se conservan (las instancias de la versión anterior aún pueden referenciarlos
+durante un despliegue) salvo que se pida `prune`.
+"""
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile, File
+from loguru import logger
+
+from .static_assets import VARIANT_SUFFIXES, cache_control
+
+MANIFEST_NAME = 'staticfiles.sync.json'
+# Las variantes precomprimidas solo se usan al servir desde Django (core/static_assets.py)
+IGNORE_PATTERNS = ['CVS', '.*', '*~', *(f'*{suffix}' for suffix in VARIANT_SUFFIXES)]
+
+
+@dataclass
+class SyncResult:
+    """Resumen de una sincronización de estáticos."""
+
+    uploaded: list = field(default_factory=list)
+    unchanged: int = 0
+    stale: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self):
+        return len(self.uploaded) + self.unchanged
+
+
+def file_digest(path):
+    """Devuelve el SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def collect_local_files():
+    """
+    Recorre los finders de estáticos igual que collectstatic.
+
+    Returns:
+        dict: Ruta relativa -> ruta absoluta; gana el primer finder que encuentra cada archivo
+    """
+    files = {}
+    for finder in finders.get_finders():
+        for path, storage in finder.list(IGNORE_PATTERNS):
+            prefixed = path
+            if getattr(storage, 'prefix', None):
+                prefixed = f'{storage.prefix}/{path}'
+            files.setdefault(prefixed.replace('\\', '/'), storage.path(path))
+    return files
+
+
+def build_local_manifest(files):
+    """
+    Calcula el manifiesto local {ruta: huella}.
+
+    La huella combina el SHA-256 del contenido con la política de caché del archivo, de
+    modo que un cambio de política vuelve a subirlo con las cabeceras nuevas.
+    """
+    return {name: f'{file_digest(path)}:{cache_control(name)}' for name, path in files.items()}
+
+
+def load_remote_manifest(storage):
+    """Lee el manifiesto guardado en el storage; vacío si no existe o es inválido."""
+    try:
+        if storage.exists(MANIFEST_NAME):
+            with storage.open(MANIFEST_NAME) as handle:
+                return json.loads(handle.read()).get('files', {})
+    except (ValueError, OSError) as e:
+        logger.warning(f"Manifiesto de estáticos inválido, se resincroniza todo: {e}")
+    return {}
+
+
+def save_remote_manifest(storage, manifest):
+    """Reemplaza el manifiesto remoto con el estado recién sincronizado."""
+    payload = json.dumps({'version': 1, 'files': manifest}, indent=2, sort_keys=True).encode()
+    replace_file(storage, MANIFEST_NAME, ContentFile(payload))
+
+
+def replace_file(storage, name, content):
+    """Guarda un archivo sobrescribiendo la versión existente sin renombrarlo."""
+    if not getattr(storage, 'file_overwrite', False) and storage.exists(name):
+        storage.delete(name)
+    storage.save(name, content)
+
+
+def upload_file(storage, name, path):
+    with open(path, 'rb') as handle:
+        replace_file(storage, name, File(handle, name=name))
+    return name
+
+
+def sync_static(storage=None, max_workers=None, dry_run=False, prune=False):
+    """
+    Sube al storage solo los estáticos cuyo contenido cambió desde la última sincronización.
+
+    Args:
+        storage: Storage destino (por defecto `staticfiles_storage`)
+        max_workers: Tamaño del pool de subida (por defecto STATIC_SYNC_WORKERS)
+        dry_run: Si es True, solo calcula las diferencias
+        prune: Si es True, elimina del storage los archivos que ya no existen localmente
+
+    Returns:
+        SyncResult: Archivos subidos, archivos sin cambios, archivos obsoletos y duración
+    """
+    storage = storage or staticfiles_storage
+    max_workers = max_workers or settings.STATIC_SYNC_WORKERS
+    start = time.perf_counter()
+
+    files = collect_local_files()
+    local_manifest = build_local_manifest(files)
+    remote_manifest = load_remote_manifest(storage)
+    changed = sorted(name for name, digest in local_manifest.items() if remote_manifest.get(name) != digest)
+    stale = sorted(set(remote_manifest) - set(local_manifest))
+    result = SyncResult(unchanged=len(local_manifest) - len(changed), stale=stale)
+
+    if dry_run:
+        result.uploaded = changed
+    elif changed or stale:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            result.uploaded = list(pool.map(lambda name: upload_file(storage, name, files[name]), changed))
+            if prune:
+                list(pool.map(storage.delete, stale))
+        save_remote_manifest(storage, local_manifest)
+        if stale:
+            action = 'eliminados' if prune else 'conservados en el storage'
+            logger.info(f"{len(stale)} estáticos obsoletos {action}: {', '.join(stale)}")
+
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,21 @@
+"""
+Storages del proyecto.
+"""
+from storages.backends.s3 import S3Storage
+
+from .static_assets import cache_control
+
+
+class StaticS3Storage(S3Storage):
+    """
+    Storage S3 de estáticos con `Cache-Control` por archivo.
+
+    Los archivos con hash de Vite se suben como `immutable` con un año de vida y el resto
+    con `STATIC_MAX_AGE` (ver `core.static_assets.cache_control`), en lugar de un único
+    `CacheControl` global para todo el bucket.
+    """
+
+    def get_object_parameters(self, name):
+        # `name` llega normalizado con el prefijo `location`; la política usa la ruta del estático
+        static_name = name.removeprefix(f'{self.location}/') if self.location else name
+        return {**super().get_object_parameters(name), 'CacheControl': cache_control(static_name)}
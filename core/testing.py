@@ -0,0 +1,52 @@
+"""
+Utilidades de pruebas del proyecto.
+"""
+from django.test import override_settings
+from django.urls import get_resolver, reverse
+
+from .bench import iter_url_names
+from .budgets import HTMX_HEADERS, VIEW_BUDGETS, format_violations, measure, violations
+
+
+class ViewBudgetMixin:
+    """
+    Mixin de `TestCase` que verifica los presupuestos de `core.budgets.VIEW_BUDGETS`.
+
+    `assertAllWithinBudgets()` recorre todas las rutas con nombre de `budget_urlconf`,
+    con y sin `HX-Request`, y falla con una tabla de los límites excedidos. Una ruta sin
+    presupuesto también hace fallar la verificación. Las mediciones se hacen con
+    `budget_settings` (sin caché de respuestas ni hilo del monitor de salud).
+    """
+
+    budget_urlconf = 'core.urls'
+    budgets = VIEW_BUDGETS
+    budget_repeat = 3
+    budget_settings = {'RESPONSE_CACHE_ENABLED': False, 'HEALTH_DB_INTERVAL': 0, 'METRICS_TOKEN': 'budgets'}
+    # Las vistas internas (`core.views.internal_only`) se miden autenticadas con el token
+    budget_headers = {'HTTP_AUTHORIZATION': 'Bearer budgets'}
+
+    def budget_routes(self):
+        return list(iter_url_names(get_resolver(self.budget_urlconf).url_patterns))
+
+    def budget_violations(self, name):
+        """Mide una ruta en ambas variantes y devuelve [(ruta, métrica, medido, límite)]."""
+        rows = []
+        for label, headers in ((name, None), (f'{name}[htmx]', HTMX_HEADERS)):
+            with override_settings(**self.budget_settings):
+                measurement = measure(reverse(name), {**self.budget_headers, **(headers or {})}, repeat=self.budget_repeat)
+            rows += [(label, *violation) for violation in violations(self.budgets[name], measurement)]
+        return rows
+
+    def assertWithinBudget(self, name):
+        rows = self.budget_violations(name)
+        if rows:
+            self.fail(format_violations(rows))
+
+    def assertAllWithinBudgets(self):
+        routes = self.budget_routes()
+        missing = [name for name in routes if name not in self.budgets]
+        if missing:
+            self.fail(f'Rutas sin presupuesto en core.budgets.VIEW_BUDGETS: {", ".join(missing)}')
+        rows = [row for name in routes for row in self.budget_violations(name)]
+        if rows:
+            self.fail(format_violations(rows))
@@ -0,0 +1,133 @@
+import time
+from unittest.mock import patch
+
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.admission import HIGH, LOW, AdaptiveLimiter, limiter
+from core.metrics import registry
+
+
+class AdaptiveLimiterTests(SimpleTestCase):
+    """Suite de pruebas para el límite de concurrencia AIMD."""
+
+    def setUp(self):
+        self.limiter = AdaptiveLimiter(
+            initial=4, min_limit=1, max_limit=8, latency_target=0.5, backoff=0.5, headroom=0.5,
+        )
+
+    def test_sheds_low_priority_at_limit(self):
+        """Verifica que las lecturas se rechazan al alcanzar el límite."""
+        for _ in range(4):
+            self.assertIsNotNone(self.limiter.acquire(LOW))
+        self.assertIsNone(self.limiter.acquire(LOW))
+        self.assertEqual(self.limiter.stats()['shed_low'], 1)
+
+    def test_high_priority_has_headroom(self):
+        """Verifica que las escrituras se admiten hasta el margen sobre el límite."""
+        for _ in range(4):
+            self.limiter.acquire(LOW)
+        self.assertIsNotNone(self.limiter.acquire(HIGH))
+        self.assertIsNotNone(self.limiter.acquire(HIGH))
+        self.assertIsNone(self.limiter.acquire(HIGH))
+        self.assertEqual(self.limiter.stats()['shed_high'], 1)
+
+    def test_slow_request_decreases_limit(self):
+        """Verifica la reducción multiplicativa cuando una request supera la latencia objetivo."""
+        started = self.limiter.acquire()
+        self.limiter.release(started - 1)
+        stats = self.limiter.stats()
+        self.assertEqual(stats['limit'], 2)
+        self.assertEqual(stats['decreases'], 1)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_one_decrease_per_episode(self):
+        """Verifica que las requests iniciadas antes de la última reducción no vuelven a reducir."""
+        first, second = self.limiter.acquire(), self.limiter.acquire()
+        self.limiter.release(first - 1)
+        self.limiter.release(second - 1)
+        self.assertEqual(self.limiter.stats()['limit'], 2)
+        late = self.limiter.acquire()
+        with patch('core.admission.time.monotonic', return_value=time.monotonic() + 1):
+            self.limiter.release(late)
+        self.assertEqual(self.limiter.stats()['limit'], 1)
+
+    def test_limit_stays_within_bounds(self):
+        """Verifica que el límite no baja del mínimo ni supera el máximo."""
+        # Cada request dura un segundo y empieza después de la reducción anterior
+        with patch('core.admission.time.monotonic', side_effect=range(100)):
+            for _ in range(5):
+                self.limiter.release(self.limiter.acquire())
+        self.assertEqual(self.limiter.stats()['limit'], 1)
+        self.limiter.limit = 7.9
+        started = [self.limiter.acquire() for _ in range(7)]
+        for request_started in started:
+            self.limiter.release(request_started)
+        self.assertEqual(self.limiter.stats()['limit'], 8)
+
+    def test_additive_increase_requires_utilization(self):
+        """Verifica que el límite crece solo si al menos la mitad estaba en uso."""
+        self.limiter.release(self.limiter.acquire())
+        self.assertEqual(self.limiter.stats()['limit'], 4)
+        started = [self.limiter.acquire() for _ in range(2)]
+        self.limiter.release(started[0])
+        self.assertEqual(self.limiter.stats()['limit'], 4.25)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False, HEALTH_DB_INTERVAL=0)
+class AdmissionMiddlewareTests(TestCase):
+    """Suite de pruebas para el rechazo de requests del middleware de admisión."""
+
+    def setUp(self):
+        self.client = Client()
+        registry.reset()
+        limiter.reset()
+
+    def tearDown(self):
+        limiter.reset()
+
+    def saturate(self):
+        """Simula un worker con el límite ocupado por requests en curso."""
+        limiter.limit = 1.0
+        limiter.in_flight = 1
+
+    def test_admits_and_releases(self):
+        """Verifica que una request admitida libera su lugar al terminar."""
+        response = self.client.get(reverse('hello_world'))
+        self.assertEqual(response.status_code, 200)
+        stats = limiter.stats()
+        self.assertEqual(stats['admitted'], 1)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_sheds_with_retry_after(self):
+        """Verifica el 503 inmediato con `Retry-After` cuando el worker está saturado."""
+        self.saturate()
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '2')
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertEqual(limiter.stats()['shed_low'], 1)
+
+    def test_health_checks_are_always_admitted(self):
+        """Verifica que `health` y `db_health_check` responden aunque el worker esté saturado."""
+        self.saturate()
+        self.assertEqual(self.client.get(reverse('health')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('db_health_check')).status_code, 200)
+        self.assertEqual(limiter.stats()['admitted'], 0)
+
+    @override_settings(ADMISSION_CONTROL=False)
+    def test_disabled(self):
+        """Verifica que con `ADMISSION_CONTROL=False` no se rechaza nada."""
+        self.saturate()
+        self.assertEqual(self.client.get(reverse('hello_world')).status_code, 200)
+
+    def test_metrics(self):
+        """Verifica que el límite y los rechazos se exponen con su vista en las métricas."""
+        self.saturate()
+        self.client.get(reverse('home'))
+        limiter.in_flight = 0
+        with override_settings(METRICS_TOKEN='secreto'):
+            body = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secreto').content.decode()
+        self.assertIn('django_admission_limit ', body)
+        self.assertIn('django_admission_shed_total{priority="low"} 1', body)
+        self.assertIn('django_responses_total{view="home",method="GET",status="503"} 1', body)
@@ -0,0 +1,52 @@
+import json
+from unittest.mock import patch
+
+from django.test import RequestFactory, TestCase, override_settings
+from django_htmx.middleware import HtmxDetails
+
+from core.health import db_monitor
+from core.views import db_health_check_async, health_async, htmx_demo_async
+
+
+@override_settings(HEALTH_DB_INTERVAL=0)
+class AsyncViewsTests(TestCase):
+    """Suite de pruebas para las vistas asíncronas servidas en modo ASGI."""
+
+    def setUp(self):
+        """Configura la fábrica de requests para cada test."""
+        self.factory = RequestFactory()
+        db_monitor.reset()
+
+    def build_request(self, path, **headers):
+        request = self.factory.get(path, headers=headers)
+        request.htmx = HtmxDetails(request)
+        return request
+
+    async def test_health_async(self):
+        """Verifica que la versión asíncrona de health devuelve el mismo contenido."""
+        response = await health_async(self.build_request('/core/health/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content, {'status': 'ok', 'message': 'Verificación de estado exitosa'})
+
+    async def test_db_health_check_async_success(self):
+        """Verifica que la verificación asíncrona de la base de datos devuelve 200."""
+        response = await db_health_check_async(self.build_request('/core/health/db/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['message'], 'Conexión a la base de datos exitosa')
+
+    async def test_db_health_check_async_failure(self):
+        """Verifica que un error de la base de datos devuelve 500 sin propagar la excepción."""
+        with patch.object(db_monitor, 'ping', side_effect=Exception("Simulated DB failure")):
+            response = await db_health_check_async(self.build_request('/core/health/db/'))
+        self.assertEqual(response.status_code, 500)
+
+    async def test_htmx_demo_async(self):
+        """Verifica que la demo HTMX asíncrona distingue requests HTMX de requests normales."""
+        response = await htmx_demo_async(self.build_request('/core/htmx-demo/', HX_Request='true'))
+        self.assertIn('HTMX Funcionando', response.content.decode())
+        response = await htmx_demo_async(self.build_request('/core/htmx-demo/'))
+        self.assertIn('Request no HTMX detectada', response.content.decode())
+
+    def tearDown(self):
+        """Limpia después de cada prueba."""
+        pass
@@ -0,0 +1,77 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from core.bench import compare, discover_endpoints, run_benchmark
+
+BASE_RESULT = {'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': 3.0, 'queries_per_request': 1.0, 'peak_alloc_bytes_per_request': 10000}
+
+
+class BenchTests(TestCase):
+    """Suite de pruebas para el benchmark en proceso."""
+
+    def test_discovers_named_urls_without_parameters(self):
+        """Verifica que se incluyen las URLs del proyecto y de core, con su variante HTMX, y no el admin."""
+        keys = [endpoint.key for endpoint in discover_endpoints()]
+        for key in ('root_home', 'health', 'db_health_check', 'home', 'htmx_demo', 'htmx_demo[htmx]'):
+            self.assertIn(key, keys)
+        self.assertFalse(any(key.startswith('admin:') for key in keys))
+
+    def test_skips_routes_without_anonymous_get(self):
+        """Verifica que las rutas solo POST, internas y SSE se omiten salvo que se pidan por nombre."""
+        keys = [endpoint.key for endpoint in discover_endpoints()]
+        for key in ('upload_start', 'upload_complete', 'upload_abort', 'metrics', 'db_pool_stats', 'events'):
+            self.assertNotIn(key, keys)
+        with override_settings(METRICS_TOKEN='secreto'):
+            results = run_benchmark(discover_endpoints(names=['metrics'], htmx=False), requests=2, concurrency=1, warmup=0, samples=1)
+        self.assertEqual(results['metrics']['statuses'], {'200': 2})
+
+    def test_run_reports_latency_queries_and_memory(self):
+        """Verifica las métricas de cada variante medida."""
+        results = run_benchmark(discover_endpoints(names=['health', 'htmx_demo']), requests=4, concurrency=1, warmup=1, samples=2)
+        self.assertEqual(set(results), {'health', 'health[htmx]', 'htmx_demo', 'htmx_demo[htmx]'})
+        for result in results.values():
+            self.assertEqual(result['statuses'], {'200': 4})
+            self.assertGreater(result['rps'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertEqual(result['queries_per_request'], 0)
+            self.assertGreater(result['peak_alloc_bytes_per_request'], 0)
+            self.assertGreater(result['wire_bytes_per_request'], 0)
+            self.assertGreaterEqual(result['cpu_ms_per_request'], 0)
+
+    def test_concurrent_run_splits_requests(self):
+        """Verifica que las requests se reparten entre los hilos."""
+        results = run_benchmark(discover_endpoints(names=['health'], htmx=False), requests=5, concurrency=2, warmup=0, samples=1)
+        self.assertEqual(results['health']['requests'], 5)
+        self.assertEqual(results['health']['concurrency'], 2)
+
+    def test_compare_flags_exceeded_budgets(self):
+        """Verifica que se detectan aumentos de latencia, queries y memoria por encima de la tolerancia."""
+        baseline = {'home': BASE_RESULT, 'removed': BASE_RESULT}
+        within = dict(BASE_RESULT, p95_ms=2.3, peak_alloc_bytes_per_request=11000)
+        self.assertEqual(compare({'home': within, 'new': BASE_RESULT}, baseline), [])
+        worse = dict(BASE_RESULT, p95_ms=10.0, queries_per_request=2.0, peak_alloc_bytes_per_request=20000)
+        regressions = compare({'home': worse}, baseline)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(all(regression.startswith('home:') for regression in regressions))
+
+    def test_command_saves_and_checks_baseline(self):
+        """Verifica que el comando guarda la línea base y falla al exceder un presupuesto."""
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / 'baseline.json'
+            options = {'urls': ['health'], 'no_htmx': True, 'requests': 2, 'concurrency': 1, 'warmup': 0, 'samples': 1, 'stdout': StringIO()}
+            call_command('bench', baseline=str(baseline), update_baseline=True, **options)
+            saved = json.loads(baseline.read_text())
+            self.assertIn('health', saved)
+
+            call_command('bench', baseline=str(baseline), **options)
+
+            saved['health']['peak_alloc_bytes_per_request'] = 1
+            baseline.write_text(json.dumps(saved))
+            with self.assertRaises(CommandError):
+                call_command('bench', baseline=str(baseline), stderr=StringIO(), **options)
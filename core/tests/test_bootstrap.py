@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import shutil
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.management.commands.bootstrap import STATE_TABLE
+
+
+class BootstrapCommandTests(TestCase):
+    """Suite de pruebas para el comando de arranque en un solo proceso.
+
+    Verifica que los pasos se ejecutan la primera vez, que se omiten cuando sus
+    entradas no cambiaron y que se informa la duración de cada fase.
+    """
+
+    def setUp(self):
+        """Usa un STATIC_ROOT temporal para los estáticos."""
+        self.static_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(STATIC_ROOT=self.static_root)
+        self.settings_override.enable()
+        self.patcher = patch('core.management.commands.bootstrap.call_command')
+        self.mock_call_command = self.patcher.start()
+        self.sync_patcher = patch('core.management.commands.bootstrap.sync_static')
+        self.mock_sync_static = self.sync_patcher.start()
+        self.mock_sync_static.return_value.uploaded = []
+        self.mock_sync_static.return_value.unchanged = 0
+
+    def run_bootstrap(self, *args):
+        out = StringIO()
+        call_command('bootstrap', '--skip-tests', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def executed_commands(self):
+        return [call.args[0] for call in self.mock_call_command.call_args_list]
+
+    def test_first_run_executes_steps(self):
+        """Verifica que sin estado previo se ejecutan makemigrations, migrate y la sincronización de estáticos."""
+        output = self.run_bootstrap()
+        self.assertEqual(self.executed_commands(), ['makemigrations', 'migrate', 'createcachetable', 'createsuperuser', 'clearsessions'])
+        self.mock_sync_static.assert_called_once()
+        self.assertIn('Resumen de arranque', output)
+        self.assertIn('total', output)
+
+    def test_second_run_skips_unchanged_steps(self):
+        """Verifica que una segunda ejecución omite los pasos cuyas entradas no cambiaron."""
+        self.run_bootstrap()
+        self.mock_call_command.reset_mock()
+        output = self.run_bootstrap()
+        self.assertNotIn('makemigrations', self.executed_commands())
+        self.assertNotIn('migrate', self.executed_commands())
+        self.assertIn('omitido', output)
+
+    def test_state_is_not_stored_in_public_static_storage(self):
+        """Verifica que el estado se guarda en la base de datos y no en los estáticos."""
+        self.run_bootstrap()
+        self.assertEqual(os.listdir(self.static_root), [])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT state FROM {STATE_TABLE} WHERE id = 1')
+            self.assertIn('makemigrations', json.loads(cursor.fetchone()[0]))
+
+    def test_force_runs_all_steps(self):
+        """Verifica que --force ignora el estado guardado."""
+        self.run_bootstrap()
+        self.mock_call_command.reset_mock()
+        self.run_bootstrap('--force')
+        self.assertIn('makemigrations', self.executed_commands())
+        self.assertIn('migrate', self.executed_commands())
+
+    def tearDown(self):
+        """Limpia el estado temporal y los parches."""
+        self.patcher.stop()
+        self.sync_patcher.stop()
+        self.settings_override.disable()
+        shutil.rmtree(self.static_root, ignore_errors=True)
@@ -0,0 +1,34 @@
+from django.test import TestCase
+
+from core.budgets import Budget, VIEW_BUDGETS
+from core.health import db_monitor
+from core.testing import ViewBudgetMixin
+
+
+class ViewBudgetTests(ViewBudgetMixin, TestCase):
+    """Suite de pruebas que aplica los presupuestos de queries, tamaño y tiempo por ruta."""
+
+    def setUp(self):
+        """Descarta el resultado cacheado del monitor para medir la verificación en vivo."""
+        db_monitor.reset()
+
+    def test_core_urls_within_budgets(self):
+        """Verifica que todas las rutas de core.urls cumplen su presupuesto con y sin HTMX."""
+        self.assertAllWithinBudgets()
+
+    def test_exceeded_budget_reports_diff(self):
+        """Verifica que un presupuesto excedido falla mostrando la métrica, el valor y la diferencia."""
+        self.budgets = {**VIEW_BUDGETS, 'home': Budget(max_queries=0, max_bytes=100, max_ms=200)}
+        with self.assertRaises(AssertionError) as error:
+            self.assertWithinBudget('home')
+        message = str(error.exception)
+        self.assertIn('Presupuestos excedidos', message)
+        self.assertIn('home[htmx]', message)
+        self.assertRegex(message, r'home\s+bytes\s+\d+\s+100\s+\+')
+        self.assertRegex(message, r'home\s+queries\s+\d+\s+0\s+\+')
+
+    def test_route_without_budget_fails(self):
+        """Verifica que una ruta nueva sin presupuesto declarado hace fallar la verificación."""
+        self.budgets = {name: budget for name, budget in VIEW_BUDGETS.items() if name != 'htmx_demo'}
+        with self.assertRaisesMessage(AssertionError, 'Rutas sin presupuesto en core.budgets.VIEW_BUDGETS: htmx_demo'):
+            self.assertAllWithinBudgets()
@@ -0,0 +1,66 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django_components import registry
+
+from core.bundles import load_bundles
+from core.vite import script_tag, stylesheet_tags
+
+
+class ComponentBundleTests(TestCase):
+    """Suite de pruebas para el Media de los componentes servido desde chunks de Vite."""
+
+    def test_bundles_are_up_to_date(self):
+        """Verifica que frontend/components/ refleja el Media de los componentes registrados."""
+        call_command('componentbundles', check=True, stdout=StringIO())
+
+    def test_source_media_is_preserved(self):
+        """Verifica que el Media original queda disponible para regenerar las entradas."""
+        ping = registry.get('ping')
+        self.assertEqual(ping._source_media.js, ['core/ping/ping.js'])
+        self.assertEqual(load_bundles()['ping']['entry'], 'frontend/components/ping.js')
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_page_references_only_component_chunk(self):
+        """Verifica que la página carga el chunk del componente y no sus archivos sin procesar."""
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, 'http://localhost:5173/static/frontend/components/ping.js')
+        self.assertNotContains(response, 'core/ping/ping.js')
+        self.assertNotContains(response, 'core/ping/ping.css')
+
+
+class ViteManifestTests(SimpleTestCase):
+    """Suite de pruebas para las etiquetas resueltas con el manifiesto de Vite."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        manifest_path = Path(directory.name) / 'manifest.json'
+        manifest_path.write_text(json.dumps({
+            'frontend/components/ping.js': {
+                'file': 'assets/component-ping-3f2a.js',
+                'src': 'frontend/components/ping.js',
+                'isEntry': True,
+                'css': ['assets/component-ping-9c1d.css'],
+                'imports': ['_shared-77aa.js'],
+            },
+            '_shared-77aa.js': {'file': 'assets/shared-77aa.js', 'css': ['assets/shared-41bb.css']},
+        }))
+        vite = {'default': {**settings.DJANGO_VITE['default'], 'dev_mode': False, 'manifest_path': manifest_path}}
+        override = override_settings(DJANGO_VITE=vite)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_production_tags_use_hashed_files(self):
+        """Verifica que en producción se usan los archivos con hash y los CSS de los imports."""
+        self.assertIn('assets/component-ping-3f2a.js', script_tag('frontend/components/ping.js'))
+        tags = stylesheet_tags('frontend/components/ping.js')
+        self.assertEqual(len(tags), 2)
+        self.assertIn('assets/component-ping-9c1d.css', tags[0])
+        self.assertIn('assets/shared-41bb.css', tags[1])
@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default-tests'},
+    'tiered': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'tiered-tests',
+        'OPTIONS': {'SHARED': 'shared', 'LOCAL_MAX_ENTRIES': 3, 'LOCAL_MAX_BYTES': 4096, 'LOCAL_TIMEOUT': 60},
+    },
+    'shared': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TieredCacheTests(TestCase):
+    """Suite de pruebas para el backend de caché en dos niveles con nivel compartido en base de datos."""
+
+    def setUp(self):
+        """Limpia ambos niveles del caché."""
+        self.cache = caches['tiered']
+        self.shared = caches['shared']
+        self.cache.clear()
+        self.cache._stats.clear()
+
+    def counters(self, prefix):
+        return self.cache.stats()['prefixes'][prefix]
+
+    def test_write_through_and_local_hit(self):
+        """Verifica que set escribe en ambos niveles y la lectura siguiente no consulta el compartido."""
+        self.cache.set('views:a', 'valor')
+        self.assertEqual(self.shared.get('views:a'), 'valor')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.get('views:a'), 'valor')
+        self.assertEqual(self.counters('views')['local_hits'], 1)
+
+    def test_read_through_populates_local_tier(self):
+        """Verifica que un valor presente solo en el nivel compartido se copia al local."""
+        self.shared.set('views:b', 42)
+        self.assertEqual(self.cache.get('views:b'), 42)
+        self.assertEqual(self.counters('views')['shared_hits'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cache.get('views:b'), 42)
+
+    def test_shared_hit_keeps_remaining_lifetime(self):
+        """Verifica que otro proceso copia al nivel local un valor compartido solo por el tiempo que le queda."""
+        self.cache.set('short:1', 'valor', timeout=5)
+        with patch.dict('core.cache._local_tiers', clear=True):
+            worker = caches.create_connection('tiered')
+        self.assertEqual(worker.get('short:1'), 'valor')
+        expires_at, _ = worker._local[worker.make_key('short:1')]
+        self.assertLessEqual(expires_at - time.monotonic(), 5)
+        self.shared.set('short:2', 'externo')
+        worker.get('short:2')
+        expires_at, _ = worker._local[worker.make_key('short:2')]
+        self.assertGreater(expires_at - time.monotonic(), 5)
+
+    def test_miss_is_counted(self):
+        """Verifica que los fallos se contabilizan por prefijo."""
+        self.assertIsNone(self.cache.get('sessions:missing'))
+        self.assertEqual(self.counters('sessions')['misses'], 1)
+
+    def test_lru_eviction_by_entries(self):
+        """Verifica que el nivel local expulsa la entrada menos usada al superar el límite."""
+        for key in ['c:1', 'c:2', 'c:3']:
+            self.cache.set(key, key)
+        self.cache.get('c:1')
+        self.cache.set('c:4', 'c:4')
+        self.assertEqual(self.cache.stats()['local_entries'], 3)
+        self.assertEqual(self.counters('c')['evictions'], 1)
+        self.assertNotIn(self.cache.make_key('c:2'), self.cache._local)
+        self.assertIn(self.cache.make_key('c:1'), self.cache._local)
+
+    def test_eviction_by_bytes(self):
+        """Verifica que el límite de bytes se respeta."""
+        self.cache.set('big:1', 'x' * 3000)
+        self.cache.set('big:2', 'y' * 3000)
+        self.assertLessEqual(self.cache.stats()['local_bytes'], 4096)
+        self.assertEqual(self.cache.get('big:1'), 'x' * 3000)
+
+    def test_delete_removes_both_tiers(self):
+        """Verifica que delete elimina la clave en ambos niveles."""
+        self.cache.set('d:1', 1)
+        self.assertTrue(self.cache.delete('d:1'))
+        self.assertIsNone(self.cache.get('d:1'))
+        self.assertIsNone(self.shared.get('d:1'))
+
+    def test_get_or_set_prevents_stampede(self):
+        """Verifica que fallos concurrentes de la misma clave calculan el valor una sola vez."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'calculado'
+
+        results = []
+        with patch.object(self.cache, 'shared_alias', None):
+            threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_set('s:key', compute))) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['calculado'] * 5)
+
+    def test_shared_failure_falls_back_to_local(self):
+        """Verifica que un error del nivel compartido no propaga excepciones."""
+        with patch.object(self.shared, 'set', side_effect=Exception("Simulated cache failure")):
+            self.cache.set('f:1', 'local')
+        self.assertEqual(self.cache.get('f:1'), 'local')
+
+    def tearDown(self):
+        """Limpia el caché después de cada prueba."""
+        self.cache.clear()
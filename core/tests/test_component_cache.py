@@ -0,0 +1,70 @@
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from components.core.ping.ping import Ping
+from core.extensions import _template_paths
+
+
+class ComponentRenderCacheTests(SimpleTestCase):
+    """Suite de pruebas para la caché de render de componentes."""
+
+    def setUp(self):
+        """Vacía la caché de componentes y sus estadísticas."""
+        self.cache = caches['components']
+        self.cache.clear()
+        self.cache._stats.clear()
+
+    def render(self, ping):
+        return Template('{% component "ping" ping=ping / %}').render(Context({'ping': ping}))
+
+    def test_same_props_render_once(self):
+        """Verifica que el mismo prop reutiliza el HTML sin volver a calcular el contexto."""
+        with patch.object(Ping, 'get_context_data', autospec=True, side_effect=Ping.get_context_data) as context_data:
+            first = self.render('a')
+            second = self.render('a')
+            self.render('b')
+        self.assertEqual(context_data.call_count, 2)
+        self.assertIn('PONG', first)
+        self.assertEqual(first, second)
+        stats = self.cache.stats()['prefixes']['component.ping']
+        self.assertEqual((stats['local_hits'], stats['misses']), (1, 2))
+
+    @override_settings(COMPONENT_CACHE_ENABLED=False)
+    def test_disabled_globally(self):
+        """Verifica que COMPONENT_CACHE_ENABLED=False desactiva la memoización."""
+        with patch.object(Ping, 'get_context_data', autospec=True, side_effect=Ping.get_context_data) as context_data:
+            self.render('a')
+            self.render('a')
+        self.assertEqual(context_data.call_count, 2)
+
+    @override_settings(DEBUG=True)
+    def test_template_change_invalidates_in_debug(self):
+        """Verifica que en DEBUG modificar la plantilla invalida los fragmentos cacheados."""
+        self.render('a')
+        path = _template_paths[Ping]
+        stat = os.stat(path)
+        try:
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            with patch.object(Ping, 'get_context_data', autospec=True, side_effect=Ping.get_context_data) as context_data:
+                self.render('a')
+            self.assertEqual(context_data.call_count, 1)
+        finally:
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def test_key_uses_declared_props_and_user(self):
+        """Verifica que la clave depende solo de los props declarados y, si se pide, del usuario."""
+        config = Ping(registered_name='ping').render_cache
+        anonymous = {'request': SimpleNamespace(user=AnonymousUser())}
+        alice = {'request': SimpleNamespace(user=SimpleNamespace(pk=1, is_authenticated=True))}
+        key = config.get_cache_key([], {'ping': 'a'}, anonymous)
+        self.assertTrue(key.startswith('component.ping:'))
+        self.assertEqual(key, config.get_cache_key([], {'ping': 'a', 'ignored': 1}, alice))
+        self.assertNotEqual(key, config.get_cache_key([], {'ping': 'b'}, anonymous))
+        config.vary_on_user = True
+        self.assertNotEqual(config.get_cache_key([], {'ping': 'a'}, anonymous), config.get_cache_key([], {'ping': 'a'}, alice))
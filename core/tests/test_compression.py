@@ -0,0 +1,109 @@
+import gzip
+import zlib
+
+import brotli
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware import CompressionMiddleware
+from core.response_cache import get_cache
+
+PAGE = '<div class="bg-green-50 border border-green-200 rounded p-3 text-green-700">ok</div>\n' * 50
+
+
+def make_middleware(response):
+    return CompressionMiddleware(lambda request: response() if callable(response) else response)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=512)
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Suite de pruebas para la compresión de respuestas dinámicas."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get(self, response, **headers):
+        request = self.factory.get('/', **headers)
+        return make_middleware(response)(request)
+
+    def test_prefers_brotli_then_gzip(self):
+        """Verifica la negociación según Accept-Encoding y el Vary de las respuestas HTML."""
+        response = self.get(lambda: HttpResponse(PAGE), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content).decode(), PAGE)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding, HX-Request')
+
+        response = self.get(lambda: HttpResponse(PAGE), HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content).decode(), PAGE)
+
+        response = self.get(lambda: HttpResponse(PAGE))
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response['Vary'], 'Accept-Encoding, HX-Request')
+
+    def test_skips_small_and_disallowed_responses(self):
+        """Verifica el umbral de tamaño y la lista de tipos de contenido."""
+        response = self.get(lambda: HttpResponse('<p>hola</p>'), HTTP_ACCEPT_ENCODING='br')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('Vary', response)
+        response = self.get(lambda: HttpResponse(b'\x89PNG' * 500, content_type='image/png'), HTTP_ACCEPT_ENCODING='br')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_strong_etag_becomes_weak(self):
+        """Verifica que el ETag fuerte pasa a débil al cambiar el cuerpo."""
+        def view():
+            response = HttpResponse(PAGE)
+            response['ETag'] = '"abc"'
+            return response
+        response = self.get(view, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_streaming_responses_are_flushed_per_chunk(self):
+        """Verifica que cada fragmento se puede descomprimir apenas llega."""
+        response = self.get(
+            lambda: StreamingHttpResponse(iter([b'data: uno\n\n', b'data: dos\n\n']), content_type='text/plain'),
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        decompressor = zlib.decompressobj(31)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(decompressor.decompress(next(chunks)), b'data: uno\n\n')
+        self.assertEqual(decompressor.decompress(next(chunks)), b'data: dos\n\n')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=512, RESPONSE_CACHE_ENABLED=False)
+class CompressionStackTests(TestCase):
+    """Suite de pruebas de la compresión a través del MIDDLEWARE completo."""
+
+    def test_csrf_pages_only_compressed_for_same_site_requests(self):
+        """Verifica la mitigación de BREACH en `home`, que incluye el token CSRF."""
+        client = Client()
+        cross_site = client.get(reverse('home'), HTTP_ACCEPT_ENCODING='br', HTTP_SEC_FETCH_SITE='cross-site')
+        self.assertEqual(cross_site.status_code, 200)
+        self.assertNotIn('Content-Encoding', cross_site)
+        self.assertIn(b'x-csrftoken', cross_site.content)
+        legacy = client.get(reverse('home'), HTTP_ACCEPT_ENCODING='br')
+        self.assertNotIn('Content-Encoding', legacy)
+        same_origin = client.get(reverse('home'), HTTP_ACCEPT_ENCODING='br', HTTP_SEC_FETCH_SITE='same-origin')
+        self.assertEqual(same_origin['Content-Encoding'], 'br')
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_cached_csrf_pages_are_not_compressed_cross_site(self):
+        """Verifica la mitigación cuando el token se inserta en una respuesta cacheada."""
+        self.addCleanup(get_cache().clear)
+        client = Client()
+        for _ in range(2):
+            response = client.get(reverse('home'), HTTP_ACCEPT_ENCODING='br', HTTP_SEC_FETCH_SITE='cross-site')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Content-Encoding', response)
+
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_pages_without_token_are_compressed_cross_site(self):
+        """Verifica que las respuestas sin el token CSRF se comprimen para cualquier origen."""
+        response = Client().get(
+            reverse('metrics'), HTTP_ACCEPT_ENCODING='br', HTTP_SEC_FETCH_SITE='cross-site',
+            HTTP_AUTHORIZATION='Bearer secreto',
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock, patch
+
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.dbpool import pool_stats
+
+
+class DatabasePoolTests(TestCase):
+    """Suite de pruebas para las métricas del pool de conexiones."""
+
+    def test_stats_without_pool(self):
+        """Verifica que sin pool se informa el modo de conexión configurado."""
+        with patch.object(connections['default'], 'pool', None, create=True):
+            stats = pool_stats()
+        self.assertIn(stats['mode'], ['persistent', 'per_request'])
+        self.assertIn('conn_max_age', stats)
+
+    def test_stats_with_pool(self):
+        """Verifica que las estadísticas de psycopg_pool se traducen a nombres estables."""
+        pool = MagicMock()
+        pool.get_stats.return_value = {
+            'pool_min': 1, 'pool_max': 10, 'pool_size': 3, 'pool_available': 2,
+            'requests_waiting': 0, 'requests_num': 42, 'requests_queued': 5, 'requests_wait_ms': 120,
+        }
+        with patch.object(connections['default'], 'pool', pool, create=True):
+            stats = pool_stats()
+        self.assertEqual(stats['mode'], 'pool')
+        self.assertEqual(stats['checkouts'], 42)
+        self.assertEqual(stats['overflow'], 5)
+        self.assertEqual(stats['wait_ms'], 120)
+        self.assertEqual(stats['size'], 3)
+        self.assertEqual(stats['connect_errors'], 0)
+
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_pool_stats_endpoint(self):
+        """Verifica que el endpoint de estadísticas del pool responde JSON con el token interno."""
+        response = self.client.get(reverse('db_pool_stats'), HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('mode', response.json())
+
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_pool_stats_endpoint_is_internal(self):
+        """Verifica que sin el token ni sesión de staff el endpoint responde 404."""
+        self.assertEqual(self.client.get(reverse('db_pool_stats')).status_code, 404)
+        response = self.client.get(reverse('db_pool_stats'), HTTP_AUTHORIZATION='Bearer otro')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import boto3
+from django.contrib.auth.models import User
+from django.http import FileResponse, Http404
+from django.test import Client, RequestFactory, TestCase, override_settings
+from moto import mock_aws
+
+from core.downloads import RangeFile, RangeNotSatisfiable, can_download, parse_range, serve_storage
+
+BUCKET = 'test-media-bucket'
+S3_STORAGES = {
+    'default': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {'bucket_name': BUCKET, 'region_name': 'us-east-1'},
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+DATA = bytes(range(256)) * 64  # 16 KiB
+
+
+def body(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+class RangeParsingTests(TestCase):
+    """Suite de pruebas para la interpretación de la cabecera Range."""
+
+    def test_ranges(self):
+        """Verifica rangos cerrados, abiertos, sufijos y los que se ignoran."""
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=950-2000', 1000), (950, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertIsNone(parse_range(None, 1000))
+        self.assertIsNone(parse_range('bytes=0-1,5-9', 1000))
+        self.assertIsNone(parse_range('items=0-1', 1000))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range('bytes=1000-', 1000)
+
+
+@override_settings(MEDIA_STREAM_CHUNK_SIZE=4096)
+class LocalDownloadTests(TestCase):
+    """Suite de pruebas para las descargas desde el storage local."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        os.makedirs(os.path.join(self.media_root, 'docs'))
+        with open(os.path.join(self.media_root, 'docs', 'data.bin'), 'wb') as handle:
+            handle.write(DATA)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.client = Client()
+
+    def test_full_file_is_a_file_response(self):
+        """Verifica que el archivo completo se sirve con FileResponse (sendfile) y validadores."""
+        response = self.client.get('/media/docs/data.bin')
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(DATA)))
+        self.assertIn('ETag', response)
+        self.assertEqual(body(response), DATA)
+
+    def test_range_request(self):
+        """Verifica que un rango responde 206 con solo esos bytes."""
+        response = self.client.get('/media/docs/data.bin', HTTP_RANGE='bytes=100-5099')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-5099/{len(DATA)}')
+        self.assertEqual(response['Content-Length'], '5000')
+        self.assertEqual(body(response), DATA[100:5100])
+
+    def test_range_keeps_the_file_for_sendfile(self):
+        """Verifica que el rango se envía como archivo posicionado (apto para sendfile)."""
+        request = RequestFactory().get('/media/docs/data.bin', HTTP_RANGE='bytes=100-199')
+        response = serve_storage(request, 'docs/data.bin')
+        self.assertIsInstance(response.file_to_stream, RangeFile)
+        self.assertEqual(os.lseek(response.file_to_stream.fileno(), 0, os.SEEK_CUR), 100)
+        self.assertEqual(body(response), DATA[100:200])
+        # Solo el archivo: `response.close()` emite `request_finished` y cerraría la conexión de la prueba
+        response.file_to_stream.close()
+
+    def test_if_range(self):
+        """Verifica que If-Range con el ETag vigente respeta el rango y con otro envía todo."""
+        etag = self.client.get('/media/docs/data.bin')['ETag']
+        response = self.client.get('/media/docs/data.bin', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        response = self.client.get('/media/docs/data.bin', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"viejo"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body(response), DATA)
+
+    def test_conditional_and_unsatisfiable(self):
+        """Verifica el 304 con If-None-Match y el 416 con un rango fuera del archivo."""
+        etag = self.client.get('/media/docs/data.bin')['ETag']
+        self.assertEqual(self.client.get('/media/docs/data.bin', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        response = self.client.get('/media/docs/data.bin', HTTP_RANGE='bytes=999999-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(DATA)}')
+
+    def test_missing_and_traversal(self):
+        """Verifica que los archivos inexistentes y las rutas fuera del storage dan 404."""
+        self.assertEqual(self.client.get('/media/docs/nada.bin').status_code, 404)
+        self.assertEqual(self.client.get('/media/../settings.py').status_code, 404)
+
+    def test_text_files_are_not_compressed(self):
+        """Verifica que las descargas de texto no pasan por la compresión de respuestas."""
+        with open(os.path.join(self.media_root, 'docs', 'notes.txt'), 'w') as handle:
+            handle.write('hola ' * 1000)
+        response = self.client.get('/media/docs/notes.txt', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_uploads_are_private(self):
+        """Verifica que los archivos subidos solo los descarga su dueño."""
+        owner = User.objects.create_user('owner')
+        other = User.objects.create_user('other')
+        self.assertFalse(can_download(other, f'uploads/{owner.pk}/x/a.png'))
+        self.assertFalse(can_download(other, f'uploads/x/../{owner.pk}/x/a.png'))
+        self.assertTrue(can_download(owner, f'uploads/{owner.pk}/x/a.png'))
+        self.assertTrue(can_download(other, 'docs/data.bin'))
+        self.assertEqual(self.client.get(f'/media/uploads/{owner.pk}/x/a.png').status_code, 404)
+
+
+@override_settings(STORAGES=S3_STORAGES, MEDIA_STREAM_CHUNK_SIZE=1024)
+class S3DownloadTests(TestCase):
+    """Suite de pruebas para las descargas desde un S3 local (moto)."""
+
+    def setUp(self):
+        self.env = patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+        })
+        self.env.start()
+        self.addCleanup(self.env.stop)
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        s3 = boto3.client('s3', region_name='us-east-1')
+        s3.create_bucket(Bucket=BUCKET)
+        s3.put_object(Bucket=BUCKET, Key='docs/data.bin', Body=DATA, ContentType='application/octet-stream')
+        self.factory = RequestFactory()
+
+    @override_settings(MEDIA_DOWNLOAD_MODE='redirect')
+    def test_redirect_to_signed_url(self):
+        """Verifica que en modo redirect se responde con una URL prefirmada del objeto."""
+        response = serve_storage(self.factory.get('/media/docs/data.bin'), 'docs/data.bin', as_attachment=True)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('X-Amz-Signature=', response['Location'])
+        self.assertIn('response-content-disposition=attachment', response['Location'])
+
+    @override_settings(MEDIA_DOWNLOAD_MODE='stream')
+    def test_stream_in_chunks(self):
+        """Verifica que en modo stream el objeto se reenvía en fragmentos acotados."""
+        response = serve_storage(self.factory.get('/media/docs/data.bin'), 'docs/data.bin')
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), len(DATA) // 1024)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        self.assertEqual(b''.join(chunks), DATA)
+        self.assertEqual(response['Content-Length'], str(len(DATA)))
+
+    @override_settings(MEDIA_DOWNLOAD_MODE='stream')
+    def test_stream_range_and_if_range(self):
+        """Verifica que el rango se delega a S3 y que If-Range obsoleto envía el objeto completo."""
+        request = self.factory.get('/media/docs/data.bin', HTTP_RANGE='bytes=10-19')
+        response = serve_storage(request, 'docs/data.bin')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(DATA)}')
+        self.assertEqual(body(response), DATA[10:20])
+
+        request = self.factory.get('/media/docs/data.bin', HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"viejo"')
+        response = serve_storage(request, 'docs/data.bin')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body(response), DATA)
+
+    @override_settings(MEDIA_DOWNLOAD_MODE='stream')
+    def test_stream_errors(self):
+        """Verifica el 304 con el ETag vigente y el 404 de un objeto inexistente."""
+        etag = serve_storage(self.factory.get('/'), 'docs/data.bin')['ETag']
+        response = serve_storage(self.factory.get('/', HTTP_IF_NONE_MATCH=etag), 'docs/data.bin')
+        self.assertEqual(response.status_code, 304)
+        with self.assertRaises(Http404):
+            serve_storage(self.factory.get('/'), 'docs/nada.bin')
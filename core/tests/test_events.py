@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+from django.test import Client, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from core.events import HEARTBEAT, broadcaster, format_event
+from core.views import demo_ticker
+from project.asgi import application
+
+
+class ASGIStream:
+    """Cliente ASGI en proceso que lee un stream sin esperar a que termine."""
+
+    def __init__(self, path):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'headers': [(b'host', b'localhost'), (b'accept', b'text/event-stream')],
+            'client': ('127.0.0.1', 1234), 'server': ('localhost', 80),
+        }
+        self.requests = asyncio.Queue()
+        self.messages = asyncio.Queue()
+        self.buffer = b''
+
+    async def __aenter__(self):
+        await self.requests.put({'type': 'http.request', 'body': b'', 'more_body': False})
+        self.task = asyncio.create_task(application(self.scope, self.requests.get, self.messages.put))
+        self.start = await asyncio.wait_for(self.messages.get(), 5)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.requests.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(self.task, 5)
+
+    @property
+    def status(self):
+        return self.start['status']
+
+    @property
+    def headers(self):
+        return {name.decode().lower(): value.decode() for name, value in self.start['headers']}
+
+    async def read_message(self):
+        """Devuelve el siguiente mensaje SSE completo (terminado en línea en blanco)."""
+        while b'\n\n' not in self.buffer:
+            message = await asyncio.wait_for(self.messages.get(), 5)
+            self.buffer += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        message, _, self.buffer = self.buffer.partition(b'\n\n')
+        return message + b'\n\n' if message else b''
+
+
+@override_settings(SSE_HEARTBEAT=0.05, SSE_MAX_CONNECTIONS=2, SSE_QUEUE_SIZE=4, SSE_RETRY_MS=1000)
+class EventStreamTests(SimpleTestCase):
+    """Suite de pruebas para el endpoint SSE servido por `project.asgi`."""
+
+    # Las requests pueden volcar sesiones diferidas de otras pruebas (ver core.sessions)
+    databases = {'default'}
+
+    def setUp(self):
+        broadcaster.reset()
+        # El reloj de la demo no publica durante las pruebas
+        demo_ticker.interval = 3600
+
+    async def test_fan_out_to_all_connections(self):
+        """Verifica que un evento publicado llega a todas las conexiones abiertas."""
+        async with ASGIStream('/core/events/') as first, ASGIStream('/core/events/') as second:
+            self.assertEqual(first.status, 200)
+            self.assertEqual(first.headers['content-type'], 'text/event-stream')
+            self.assertEqual(first.headers['cache-control'], 'no-cache')
+            self.assertEqual(await first.read_message(), b'retry: 1000\n\n')
+            self.assertEqual(await second.read_message(), b'retry: 1000\n\n')
+            broadcaster.publish('<p>hola</p>', event='news')
+            expected = b'event: news\ndata: <p>hola</p>\n\n'
+            # La demo publica su primer tick al conectarse; se saltan los eventos ajenos
+            for stream in (first, second):
+                message = await stream.read_message()
+                while message.startswith(b'event: htmx-demo'):
+                    message = await stream.read_message()
+                self.assertEqual(message, expected)
+        self.assertEqual(broadcaster.connections(), 0)
+
+    async def test_heartbeat(self):
+        """Verifica que sin eventos se envían heartbeats."""
+        async with ASGIStream('/core/events/') as stream:
+            await stream.read_message()
+            messages = [await stream.read_message() for _ in range(3)]
+            self.assertIn(HEARTBEAT, messages)
+
+    async def test_publish_from_another_thread(self):
+        """Verifica que se puede publicar desde un hilo distinto al del event loop."""
+        async with ASGIStream('/core/events/') as stream:
+            await stream.read_message()
+            thread = threading.Thread(target=broadcaster.publish, args=('desde hilo',), kwargs={'event': 'sync'})
+            thread.start()
+            thread.join()
+            messages = [await stream.read_message() for _ in range(4)]
+            self.assertIn(b'event: sync\ndata: desde hilo\n\n', messages)
+
+    async def test_connection_limit(self):
+        """Verifica que por encima de SSE_MAX_CONNECTIONS se responde 503."""
+        async with ASGIStream('/core/events/'), ASGIStream('/core/events/'):
+            async with ASGIStream('/core/events/') as third:
+                self.assertEqual(third.status, 503)
+                self.assertIn('retry-after', third.headers)
+        self.assertEqual(broadcaster.stats()['rejected'], 1)
+
+    async def test_slow_client_is_disconnected(self):
+        """Verifica que una conexión que no consume su cola se cierra sin afectar a las demás."""
+        async with ASGIStream('/core/events/') as slow:
+            for index in range(10):
+                broadcaster.publish(index)
+            await asyncio.sleep(0.05)
+            self.assertEqual(broadcaster.connections(), 0)
+            self.assertEqual(broadcaster.stats()['disconnected'], 1)
+            # El stream termina en lugar de acumular eventos
+            while (await slow.read_message()):
+                pass
+
+
+class EventFormatTests(SimpleTestCase):
+    """Suite de pruebas para el formato de los eventos."""
+
+    def test_multiline_data(self):
+        """Verifica que cada línea del fragmento va en su propio campo data."""
+        self.assertEqual(format_event('<a>\n</a>', event='x', id=3), b'id: 3\nevent: x\ndata: <a>\ndata: </a>\n\n')
+
+    def test_wsgi_is_not_supported(self):
+        """Verifica que con WSGI el endpoint responde 501 en lugar de ocupar un hilo."""
+        response = Client().get(reverse('events'))
+        self.assertEqual(response.status_code, 501)
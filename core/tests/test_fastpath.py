@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from django.test import Client, TestCase, override_settings
+
+from core.fastpath import FastPathASGI, FastPathWSGI
+from core.health import db_monitor
+
+
+@override_settings(HEALTH_DB_INTERVAL=0, HEALTH_DB_MAX_AGE=60)
+class HealthFastPathTests(TestCase):
+    """Suite de pruebas para el carril rápido de sondas de salud en la entrada WSGI/ASGI."""
+
+    def setUp(self):
+        """Crea envoltorios sobre una aplicación simulada."""
+        db_monitor.reset()
+        self.wsgi_app = MagicMock(return_value=[b'django'])
+        self.wsgi = FastPathWSGI(self.wsgi_app)
+
+    def call_wsgi(self, path, method='GET', query_string=''):
+        start_response = MagicMock()
+        environ = {'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query_string}
+        body = b''.join(self.wsgi(environ, start_response))
+        status = start_response.call_args[0][0] if start_response.called else None
+        return status, body
+
+    def test_liveness_bypasses_django(self):
+        """Verifica que /core/health/ se responde sin llamar a la aplicación de Django."""
+        status, body = self.call_wsgi('/core/health/')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, Client().get('/core/health/').content)
+        self.wsgi_app.assert_not_called()
+
+    def test_head_has_no_body(self):
+        """Verifica que HEAD responde sin cuerpo."""
+        status, body = self.call_wsgi('/core/health/', method='HEAD')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, b'')
+
+    def test_db_probe_serves_cached_result(self):
+        """Verifica que la sonda de base de datos sirve el resultado cacheado sin consultas."""
+        db_monitor.check()
+        with self.assertNumQueries(0):
+            status, body = self.call_wsgi('/core/health/db/')
+        self.assertEqual(status, '200 OK')
+        self.assertIn(b'"source": "cache"', body)
+        self.wsgi_app.assert_not_called()
+
+    def test_db_probe_delegates_without_cached_result(self):
+        """Verifica que sin resultado cacheado o con ?fresh=1 la request pasa a Django."""
+        self.call_wsgi('/core/health/db/')
+        self.assertEqual(self.wsgi_app.call_count, 1)
+        db_monitor.check()
+        self.call_wsgi('/core/health/db/', query_string='fresh=1')
+        self.assertEqual(self.wsgi_app.call_count, 2)
+
+    def test_other_paths_reach_django(self):
+        """Verifica que las rutas no registradas y los métodos no GET siguen el camino normal."""
+        self.call_wsgi('/core/home/')
+        self.call_wsgi('/core/health/', method='POST')
+        self.assertEqual(self.wsgi_app.call_count, 2)
+
+    def test_asgi_liveness_bypasses_django(self):
+        """Verifica que el envoltorio ASGI responde la sonda sin llamar a Django."""
+        inner = MagicMock()
+        app = FastPathASGI(inner)
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/core/health/', 'query_string': b''}
+        asyncio.run(app(scope, None, send))
+        inner.assert_not_called()
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertIn((b'content-type', b'application/json'), messages[0]['headers'])
+        self.assertIn(b'"status": "ok"', messages[1]['body'])
+
+    def tearDown(self):
+        """Descarta el resultado cacheado del monitor."""
+        db_monitor.reset()
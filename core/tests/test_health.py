@@ -0,0 +1,60 @@
+import time
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from core.health import DatabaseHealthMonitor
+
+
+@override_settings(HEALTH_DB_INTERVAL=0, HEALTH_DB_MAX_AGE=60, HEALTH_DB_WINDOW=4)
+class DatabaseHealthMonitorTests(TestCase):
+    """Suite de pruebas para el monitor de salud de la base de datos."""
+
+    def setUp(self):
+        """Crea un monitor nuevo para cada test."""
+        self.monitor = DatabaseHealthMonitor()
+
+    def test_first_snapshot_is_live(self):
+        """Verifica que sin resultado previo se verifica en vivo."""
+        state = self.monitor.snapshot()
+        self.assertTrue(state['ok'])
+        self.assertEqual(state['source'], 'live')
+        self.assertGreaterEqual(state['latency_ms'], 0)
+
+    def test_cached_snapshot_reports_age(self):
+        """Verifica que el resultado cacheado informa su antigüedad."""
+        self.monitor.snapshot()
+        with patch.object(self.monitor, 'ping') as mock_ping:
+            state = self.monitor.snapshot()
+        mock_ping.assert_not_called()
+        self.assertEqual(state['source'], 'cache')
+        self.assertGreaterEqual(state['age_s'], 0)
+
+    def test_stale_result_is_refreshed(self):
+        """Verifica que un resultado vencido provoca una verificación en vivo."""
+        self.monitor.snapshot()
+        with patch('core.health.time.time', return_value=time.time() + 120):
+            self.assertTrue(self.monitor.needs_check())
+
+    def test_rolling_error_rate(self):
+        """Verifica que la tasa de error se calcula sobre la ventana móvil."""
+        with patch.object(self.monitor, 'ping', side_effect=Exception("Simulated DB failure")):
+            self.monitor.check()
+            self.monitor.check()
+        self.monitor.check()
+        state = self.monitor.snapshot(fresh=True)
+        self.assertEqual(state['samples'], 4)
+        self.assertEqual(state['error_rate'], 0.5)
+
+    @override_settings(HEALTH_DB_INTERVAL=0.05)
+    def test_background_refresh(self):
+        """Verifica que el hilo de fondo mantiene actualizado el resultado."""
+        with patch.object(self.monitor, 'ping'):
+            self.monitor.ensure_started()
+            time.sleep(0.3)
+            self.monitor.stop()
+        self.assertGreaterEqual(self.monitor.snapshot()['samples'], 2)
+
+    def tearDown(self):
+        """Detiene el hilo de fondo si quedó activo."""
+        self.monitor.stop()
@@ -0,0 +1,161 @@
+import io
+import json
+import sys
+import time
+
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from loguru import logger
+
+from core.logpipeline import Sampler, json_format, parse_rates
+from core.logsink import StreamLogSink
+
+
+class CapturedLogs:
+    """Handler temporal de Loguru con el formato JSON y el muestreo indicados."""
+
+    def __init__(self, sampler=None):
+        self.sampler = sampler or Sampler()
+        self.lines = []
+
+    def __enter__(self):
+        self.handler = logger.add(
+            lambda message: self.lines.append(json.loads(message)), format=json_format,
+            level='DEBUG', filter=self.sampler.filter,
+        )
+        logger.configure(patcher=self.sampler.patch)
+        return self
+
+    def __exit__(self, *exc):
+        logger.remove(self.handler)
+        logger.configure(patcher=None)
+
+
+class JsonFormatTests(SimpleTestCase):
+    """Suite de pruebas para el formato JSON compacto."""
+
+    def test_fields(self):
+        """Verifica los campos base, los de extra y la excepción."""
+        with CapturedLogs() as logs:
+            logger.bind(user_id=7).info('hola {}', 'mundo')
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logger.exception('falló')
+        first, second = logs.lines
+        self.assertEqual(first['level'], 'INFO')
+        self.assertEqual(first['logger'], __name__)
+        self.assertEqual(first['msg'], 'hola mundo')
+        self.assertEqual(first['user_id'], 7)
+        self.assertTrue(first['ts'].endswith('Z'))
+        self.assertIn('ZeroDivisionError', second['exc'])
+
+    def test_compact_single_line(self):
+        """Verifica que cada registro es una sola línea sin espacios de relleno."""
+        output = []
+        handler = logger.add(output.append, format=json_format)
+        logger.info('a\nb {"x": 1}')
+        logger.remove(handler)
+        line = str(output[0])
+        self.assertEqual(line.count('\n'), 1)
+        self.assertTrue(line.startswith('{"ts":"'))
+        self.assertEqual(json.loads(line)['msg'], 'a\nb {"x": 1}')
+
+
+class SamplerTests(SimpleTestCase):
+    """Suite de pruebas para el muestreo por logger."""
+
+    def test_rates_by_prefix(self):
+        """Verifica que gana el prefijo más largo y que se ignoran prefijos parciales."""
+        sampler = Sampler(rate=0.5, rates=parse_rates('core=0.2, core.cache=0, access=1'))
+        self.assertEqual(sampler.rate_for('core.cache'), 0.0)
+        self.assertEqual(sampler.rate_for('core.middleware'), 0.2)
+        self.assertEqual(sampler.rate_for('corex'), 0.5)
+        self.assertEqual(sampler.rate_for('access'), 1.0)
+
+    def test_only_debug_and_info_are_sampled(self):
+        """Verifica que DEBUG e INFO se descartan con tasa 0 y WARNING se emite siempre."""
+        with CapturedLogs(Sampler(rate=0.0)) as logs:
+            logger.debug('d')
+            logger.info('i')
+            logger.warning('w')
+        self.assertEqual([line['msg'] for line in logs.lines], ['w'])
+        self.assertEqual(logs.sampler.dropped, 2)
+
+    def test_kept_records_carry_their_rate(self):
+        """Verifica que los registros conservados indican la tasa para reponderar."""
+        with CapturedLogs(Sampler(rate=0.999999)) as logs:
+            logger.info('i')
+        self.assertEqual(logs.lines[0]['sample_rate'], 0.999999)
+
+
+class StreamLogSinkTests(SimpleTestCase):
+    """Suite de pruebas para el sink de stdout en segundo plano."""
+
+    def test_writes_in_background(self):
+        """Verifica que los registros se escriben en orden desde el hilo de fondo."""
+        stream = io.StringIO()
+        sink = StreamLogSink(stream=stream)
+        for index in range(5):
+            sink(f'{index}\n')
+        self.assertTrue(sink.flush())
+        sink.stop()
+        self.assertEqual(stream.getvalue(), '0\n1\n2\n3\n4\n')
+        self.assertEqual(sink.stats()['written'], 5)
+
+    def test_full_queue_drops(self):
+        """Verifica que con la cola llena se descarta en lugar de bloquear la request."""
+        sink = StreamLogSink(stream=io.StringIO(), max_queue=2)
+        sink._worker = True  # Sin hilo de fondo la cola no se vacía
+        for index in range(5):
+            sink(f'{index}\n')
+        self.assertEqual(sink.stats()['dropped'], 3)
+        sink._worker = None
+
+    def test_flush_gives_up_when_writer_is_stuck(self):
+        """Verifica que flush no bloquea más que su timeout con la cola llena y el hilo atascado."""
+        sink = StreamLogSink(stream=io.StringIO(), max_queue=2)
+        sink._worker = True  # Sin hilo de fondo la cola no se vacía
+        for index in range(2):
+            sink(f'{index}\n')
+        started = time.monotonic()
+        self.assertFalse(sink.flush(timeout=0.1))
+        self.assertLess(time.monotonic() - started, 1)
+        sink._worker = None
+
+    def test_default_stream_is_resolved_on_write(self):
+        """Verifica que sin stream explícito se usa el sys.stdout vigente al escribir."""
+        stream = io.StringIO()
+        sink = StreamLogSink()
+        original, sys.stdout = sys.stdout, stream
+        try:
+            sink('x\n')
+            sink.flush()
+        finally:
+            sys.stdout = original
+            sink.stop()
+        self.assertEqual(stream.getvalue(), 'x\n')
+
+
+@override_settings(LOG_ACCESS=True, RESPONSE_CACHE_ENABLED=False, HEALTH_DB_INTERVAL=0)
+class AccessLogTests(TestCase):
+    """Suite de pruebas para las líneas de acceso estructuradas."""
+
+    def test_access_line(self):
+        """Verifica que cada request emite su línea de acceso con los campos de la request."""
+        with CapturedLogs() as logs:
+            Client().get(reverse('hello_world'), HTTP_X_FORWARDED_FOR='203.0.113.5, 10.0.0.1')
+        access = [line for line in logs.lines if line['logger'] == 'access']
+        self.assertEqual(len(access), 1)
+        line = access[0]
+        self.assertEqual(line['msg'], 'GET /core/hello/ 200')
+        self.assertEqual((line['method'], line['path'], line['status'], line['view']), ('GET', '/core/hello/', 200, 'hello_world'))
+        self.assertEqual(line['ip'], '203.0.113.5')
+        self.assertGreater(line['bytes'], 0)
+        self.assertIn('ms', line)
+
+    def test_access_lines_are_sampled(self):
+        """Verifica que las líneas de acceso se muestrean con su propia tasa."""
+        with CapturedLogs(Sampler(rates={'access': 0.0})) as logs:
+            Client().get(reverse('hello_world'))
+        self.assertFalse([line for line in logs.lines if line['logger'] == 'access'])
@@ -0,0 +1,80 @@
+import gzip
+import os
+from unittest.mock import patch
+
+import boto3
+from django.test import SimpleTestCase
+from moto import mock_aws
+
+from core.logsink import S3LogSink
+
+BUCKET = 'test-log-bucket'
+
+
+class S3LogSinkTests(SimpleTestCase):
+    """Suite de pruebas para el sink de logs en segundo plano contra un S3 local (moto)."""
+
+    def setUp(self):
+        """Crea un bucket simulado para recibir los lotes."""
+        self.env = patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+        })
+        self.env.start()
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket=BUCKET)
+
+    def shipped_lines(self):
+        lines = []
+        for item in self.s3.list_objects_v2(Bucket=BUCKET, Prefix='logs/').get('Contents', []):
+            body = self.s3.get_object(Bucket=BUCKET, Key=item['Key'])['Body'].read()
+            lines.extend(gzip.decompress(body).decode().splitlines())
+        return lines
+
+    def test_flush_ships_gzipped_batch(self):
+        """Verifica que los registros encolados se suben comprimidos en un único lote."""
+        sink = S3LogSink(BUCKET, flush_interval=60)
+        for i in range(3):
+            sink(f'linea {i}\n')
+        self.assertTrue(sink.flush())
+        sink.stop()
+        self.assertEqual(self.shipped_lines(), ['linea 0', 'linea 1', 'linea 2'])
+        stats = sink.stats()
+        self.assertEqual(stats['queued'], 3)
+        self.assertEqual(stats['shipped'], 3)
+        self.assertEqual(stats['batches'], 1)
+        self.assertEqual(stats['dropped'], 0)
+
+    def test_batches_split_by_size(self):
+        """Verifica que un lote se sube al superar el tamaño máximo."""
+        sink = S3LogSink(BUCKET, batch_bytes=20, flush_interval=60)
+        for i in range(4):
+            sink(f'registro {i:04d}\n')
+        sink.flush()
+        sink.stop()
+        self.assertEqual(sink.stats()['batches'], 2)
+        self.assertEqual(len(self.shipped_lines()), 4)
+
+    def test_drop_policy_when_queue_is_full(self):
+        """Verifica que con la cola llena los registros se descartan y se contabilizan."""
+        sink = S3LogSink(BUCKET, max_queue=2)
+        with patch.object(sink, '_ensure_worker'):
+            for i in range(5):
+                sink(f'{i}\n')
+        stats = sink.stats()
+        self.assertEqual(stats['queued'], 2)
+        self.assertEqual(stats['dropped'], 3)
+        self.assertEqual(stats['pending'], 2)
+
+    def test_invalid_policy(self):
+        """Verifica que una política desconocida se rechaza."""
+        with self.assertRaises(ValueError):
+            S3LogSink(BUCKET, policy='ignore')
+
+    def tearDown(self):
+        """Detiene la simulación de S3."""
+        self.mock.stop()
+        self.env.stop()
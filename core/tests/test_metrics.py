@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.health import db_monitor
+from core.metrics import CONTENT_TYPE, registry
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, RESPONSE_CACHE_ENABLED=False, HEALTH_DB_INTERVAL=0)
+class InstrumentationTests(TestCase):
+    """Suite de pruebas para el middleware de instrumentación y el endpoint de métricas."""
+
+    def setUp(self):
+        """Descarta las métricas acumuladas por otras pruebas."""
+        self.client = Client()
+        registry.reset()
+        db_monitor.reset()
+        caches['components'].clear()
+
+    def server_timing(self, response):
+        entries = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, duration = entry.split(';')[:2]
+            entries[name] = float(duration.removeprefix('dur='))
+        return entries
+
+    def test_server_timing_breakdown(self):
+        """Verifica que la cabecera incluye total, middleware, base de datos, plantillas y componentes."""
+        response = self.client.get(reverse('home'))
+        entries = self.server_timing(response)
+        for name in ('total', 'mw', 'db', 'tpl', 'comp-ping'):
+            self.assertIn(name, entries)
+        self.assertGreater(entries['tpl'], 0)
+        self.assertLessEqual(entries['tpl'], entries['total'])
+        self.assertLessEqual(entries['comp-ping'], entries['tpl'])
+
+    def test_db_queries_are_counted(self):
+        """Verifica que las queries ejecutadas por la vista se cuentan en el desglose."""
+        connection.ensure_connection()
+        response = self.client.get(reverse('db_health_check'), {'fresh': '1'})
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    @override_settings(METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_only_record_latency(self):
+        """Verifica que sin muestreo no hay cabecera pero la latencia se registra."""
+        response = self.client.get(reverse('hello_world'))
+        self.assertNotIn('Server-Timing', response)
+        body = registry.render()
+        self.assertIn('django_request_duration_seconds_count{view="hello_world"} 1', body)
+        self.assertNotIn('django_request_sampled_total{view="hello_world"}', body)
+
+    @override_settings(METRICS_TOKEN='secreto')
+    def test_metrics_endpoint_is_internal(self):
+        """Verifica que las métricas responden 404 al público y 200 al staff o con el token."""
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        self.client.force_login(get_user_model().objects.create_user('ana'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        self.assertEqual(Client().get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+
+    def test_metrics_endpoint(self):
+        """Verifica el formato de Prometheus con histogramas por nombre de URL y estadísticas del proceso."""
+        self.client.get(reverse('health'))
+        self.client.get(reverse('home'))
+        self.client.get('/no-existe/')
+        self.client.force_login(get_user_model().objects.create_user('ops', is_staff=True))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn('# TYPE django_request_duration_seconds histogram', body)
+        self.assertIn('django_request_duration_seconds_bucket{view="health",le="+Inf"} 1', body)
+        self.assertIn('django_request_duration_seconds_count{view="home"} 1', body)
+        self.assertIn('django_responses_total{view="<unresolved>",method="GET",status="404"} 1', body)
+        self.assertIn('django_component_renders_total{component="ping"} 1', body)
+        self.assertIn('django_db_pool{stat="conn_max_age"', body)
+        self.assertIn('django_cache_operations_total{cache="default",prefix="', body)
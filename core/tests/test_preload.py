@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django_vite.core.asset_loader import DjangoViteAssetLoader
+
+from core.vite import manifest_graph
+
+MANIFEST = {
+    'frontend/main.js': {
+        'file': 'assets/main-1a2b.js',
+        'src': 'frontend/main.js',
+        'isEntry': True,
+        'css': ['assets/main-3c4d.css'],
+        'imports': ['_vendor-5e6f.js'],
+    },
+    '_vendor-5e6f.js': {'file': 'assets/vendor-5e6f.js'},
+    'frontend/components/ping.js': {
+        'file': 'assets/component-ping-7a8b.js',
+        'src': 'frontend/components/ping.js',
+        'isEntry': True,
+        'css': ['assets/component-ping-9c0d.css'],
+    },
+}
+NAVIGATION = {'HTTP_ACCEPT': 'text/html,application/xhtml+xml'}
+
+
+class PreloadTests(TestCase):
+    """Suite de pruebas para la precarga de chunks de Vite y los 103 Early Hints."""
+
+    def setUp(self):
+        """Usa un manifiesto temporal en modo producción."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.manifest_path = Path(directory.name) / 'manifest.json'
+        self.manifest_path.write_text(json.dumps(MANIFEST))
+        vite = {'default': {**settings.DJANGO_VITE['default'], 'dev_mode': False, 'manifest_path': self.manifest_path}}
+        override = override_settings(DJANGO_VITE=vite, STATIC_URL='/static/')
+        override.enable()
+        self.addCleanup(override.disable)
+        # django-vite guarda su configuración en un singleton
+        DjangoViteAssetLoader._instance = None
+        self.addCleanup(setattr, DjangoViteAssetLoader, '_instance', None)
+        manifest_graph.reset()
+
+    def links(self, response):
+        return response['Link'].split(', ')
+
+    def test_link_header_includes_page_and_component_chunks(self):
+        """Verifica que la página anuncia los chunks de base.html, sus imports y los de sus componentes."""
+        links = self.links(self.client.get(reverse('home'), **NAVIGATION))
+        self.assertIn('</static/assets/main-3c4d.css>; rel=preload; as=style', links)
+        self.assertIn('</static/assets/main-1a2b.js>; rel=modulepreload', links)
+        self.assertIn('</static/assets/vendor-5e6f.js>; rel=modulepreload', links)
+        self.assertIn('</static/assets/component-ping-7a8b.js>; rel=modulepreload', links)
+
+    def test_early_hints_use_entries_of_previous_renders(self):
+        """Verifica que el 103 se envía antes de la vista con los chunks conocidos de la ruta."""
+        hints = []
+        environ = {**NAVIGATION, 'wsgi.early_hints': hints.append}
+        self.client.get(reverse('home'), **environ)
+        self.client.get(reverse('home'), **environ)
+        self.assertEqual(len(hints), 2)
+        self.assertNotIn('component-ping', hints[0][0][1])
+        self.assertIn('</static/assets/component-ping-7a8b.js>; rel=modulepreload', hints[1][0][1])
+
+    @override_settings(VITE_EARLY_HINTS=False)
+    def test_early_hints_can_be_disabled(self):
+        """Verifica que sin `VITE_EARLY_HINTS` solo se agrega la cabecera a la respuesta."""
+        hints = []
+        response = self.client.get(reverse('home'), **NAVIGATION, **{'wsgi.early_hints': hints.append})
+        self.assertEqual(hints, [])
+        self.assertIn('Link', response)
+
+    def test_htmx_and_non_html_requests_are_skipped(self):
+        """Verifica que los fragmentos HTMX y las respuestas JSON no llevan precarga."""
+        self.assertNotIn('Link', self.client.get(reverse('home'), HTTP_HX_REQUEST='true', **NAVIGATION))
+        self.assertNotIn('Link', self.client.get(reverse('health'), **NAVIGATION))
+
+    def test_manifest_is_reloaded_when_file_changes(self):
+        """Verifica que un manifiesto nuevo se lee sin reiniciar el proceso."""
+        self.assertEqual(manifest_graph.chunks('frontend/main.js')[0][0], 'assets/main-1a2b.js')
+        manifest = {**MANIFEST, 'frontend/main.js': {**MANIFEST['frontend/main.js'], 'file': 'assets/main-ffff.js'}}
+        self.manifest_path.write_text(json.dumps(manifest))
+        stat = self.manifest_path.stat()
+        os.utime(self.manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(manifest_graph.chunks('frontend/main.js')[0][0], 'assets/main-ffff.js')
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.response_cache import CSRF_TOKEN_PLACEHOLDER, invalidate_response_cache
+
+
+class ResponseCacheTests(TestCase):
+    """Suite de pruebas para la caché de respuestas con ETag de las vistas de core."""
+
+    def setUp(self):
+        """Limpia la caché y configura el cliente de prueba."""
+        cache.clear()
+        self.client = Client()
+
+    def test_home_is_rendered_once(self):
+        """Verifica que una segunda visita a home no vuelve a renderizar la plantilla."""
+        with patch('core.views.render', wraps=render) as mock_render:
+            first = self.client.get(reverse('home'))
+            second = self.client.get(reverse('home'))
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+
+    def test_home_csrf_token_is_per_request(self):
+        """Verifica que el token CSRF real reemplaza al marcador en cada respuesta."""
+        first = self.client.get(reverse('home')).content.decode()
+        other = Client().get(reverse('home')).content.decode()
+        self.assertNotIn(CSRF_TOKEN_PLACEHOLDER, first)
+        self.assertNotIn(CSRF_TOKEN_PLACEHOLDER, other)
+        self.assertIn('x-csrftoken', first)
+
+    def test_conditional_get_returns_304(self):
+        """Verifica que If-None-Match con el ETag vigente devuelve 304 sin cuerpo."""
+        response = self.client.get(reverse('hello_world'))
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        response = self.client.get(reverse('hello_world'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_home_etag_is_stable_per_session(self):
+        """Verifica que home responde 304 a la misma sesión aunque el token enmascarado cambie."""
+        etag = self.client.get(reverse('home'))['ETag']
+        response = self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        other = Client().get(reverse('home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, 200)
+
+    def test_vary_on_htmx_header(self):
+        """Verifica que las requests HTMX usan una entrada de caché distinta y declaran Vary."""
+        with patch('core.views.HttpResponse', wraps=HttpResponse) as mock_response:
+            self.client.get(reverse('hello_world'))
+            self.client.get(reverse('hello_world'), HTTP_HX_REQUEST='true')
+            self.client.get(reverse('hello_world'), HTTP_HX_REQUEST='true')
+        self.assertEqual(mock_response.call_count, 2)
+        response = self.client.get(reverse('hello_world'))
+        self.assertIn('HX-Request', response['Vary'])
+
+    def test_invalidation(self):
+        """Verifica que invalidar la caché obliga a renderizar de nuevo."""
+        with patch('core.views.HttpResponse', wraps=HttpResponse) as mock_response:
+            self.client.get(reverse('hello_world'))
+            invalidate_response_cache()
+            self.client.get(reverse('hello_world'))
+        self.assertEqual(mock_response.call_count, 2)
+
+    def tearDown(self):
+        """Limpia la caché después de cada prueba."""
+        cache.clear()
@@ -0,0 +1,64 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.server import cgroup_cpus, cgroup_memory, plan_workers
+
+GIB = 1024 ** 3
+
+
+class WorkerPlanTests(SimpleTestCase):
+    """Suite de pruebas para el dimensionamiento de Gunicorn según el cgroup."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        patcher = patch('core.server.visible_cpus', return_value=8)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name, value):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f'{value}\n')
+
+    def test_reads_cgroup_v2_limits(self):
+        """Verifica la cuota de CPU y el límite de memoria de cgroup v2."""
+        self.write('cpu.max', '200000 100000')
+        self.write('memory.max', 4 * GIB)
+        self.assertEqual(cgroup_cpus(self.root), 2.0)
+        self.assertEqual(cgroup_memory(self.root), 4 * GIB)
+        self.write('cpu.max', 'max 100000')
+        self.write('memory.max', 'max')
+        self.assertIsNone(cgroup_cpus(self.root))
+        self.assertIsNone(cgroup_memory(self.root))
+
+    def test_reads_cgroup_v1_limits(self):
+        """Verifica la cuota CFS y el límite de memoria de cgroup v1 (sin límite = valor enorme)."""
+        self.write('cpu/cpu.cfs_quota_us', 50000)
+        self.write('cpu/cpu.cfs_period_us', 100000)
+        self.write('memory/memory.limit_in_bytes', 9223372036854771712)
+        self.assertEqual(cgroup_cpus(self.root), 0.5)
+        self.assertIsNone(cgroup_memory(self.root))
+
+    def test_workers_follow_cpu_and_memory(self):
+        """Verifica 2 * CPU + 1 workers acotados por la memoria disponible."""
+        self.write('cpu.max', '100000 100000')
+        self.write('memory.max', 2 * GIB)
+        plan = plan_workers({}, self.root)
+        self.assertEqual((plan.workers, plan.threads, plan.worker_class), (3, 4, 'gthread'))
+
+        self.write('cpu.max', '400000 100000')
+        self.write('memory.max', GIB)
+        self.assertEqual(plan_workers({}, self.root).workers, 4)
+
+    def test_asgi_and_environment_overrides(self):
+        """Verifica la clase de worker en modo ASGI y los reemplazos por variables de entorno."""
+        self.write('cpu.max', '100000 100000')
+        plan = plan_workers({'SERVER_MODE': 'asgi'}, self.root)
+        self.assertEqual((plan.threads, plan.worker_class), (1, 'uvicorn_worker.UvicornWorker'))
+        plan = plan_workers({'GUNICORN_WORKERS': '7', 'GUNICORN_THREADS': '1'}, self.root)
+        self.assertEqual((plan.workers, plan.threads, plan.worker_class), (7, 1, 'sync'))
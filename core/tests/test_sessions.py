@@ -0,0 +1,151 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.sessions import SessionStore, write_buffer
+
+# En memoria en lugar de Redis: como Redis, todas las instancias con el mismo LOCATION comparten los datos
+SESSION_CACHES = {
+    **settings.CACHES,
+    'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessions-tests'},
+}
+
+
+@override_settings(
+    SESSION_ENGINE='core.sessions', CACHES=SESSION_CACHES, SESSION_WRITE_INTERVAL=3600, RESPONSE_CACHE_ENABLED=False,
+)
+class CachedSessionTests(TestCase):
+    """Suite de pruebas para el motor de sesiones con caché y escritura diferida."""
+
+    def setUp(self):
+        """Vacía los cachés y el buffer de escrituras."""
+        cache.clear()
+        caches[settings.SESSION_CACHE_ALIAS].clear()
+        write_buffer.flush()
+
+    def test_save_is_deferred_and_coalesced(self):
+        """Verifica que varias escrituras de una sesión se combinan en una sola fila al volcar."""
+        session = SessionStore()
+        session['count'] = 1
+        session.save()
+        session['count'] = 2
+        session.save()
+        self.assertFalse(Session.objects.filter(session_key=session.session_key).exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(write_buffer.flush(), 1)
+        stored = Session.objects.get(session_key=session.session_key)
+        self.assertEqual(SessionStore().decode(stored.session_data), {'count': 2})
+
+    def test_load_reads_from_cache(self):
+        """Verifica que una sesión guardada se lee del caché sin consultar la base de datos."""
+        session = SessionStore()
+        session['user'] = 'ana'
+        session.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session.session_key)['user'], 'ana')
+
+    def worker_cache(self):
+        """Instancia propia del caché de sesiones, como en otro proceso."""
+        return caches.create_connection(settings.SESSION_CACHE_ALIAS)
+
+    def worker_store(self, worker_cache, session_key=None):
+        """SessionStore de otro worker: su propia instancia del caché de sesiones."""
+        session = SessionStore(session_key)
+        session._cache = worker_cache
+        return session
+
+    def test_writes_are_visible_from_another_worker(self):
+        """Verifica que escrituras, rotación y cierre de sesión se leen al instante desde otra instancia del caché."""
+        worker_a, worker_b = self.worker_cache(), self.worker_cache()
+        session = self.worker_store(worker_a)
+        session['count'] = 1
+        session.save()
+        self.assertEqual(self.worker_store(worker_b, session.session_key)['count'], 1)
+
+        session['count'] = 2
+        session.save()
+        self.assertEqual(self.worker_store(worker_b, session.session_key)['count'], 2)
+
+        old_key = session.session_key
+        session.cycle_key()
+        self.assertEqual(self.worker_store(worker_b, old_key).load(), {})
+        self.assertEqual(self.worker_store(worker_b, session.session_key)['count'], 2)
+
+        new_key = session.session_key
+        session.flush()
+        self.assertEqual(self.worker_store(worker_b, new_key).load(), {})
+
+    def test_load_pending_session_when_cache_is_empty(self):
+        """Verifica que una sesión pendiente de escritura se lee del buffer si el caché la perdió."""
+        session = SessionStore()
+        session['user'] = 'ana'
+        session.save()
+        session._cache.delete(session.cache_key)
+        self.assertEqual(SessionStore(session.session_key)['user'], 'ana')
+
+    def test_cache_failure_falls_back_to_database(self):
+        """Verifica que si el caché falla la sesión se guarda directamente en la base de datos."""
+        session = SessionStore()
+        session.create()
+        with patch.object(session._cache, 'set', side_effect=Exception("Simulated cache failure")):
+            session['user'] = 'ana'
+            session.save()
+        self.assertTrue(Session.objects.filter(session_key=session.session_key).exists())
+
+    def test_delete_discards_pending_write(self):
+        """Verifica que eliminar una sesión descarta su escritura pendiente."""
+        session = SessionStore()
+        session['user'] = 'ana'
+        session.save()
+        session.delete()
+        self.assertEqual(write_buffer.flush(), 0)
+        self.assertFalse(SessionStore().exists(session.session_key))
+
+    def test_clear_expired_in_batches(self):
+        """Verifica que clear_expired elimina todas las sesiones vencidas en lotes."""
+        past = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create([Session(session_key=f'expired{i:04d}', session_data='', expire_date=past) for i in range(5)])
+        Session.objects.create(session_key='alive', session_data='', expire_date=timezone.now() + timedelta(days=1))
+        with override_settings(SESSION_CLEANUP_BATCH_SIZE=2):
+            self.assertEqual(SessionStore.clear_expired(), 5)
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['alive'])
+
+    def queries_per_request(self, url, requests=5, **headers):
+        client = Client()
+        client.get(url, **headers)
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(requests):
+                client.get(url, **headers)
+        return len(context.captured_queries) / requests
+
+    def new_session_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            Client().get(url)
+        return len(context.captured_queries)
+
+    def test_fewer_queries_than_database_sessions(self):
+        """Verifica que las páginas con token CSRF consultan menos que con el motor `db` de Django."""
+        with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+            baseline_home = self.queries_per_request(reverse('home'))
+            baseline_new = self.new_session_queries(reverse('home'))
+        self.assertLess(self.queries_per_request(reverse('home')), baseline_home)
+        self.assertLess(self.new_session_queries(reverse('home')), baseline_new)
+        # La demo HTMX no usa la sesión: sigue sin consultas con cualquier motor
+        self.assertEqual(self.queries_per_request(reverse('htmx_demo'), HTTP_HX_REQUEST='true'), 0)
+        client = Client()
+        client.get(reverse('home'))
+        with CaptureQueriesContext(connection) as context:
+            client.get(reverse('home'))
+        self.assertEqual(context.captured_queries, [])
+
+    def tearDown(self):
+        """Descarta las escrituras pendientes."""
+        write_buffer.flush()
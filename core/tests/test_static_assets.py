@@ -0,0 +1,100 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+
+import brotli
+
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core import static_assets
+from core.static_assets import PrecompressedStaticHandler, cache_control, compress_static, serve
+
+SCRIPT = b'export const answer = () => 42;\n' * 40
+
+
+class StaticAssetsTests(SimpleTestCase):
+    """Suite de pruebas para los estáticos precomprimidos y su política de caché."""
+
+    def setUp(self):
+        """Crea un directorio de estáticos temporal con un archivo con hash y otro sin hash."""
+        self.source_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.source_dir, ignore_errors=True)
+        (self.source_dir / 'assets').mkdir()
+        (self.source_dir / 'assets' / 'main-Bx3kT9aQ.js').write_bytes(SCRIPT)
+        (self.source_dir / 'robots.txt').write_bytes(b'User-agent: *\n' * 40)
+        (self.source_dir / 'logo.png').write_bytes(b'\x89PNG' * 100)
+        override = override_settings(
+            STATICFILES_DIRS=[self.source_dir],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        static_assets._resolved.clear()
+        self.addCleanup(static_assets._resolved.clear)
+        self.factory = RequestFactory()
+
+    def get(self, path, **headers):
+        return serve(self.factory.get(f'/static/{path}', **headers), path)
+
+    def test_compress_writes_variants_once(self):
+        """Verifica que se generan .br y .gz de los archivos comprimibles y luego se omiten."""
+        written = {path.name for path in compress_static()}
+        self.assertEqual(written, {'main-Bx3kT9aQ.js.br', 'main-Bx3kT9aQ.js.gz', 'robots.txt.br', 'robots.txt.gz'})
+        self.assertEqual(gzip.decompress((self.source_dir / 'assets' / 'main-Bx3kT9aQ.js.gz').read_bytes()), SCRIPT)
+        self.assertEqual(compress_static(), [])
+
+    def test_cache_policy(self):
+        """Verifica que los archivos con hash son inmutables y el resto tiene vida corta."""
+        self.assertEqual(cache_control('assets/main-Bx3kT9aQ.js'), 'public, max-age=31536000, immutable')
+        with self.settings(STATIC_MAX_AGE=60):
+            self.assertEqual(cache_control('robots.txt'), 'public, max-age=60')
+            self.assertEqual(cache_control('main.js'), 'public, max-age=60')
+
+    def test_serves_best_encoding(self):
+        """Verifica que se elige brotli, luego gzip y si no el archivo original."""
+        compress_static()
+        path = 'assets/main-Bx3kT9aQ.js'
+        response = self.get(path, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Content-Type'], 'text/javascript')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(brotli.decompress(b''.join(response.streaming_content)), SCRIPT)
+
+        response = self.get(path, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response.close()
+
+        response = self.get(path)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(b''.join(response.streaming_content), SCRIPT)
+
+    def test_conditional_and_missing_files(self):
+        """Verifica el 304 por fecha de modificación y el 404 de archivos inexistentes."""
+        response = self.get('logo.png')
+        response.close()
+        self.assertNotIn('Vary', response)
+        response = self.get('logo.png', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        with self.assertRaises(Http404):
+            self.get('../settings.py')
+
+    def test_handler_bypasses_application(self):
+        """Verifica que el envoltorio sirve STATIC_URL sin middleware y delega el resto."""
+        calls = []
+
+        def application(environ, start_response):
+            calls.append(environ['PATH_INFO'])
+            start_response('200 OK', [])
+            return [b'app']
+
+        handler = PrecompressedStaticHandler(application)
+        statuses = []
+        start_response = lambda status, headers: statuses.append((status, dict(headers)))  # noqa: E731
+        body = b''.join(handler(self.factory.get('/static/robots.txt').environ, start_response))
+        self.assertEqual(body, b'User-agent: *\n' * 40)
+        self.assertNotIn('Cookie', statuses[0][1].get('Vary', ''))
+        self.assertEqual(b''.join(handler(self.factory.get('/core/').environ, start_response)), b'app')
+        self.assertEqual(calls, ['/core/'])
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import boto3
+from django.test import TestCase, override_settings
+from moto import mock_aws
+
+from core.staticsync import MANIFEST_NAME, sync_static
+
+BUCKET = 'test-static-bucket'
+S3_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {'bucket_name': BUCKET, 'location': 'static', 'file_overwrite': True, 'region_name': 'us-east-1'},
+    },
+}
+
+
+class StaticSyncTests(TestCase):
+    """Suite de pruebas para la sincronización incremental de estáticos contra un S3 local (moto)."""
+
+    def setUp(self):
+        """Crea un bucket simulado y un directorio de estáticos temporal."""
+        self.env = patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+        })
+        self.env.start()
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket=BUCKET)
+
+        self.source_dir = tempfile.mkdtemp()
+        for name, content in [('app.js', 'console.log(1)'), ('app.css', 'body{}'), ('img/logo.svg', '<svg/>')]:
+            self.write_source(name, content)
+        self.settings_override = override_settings(
+            STORAGES=S3_STORAGES,
+            STATICFILES_DIRS=[self.source_dir],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        self.settings_override.enable()
+
+    def write_source(self, name, content):
+        path = os.path.join(self.source_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as handle:
+            handle.write(content)
+
+    def remote_keys(self):
+        response = self.s3.list_objects_v2(Bucket=BUCKET)
+        return sorted(item['Key'] for item in response.get('Contents', []))
+
+    def test_first_sync_uploads_everything(self):
+        """Verifica que la primera sincronización sube todos los archivos y el manifiesto."""
+        result = sync_static(max_workers=2)
+        self.assertEqual(sorted(result.uploaded), ['app.css', 'app.js', 'img/logo.svg'])
+        self.assertEqual(
+            self.remote_keys(),
+            ['static/app.css', 'static/app.js', 'static/img/logo.svg', f'static/{MANIFEST_NAME}'],
+        )
+
+    def test_second_sync_uploads_nothing(self):
+        """Verifica que sin cambios locales no se sube ningún archivo."""
+        sync_static()
+        result = sync_static()
+        self.assertEqual(result.uploaded, [])
+        self.assertEqual(result.unchanged, 3)
+
+    def test_only_changed_files_are_uploaded(self):
+        """Verifica que solo se suben los archivos cuyo contenido cambió."""
+        sync_static()
+        self.write_source('app.js', 'console.log(2)')
+        result = sync_static()
+        self.assertEqual(result.uploaded, ['app.js'])
+        body = self.s3.get_object(Bucket=BUCKET, Key='static/app.js')['Body'].read()
+        self.assertEqual(body, b'console.log(2)')
+
+    def test_deleted_files_leave_the_manifest(self):
+        """Verifica que un archivo borrado sale del manifiesto y su objeto solo se elimina con prune."""
+        sync_static()
+        os.remove(os.path.join(self.source_dir, 'app.css'))
+        result = sync_static()
+        self.assertEqual(result.stale, ['app.css'])
+        body = self.s3.get_object(Bucket=BUCKET, Key=f'static/{MANIFEST_NAME}')['Body'].read()
+        self.assertNotIn(b'app.css', body)
+        self.assertIn('static/app.css', self.remote_keys())
+
+        self.write_source('old.js', 'viejo')
+        sync_static()
+        os.remove(os.path.join(self.source_dir, 'old.js'))
+        result = sync_static(prune=True)
+        self.assertEqual(result.stale, ['old.js'])
+        self.assertNotIn('static/old.js', self.remote_keys())
+
+    def test_dry_run_does_not_upload(self):
+        """Verifica que --dry-run solo informa las diferencias."""
+        result = sync_static(dry_run=True)
+        self.assertEqual(len(result.uploaded), 3)
+        self.assertEqual(self.remote_keys(), [])
+
+    def test_cache_policy_per_file(self):
+        """Verifica que cada objeto se sube con su Cache-Control y que las variantes comprimidas no se suben."""
+        self.write_source('assets/app-AbCd1234.js', 'console.log(3)')
+        self.write_source('assets/app-AbCd1234.js.gz', 'gz')
+        storages = {**S3_STORAGES, 'staticfiles': {**S3_STORAGES['staticfiles'], 'BACKEND': 'core.storage.StaticS3Storage'}}
+        with self.settings(STORAGES=storages, STATIC_MAX_AGE=300):
+            result = sync_static()
+        self.assertNotIn('assets/app-AbCd1234.js.gz', result.uploaded)
+        hashed = self.s3.head_object(Bucket=BUCKET, Key='static/assets/app-AbCd1234.js')
+        self.assertEqual(hashed['CacheControl'], 'public, max-age=31536000, immutable')
+        plain = self.s3.head_object(Bucket=BUCKET, Key='static/app.js')
+        self.assertEqual(plain['CacheControl'], 'public, max-age=300')
+
+    def tearDown(self):
+        """Detiene la simulación de S3 y elimina los archivos temporales."""
+        self.settings_override.disable()
+        self.mock.stop()
+        self.env.stop()
+        shutil.rmtree(self.source_dir, ignore_errors=True)
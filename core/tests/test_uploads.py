@@ -0,0 +1,171 @@
+import json
+import os
+from unittest.mock import patch
+
+import boto3
+import requests
+from django.contrib.auth.models import User
+from django.core import signing
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from moto import mock_aws
+
+from core.uploads import TOKEN_SALT, UploadError, complete_upload, plan_upload, start_upload
+
+BUCKET = 'test-media-bucket'
+MIB = 1024 * 1024
+S3_STORAGES = {
+    'default': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {'bucket_name': BUCKET, 'region_name': 'us-east-1'},
+    },
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(UPLOAD_PART_SIZE=5 * MIB, UPLOAD_CONCURRENCY=4, UPLOAD_MAX_BYTES=100 * MIB)
+class UploadPlanTests(TestCase):
+    """Suite de pruebas para la partición de archivos en partes."""
+
+    def test_small_file_is_one_part(self):
+        """Verifica que un archivo menor que una parte se sube en una sola, sin concurrencia."""
+        plan = plan_upload(1000)
+        self.assertEqual((plan.parts, plan.part_size, plan.concurrency), (1, 5 * MIB, 1))
+
+    def test_part_size_grows_to_respect_part_limit(self):
+        """Verifica que el tamaño de parte crece para no superar las 10.000 partes de S3."""
+        plan = plan_upload(100 * 1024 * MIB)
+        self.assertLessEqual(plan.parts, 10000)
+        self.assertEqual(plan.part_size % MIB, 0)
+        self.assertEqual(plan.concurrency, 4)
+
+    def test_rejected_requests(self):
+        """Verifica que se rechazan tamaños fuera de rango, tipos no permitidos y nombres vacíos."""
+        for filename, size, content_type in [
+            ('a.png', 0, 'image/png'),
+            ('a.png', 200 * MIB, 'image/png'),
+            ('a.exe', 10, 'application/x-msdownload'),
+            ('../', 10, 'image/png'),
+        ]:
+            with self.assertRaises(UploadError):
+                start_upload(filename, size, content_type)
+
+
+@override_settings(STORAGES=S3_STORAGES, UPLOAD_PART_SIZE=5 * MIB, UPLOAD_MAX_BYTES=100 * MIB)
+class DirectUploadTests(TestCase):
+    """Suite de pruebas para las subidas multipart prefirmadas contra un S3 local (moto)."""
+
+    def setUp(self):
+        """Crea un bucket simulado y un usuario autenticado."""
+        self.env = patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_DEFAULT_REGION': 'us-east-1',
+        })
+        self.env.start()
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket=BUCKET)
+        self.user = User.objects.create_user('uploader', password='secret')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.mock.stop()
+        self.env.stop()
+
+    def start(self, data, size=None, content_type='video/mp4'):
+        response = self.client.post(
+            reverse('upload_start'),
+            json.dumps({'filename': 'clip final.mp4', 'size': size or len(data), 'content_type': content_type}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def put_parts(self, plan, data, parts=None):
+        """Sube las partes con las URLs prefirmadas, como lo haría el navegador."""
+        for part in plan['parts'][:parts]:
+            start = (part['number'] - 1) * plan['part_size']
+            response = requests.put(part['url'], data=data[start:start + plan['part_size']])
+            self.assertEqual(response.status_code, 200)
+
+    def test_full_flow(self):
+        """Verifica el inicio, la subida de las partes en paralelo y la confirmación del objeto."""
+        data = os.urandom(12 * MIB)
+        plan = self.start(data)
+        self.assertEqual(len(plan['parts']), 3)
+        self.assertEqual(plan['concurrency'], 3)
+        self.assertTrue(plan['name'].startswith(f'uploads/{self.user.pk}/'))
+        self.assertTrue(plan['name'].endswith('/clip_final.mp4'))
+        self.put_parts(plan, data)
+
+        response = self.client.post(reverse('upload_complete'), {'token': plan['token']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['size'], len(data))
+        self.assertEqual(response.json()['url'], reverse('media', args=[plan['name']]))
+        self.assertEqual(Client().get(response.json()['url']).status_code, 404)
+        self.assertEqual(self.client.get(response.json()['url']).status_code, 302)
+        body = self.s3.get_object(Bucket=BUCKET, Key=plan['name'])
+        self.assertEqual(body['ContentType'], 'video/mp4')
+        self.assertEqual(body['Body'].read(), data)
+
+    def test_htmx_complete_renders_fragment(self):
+        """Verifica que la confirmación desde HTMX devuelve el fragmento del resultado."""
+        data = b'hola' * 100
+        plan = self.start(data, content_type='text/plain')
+        self.put_parts(plan, data)
+        response = self.client.post(reverse('upload_complete'), {'token': plan['token']}, HTTP_HX_REQUEST='true')
+        self.assertContains(response, 'Subida completada')
+        self.assertContains(response, 'clip_final.mp4')
+
+    def test_missing_parts_abort_the_upload(self):
+        """Verifica que si faltan partes la subida se aborta y no queda objeto."""
+        data = os.urandom(11 * MIB)
+        plan = self.start(data)
+        self.put_parts(plan, data, parts=1)
+        response = self.client.post(reverse('upload_complete'), {'token': plan['token']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.s3.list_multipart_uploads(Bucket=BUCKET).get('Uploads', []), [])
+        self.assertNotIn('Contents', self.s3.list_objects_v2(Bucket=BUCKET))
+
+    def test_size_mismatch_is_rejected(self):
+        """Verifica que un archivo con tamaño distinto del declarado no se acepta."""
+        plan = self.start(b'x' * 100, size=200, content_type='text/plain')
+        self.put_parts(plan, b'x' * 100)
+        with self.assertRaises(UploadError):
+            complete_upload(plan['token'], owner=str(self.user.pk))
+        self.assertNotIn('Contents', self.s3.list_objects_v2(Bucket=BUCKET))
+
+    def test_token_is_bound_to_its_owner(self):
+        """Verifica que otro usuario no puede completar la subida ni alterar el token."""
+        plan = self.start(b'x' * 10, content_type='text/plain')
+        with self.assertRaises(UploadError) as raised:
+            complete_upload(plan['token'], owner='otro')
+        self.assertEqual(raised.exception.status, 403)
+        forged = signing.dumps({**signing.loads(plan['token'], salt=TOKEN_SALT), 'size': 5}, salt='otra')
+        with self.assertRaises(UploadError):
+            complete_upload(forged, owner=str(self.user.pk))
+
+    def test_abort(self):
+        """Verifica que abortar libera el multipart upload."""
+        plan = self.start(b'x' * 10, content_type='text/plain')
+        response = self.client.post(reverse('upload_abort'), {'token': plan['token']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.s3.list_multipart_uploads(Bucket=BUCKET).get('Uploads', []), [])
+
+    def test_anonymous_users_are_rejected(self):
+        """Verifica que las subidas requieren un usuario autenticado."""
+        response = Client().post(reverse('upload_start'), '{}', content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+class UploadStorageTests(TestCase):
+    """Suite de pruebas para las subidas sin storage S3."""
+
+    def test_filesystem_storage_is_not_supported(self):
+        """Verifica que con el storage local se responde 501 en lugar de fallar."""
+        with self.assertRaises(UploadError) as raised:
+            start_upload('a.png', 10, 'image/png')
+        self.assertEqual(raised.exception.status, 501)
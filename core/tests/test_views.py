@@ -1,7 +1,10 @@
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from unittest.mock import patch
 
+from core.health import db_monitor
+
+@override_settings(HEALTH_DB_INTERVAL=0)
 class CoreViewsTests(TestCase):
     """Suite de pruebas para las vistas de la aplicación core.
     
@@ -12,6 +15,7 @@ class CoreViewsTests(TestCase):
     def setUp(self):
         """Configura el cliente de prueba para cada test."""
         self.client = Client()
+        db_monitor.reset()
 
     def test_hello_world(self):
         """Verifica que el endpoint hello world devuelve un código de estado 200 y contiene el texto esperado."""
@@ -29,7 +33,11 @@ class CoreViewsTests(TestCase):
         """Verifica que el endpoint de verificación de salud de la base de datos devuelve 200 cuando la base de datos es accesible."""
         response = self.client.get(reverse('db_health_check'))
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {'status': 'ok', 'message': 'Conexión a la base de datos exitosa'})
+        data = response.json()
+        self.assertEqual(data['status'], 'ok')
+        self.assertEqual(data['message'], 'Conexión a la base de datos exitosa')
+        for key in ['source', 'age_s', 'latency_ms', 'error_rate']:
+            self.assertIn(key, data)
 
     def test_db_health_check_failure(self):
         """Verifica que el endpoint de verificación de salud de la base de datos devuelve 500 cuando la base de datos es inaccesible."""
@@ -37,7 +45,23 @@ class CoreViewsTests(TestCase):
             mock_cursor.side_effect = Exception("Simulated DB failure")
             response = self.client.get(reverse('db_health_check'))
             self.assertEqual(response.status_code, 500)
-            self.assertEqual(response.json(), {'status': 'error', 'message': 'Error en la conexión a la base de datos'})
+            data = response.json()
+            self.assertEqual(data['status'], 'error')
+            self.assertEqual(data['message'], 'Error en la conexión a la base de datos')
+            self.assertEqual(data['error_rate'], 1.0)
+
+    def test_db_health_check_uses_cached_result(self):
+        """Verifica que una segunda llamada sirve el resultado cacheado sin consultar la base de datos."""
+        self.client.get(reverse('db_health_check'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('db_health_check'))
+        self.assertEqual(response.json()['source'], 'cache')
+
+    def test_db_health_check_fresh(self):
+        """Verifica que ?fresh=1 fuerza una verificación en vivo."""
+        self.client.get(reverse('db_health_check'))
+        response = self.client.get(reverse('db_health_check'), {'fresh': '1'})
+        self.assertEqual(response.json()['source'], 'live')
 
     def tearDown(self):
         """Limpia después de cada prueba."""
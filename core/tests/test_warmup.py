@@ -0,0 +1,38 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase
+from django_components import registry
+
+from core.warmup import load_index, warmup
+
+
+class WarmupTests(SimpleTestCase):
+    """Suite de pruebas para el calentamiento de componentes y plantillas."""
+
+    def setUp(self):
+        """Vacía el loader cacheado de plantillas."""
+        self.loader = engines['django'].engine.template_loaders[0]
+        self.loader.reset()
+
+    def test_index_is_up_to_date(self):
+        """Verifica que components/index.json refleja los componentes y plantillas actuales."""
+        call_command('componentindex', check=True, stdout=StringIO())
+
+    def test_warmup_registers_components_and_compiles_templates(self):
+        """Verifica que tras el calentamiento las plantillas están en el loader cacheado."""
+        result = warmup()
+        self.assertTrue(result.from_index)
+        self.assertEqual(result.components, len(load_index()['components']))
+        for name in ('base.html', 'navbar.html', 'core/home.html'):
+            self.assertIn(name, self.loader.get_template_cache)
+        self.assertIsNotNone(registry.get('ping')._template)
+
+    def test_missing_index_scans_directories(self):
+        """Verifica que sin índice se recorren los directorios de componentes."""
+        with patch('core.warmup.load_index', return_value=None):
+            result = warmup()
+        self.assertFalse(result.from_index)
+        self.assertEqual(result.components, len(load_index()['components']))
@@ -0,0 +1,187 @@
+"""
+Subidas directas a S3 con URLs prefirmadas de multipart upload.
+
+El archivo nunca pasa por un worker de Django:
+
+1. `start_upload()` valida nombre, tamaño y tipo, crea el multipart upload en el bucket
+   del storage `default` y devuelve una URL prefirmada por parte, con el tamaño de parte
+   y la concurrencia elegidos por el servidor, y un token firmado con el estado.
+2. El navegador sube las partes en paralelo con `PUT` directo al bucket.
+3. `complete_upload()` verifica el token, lista las partes recibidas en S3 (sin depender
+   de los ETag que informe el cliente), completa el objeto y valida su tamaño y tipo.
+
+El estado viaja firmado en el token (`django.core.signing`), por lo que no hace falta
+una tabla. El bucket debe permitir `PUT` por CORS desde el dominio de la aplicación.
+"""
+import math
+import posixpath
+import uuid
+from dataclasses import dataclass
+from fnmatch import fnmatch
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.text import get_valid_filename
+
+MIN_PART_SIZE = 5 * 1024 * 1024  # Mínimo de S3 para todas las partes salvo la última
+MAX_PARTS = 10000
+TOKEN_SALT = 'core.uploads'
+
+
+class UploadError(Exception):
+    """Subida inválida; el mensaje se devuelve al cliente."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class UploadPlan:
+    """Partición de un archivo en partes de multipart upload."""
+
+    size: int
+    part_size: int
+    parts: int
+    concurrency: int
+
+
+def s3_target(storage=None):
+    """Devuelve (cliente S3, bucket, prefijo) del storage, o lanza UploadError si no es S3."""
+    storage = storage or default_storage
+    connection = getattr(storage, 'connection', None)
+    if connection is None or not getattr(storage, 'bucket_name', None):
+        raise UploadError('Las subidas directas requieren el storage S3', status=501)
+    return connection.meta.client, storage.bucket_name, (storage.location or '').strip('/')
+
+
+def plan_upload(size):
+    """Elige el tamaño de parte (múltiplo de MiB, al menos `UPLOAD_PART_SIZE`) y la concurrencia."""
+    part_size = max(settings.UPLOAD_PART_SIZE, MIN_PART_SIZE, math.ceil(size / MAX_PARTS))
+    part_size = math.ceil(part_size / (1024 * 1024)) * 1024 * 1024
+    parts = max(1, math.ceil(size / part_size))
+    return UploadPlan(size=size, part_size=part_size, parts=parts, concurrency=min(settings.UPLOAD_CONCURRENCY, parts))
+
+
+def content_type_allowed(content_type):
+    return any(fnmatch(content_type, pattern) for pattern in settings.UPLOAD_CONTENT_TYPES)
+
+
+def validate_request(filename, size, content_type):
+    """Valida los datos declarados por el cliente y devuelve (nombre seguro, tamaño)."""
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError('Tamaño inválido')
+    if size <= 0 or size > settings.UPLOAD_MAX_BYTES:
+        raise UploadError(f'El archivo debe pesar entre 1 byte y {settings.UPLOAD_MAX_BYTES} bytes')
+    if not content_type or not content_type_allowed(content_type):
+        raise UploadError(f'Tipo de archivo no permitido: {content_type or "desconocido"}')
+    try:
+        name = get_valid_filename(posixpath.basename(filename or ''))
+    except SuspiciousFileOperation:
+        raise UploadError('Nombre de archivo inválido')
+    return name, size
+
+
+def start_upload(filename, size, content_type, owner=None, storage=None):
+    """
+    Crea el multipart upload y prefirma una URL por parte.
+
+    Returns:
+        dict: token, nombre del objeto, tamaño de parte, concurrencia y [{'number', 'url'}]
+    """
+    name, size = validate_request(filename, size, content_type)
+    client, bucket, location = s3_target(storage)
+    folder = f'{owner}/' if owner else ''
+    name = f'{settings.UPLOAD_PREFIX}/{folder}{uuid.uuid4().hex}/{name}'
+    key = posixpath.join(location, name) if location else name
+    plan = plan_upload(size)
+
+    upload_id = client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)['UploadId']
+    urls = [
+        {
+            'number': number,
+            'url': client.generate_presigned_url(
+                'upload_part',
+                Params={'Bucket': bucket, 'Key': key, 'UploadId': upload_id, 'PartNumber': number},
+                ExpiresIn=settings.UPLOAD_URL_EXPIRES,
+            ),
+        }
+        for number in range(1, plan.parts + 1)
+    ]
+    token = signing.dumps(
+        {'key': key, 'name': name, 'upload_id': upload_id, 'size': size, 'type': content_type,
+         'parts': plan.parts, 'owner': owner},
+        salt=TOKEN_SALT,
+    )
+    return {
+        'token': token,
+        'name': name,
+        'part_size': plan.part_size,
+        'concurrency': plan.concurrency,
+        'parts': urls,
+    }
+
+
+def load_token(token, owner=None):
+    """Verifica la firma, la vigencia y el dueño del token de una subida."""
+    try:
+        state = signing.loads(token or '', salt=TOKEN_SALT, max_age=settings.UPLOAD_URL_EXPIRES)
+    except signing.BadSignature:
+        raise UploadError('Token de subida inválido o vencido')
+    if state['owner'] != owner:
+        raise UploadError('La subida pertenece a otro usuario', status=403)
+    return state
+
+
+def uploaded_parts(client, bucket, key, upload_id):
+    """Partes recibidas por S3, paginando `list_parts`."""
+    parts, marker = [], 0
+    while True:
+        response = client.list_parts(Bucket=bucket, Key=key, UploadId=upload_id, PartNumberMarker=marker)
+        parts += response.get('Parts', [])
+        if not response.get('IsTruncated'):
+            return parts
+        marker = response['NextPartNumberMarker']
+
+
+def abort_upload(token, owner=None, storage=None):
+    state = load_token(token, owner)
+    client, bucket, _ = s3_target(storage)
+    client.abort_multipart_upload(Bucket=bucket, Key=state['key'], UploadId=state['upload_id'])
+
+
+def complete_upload(token, owner=None, storage=None):
+    """
+    Completa la subida y valida el objeto resultante.
+
+    Si faltan partes o el tamaño no coincide con el declarado, la subida se aborta
+    (o el objeto se elimina) y se lanza UploadError.
+
+    Returns:
+        dict: Nombre del objeto en el storage, tamaño, tipo y URL de descarga (con control de acceso)
+    """
+    state = load_token(token, owner)
+    client, bucket, _ = s3_target(storage)
+    key, upload_id = state['key'], state['upload_id']
+
+    parts = uploaded_parts(client, bucket, key, upload_id)
+    received = sorted(part['PartNumber'] for part in parts)
+    if received != list(range(1, state['parts'] + 1)) or sum(part['Size'] for part in parts) != state['size']:
+        client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise UploadError('Las partes recibidas no coinciden con el archivo declarado')
+    client.complete_multipart_upload(
+        Bucket=bucket, Key=key, UploadId=upload_id,
+        MultipartUpload={'Parts': [{'PartNumber': part['PartNumber'], 'ETag': part['ETag']} for part in sorted(parts, key=lambda part: part['PartNumber'])]},
+    )
+    head = client.head_object(Bucket=bucket, Key=key)
+    if head['ContentLength'] != state['size'] or head.get('ContentType') != state['type']:
+        client.delete_object(Bucket=bucket, Key=key)
+        raise UploadError('El objeto subido no coincide con el archivo declarado')
+    # La descarga pasa por `core.views.media`, que restringe `UPLOAD_PREFIX/<usuario>/` a su dueño
+    url = reverse('media', args=[state['name']])
+    return {'name': state['name'], 'size': state['size'], 'type': state['type'], 'url': url}
@@ -1,10 +1,26 @@
+from django.conf import settings
 from django.urls import path
-from .views import health, db_health_check, home, hello_world, htmx_demo
+from .views import (
+    health, db_health_check, db_pool_stats, metrics, home, hello_world, htmx_demo,
+    health_async, db_health_check_async, htmx_demo_async,
+    upload, upload_start, upload_complete, upload_abort, events,
+)
+
+# En modo ASGI se sirven las versiones asíncronas de las vistas de salud y de la demo HTMX
+if settings.SERVER_MODE == 'asgi':
+    health, db_health_check, htmx_demo = health_async, db_health_check_async, htmx_demo_async
 
 urlpatterns = [
     path('health/', health, name='health'),
     path('health/db/', db_health_check, name='db_health_check'),
+    path('health/db/pool/', db_pool_stats, name='db_pool_stats'),
+    path('metrics/', metrics, name='metrics'),
     path('home/', home, name='home'),
     path('hello/', hello_world, name='hello_world'),
     path('htmx-demo/', htmx_demo, name='htmx_demo'),
-] 
\ No newline at end of file
+    path('events/', events, name='events'),
+    path('upload/', upload, name='upload'),
+    path('upload/start/', upload_start, name='upload_start'),
+    path('upload/complete/', upload_complete, name='upload_complete'),
+    path('upload/abort/', upload_abort, name='upload_abort'),
+]
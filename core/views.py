@@ -1,15 +1,37 @@
 from django.http import HttpResponse
+import json
 import os
 import sys
+import time
+from functools import wraps
 import django
-from django.db import connection
+from asgiref.sync import sync_to_async
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_POST
 
+from .dbpool import pool_stats
+from .downloads import can_download, serve_storage
+from .events import Ticker, TooManyConnections, broadcaster
+from .health import db_monitor
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from .response_cache import cache_response
+from .uploads import UploadError, abort_upload, complete_upload, start_upload
+
+HEALTH_OK = {'status': 'ok', 'message': 'Verificación de estado exitosa'}
+DB_HEALTH_OK = {'status': 'ok', 'message': 'Conexión a la base de datos exitosa'}
+DB_HEALTH_ERROR = {'status': 'error', 'message': 'Error en la conexión a la base de datos'}
+
+@cache_response(csrf=True)
 def home(request):
     """
     Vista principal de la aplicación con información detallada del sistema.
+
+    La respuesta se cachea (ver `core.response_cache`), ya que su contenido no cambia
+    durante la vida del proceso salvo por el token CSRF.
     
     Args:
         request: Objeto HttpRequest de Django
@@ -30,9 +52,11 @@ def home(request):
         'aws_region': settings.AWS_S3_REGION_NAME,
         'server_info': 'Gunicorn' if not settings.IS_LOCAL else 'Django Development Server',
         'htmx_enabled': hasattr(request, 'htmx'),
+        'sse_enabled': settings.SERVER_MODE == 'asgi',
     }
     return render(request, 'core/home.html', context)
 
+@cache_response()
 def hello_world(request):
     """
     Vista de prueba que devuelve un mensaje simple.
@@ -55,11 +79,30 @@ def health(request):
     Returns:
         JsonResponse: Estado de la aplicación y mensaje de éxito
     """
-    return JsonResponse({'status': 'ok', 'message': 'Verificación de estado exitosa'}, status=200)
+    return JsonResponse(HEALTH_OK, status=200)
+
+async def health_async(request):
+    """Versión asíncrona de `health` para el modo ASGI."""
+    return JsonResponse(HEALTH_OK, status=200)
+
+def db_health_payload(state):
+    """Devuelve (payload, status HTTP) de la salud de la base de datos a partir del estado del monitor."""
+    state = dict(state)
+    payload = dict(DB_HEALTH_OK if state.pop('ok') else DB_HEALTH_ERROR, **state)
+    return payload, 200 if payload['status'] == 'ok' else 500
+
+def db_health_response(state):
+    """Construye la respuesta de salud de la base de datos a partir del estado del monitor."""
+    payload, status = db_health_payload(state)
+    return JsonResponse(payload, status=status)
 
 def db_health_check(request):
     """
     Verifica la conexión a la base de datos.
+
+    Devuelve el resultado cacheado por el monitor de fondo del proceso, junto con su
+    antigüedad, la última latencia y la tasa de error móvil. Con `?fresh=1` fuerza
+    una verificación en vivo.
     
     Args:
         request: Objeto HttpRequest de Django
@@ -67,20 +110,69 @@ def db_health_check(request):
     Returns:
         JsonResponse: Estado de la conexión a la base de datos
     """
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            return JsonResponse({'status': 'ok', 'message': 'Conexión a la base de datos exitosa'}, status=200)
-    except Exception as e:
-        return JsonResponse({'status': 'error', 'message': 'Error en la conexión a la base de datos'}, status=500)
+    return db_health_response(db_monitor.snapshot(fresh=request.GET.get('fresh') == '1'))
 
-def htmx_demo(request):
+async def db_health_check_async(request):
     """
-    Vista de demostración para HTMX
+    Versión asíncrona de `db_health_check` para el modo ASGI.
+
+    El resultado cacheado se sirve directamente; una verificación en vivo se ejecuta
+    mediante `sync_to_async`, por lo que una base de datos lenta no bloquea el event loop.
     """
+    fresh = request.GET.get('fresh') == '1'
+    if db_monitor.needs_check(fresh):
+        state = await sync_to_async(db_monitor.snapshot)(fresh=fresh)
+    else:
+        state = db_monitor.cached()
+    return db_health_response(state)
+
+def is_internal_request(request):
+    """Indica si la request es del staff o trae `Authorization: Bearer <METRICS_TOKEN>`."""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+def internal_only(view):
+    """Restringe una vista de diagnóstico a `is_internal_request`; el resto recibe 404."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_internal_request(request):
+            raise Http404()
+        return view(request, *args, **kwargs)
+    return wrapper
+
+@internal_only
+def db_pool_stats(request):
+    """
+    Expone las estadísticas del pool de conexiones del proceso actual.
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        JsonResponse: Modo de conexión y contadores del pool (esperas, checkouts, desbordes)
+    """
+    return JsonResponse(pool_stats())
+
+@internal_only
+def metrics(request):
+    """
+    Expone las métricas del proceso actual en formato de texto de Prometheus.
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        HttpResponse: Histogramas de latencia por nombre de URL, desglose de las requests
+        muestreadas y estadísticas del pool, la caché y el sink de logs
+    """
+    return HttpResponse(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+def render_htmx_demo(request):
+    """Construye la respuesta de la demo HTMX (fragmento si la request es HTMX)."""
     if request.htmx:
         # Es una request HTMX, devolver solo el fragmento
-        import time
         timestamp = int(time.time())
         return HttpResponse(f"""
             <div class="bg-green-50 border border-green-200 rounded p-3">
@@ -107,3 +199,144 @@ def htmx_demo(request):
                 <span class="text-yellow-700">⚠️ Request no HTMX detectada</span>
             </div>
         """)
+
+def render_demo_tick(timestamp):
+    """Fragmento que el ticker de la demo HTMX publica por SSE."""
+    return f'<span id="htmx-live-clock" class="text-xs text-green-600">Timestamp en vivo: {timestamp}</span>'
+
+demo_ticker = Ticker('htmx-demo', render_demo_tick, interval=settings.SSE_DEMO_INTERVAL)
+
+def htmx_demo(request):
+    """
+    Vista de demostración para HTMX
+    """
+    return render_htmx_demo(request)
+
+async def htmx_demo_async(request):
+    """Versión asíncrona de `htmx_demo` para el modo ASGI (no realiza I/O bloqueante)."""
+    return render_htmx_demo(request)
+
+def upload(request):
+    """
+    Página de subida directa a S3 con el componente `upload`.
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        HttpResponse: Renderiza la plantilla upload.html
+    """
+    return render(request, 'core/upload.html')
+
+def upload_error_response(request, error):
+    """Devuelve el error como fragmento para HTMX o como JSON con su status."""
+    if request.htmx:
+        return render(request, 'core/upload_result.html', {'error': str(error)})
+    return JsonResponse({'status': 'error', 'message': str(error)}, status=error.status)
+
+def upload_owner(request):
+    """Identificador del usuario dueño de la subida, o UploadError si no está autenticado."""
+    if not request.user.is_authenticated:
+        raise UploadError('Se requiere iniciar sesión', status=403)
+    return str(request.user.pk)
+
+@require_POST
+def upload_start(request):
+    """
+    Inicia una subida multipart y devuelve las URLs prefirmadas de sus partes.
+
+    Recibe JSON con `filename`, `size` y `content_type`; el servidor elige el tamaño de
+    parte y la concurrencia (ver `core.uploads.start_upload`).
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        JsonResponse: Token, tamaño de parte, concurrencia y URLs de las partes
+    """
+    try:
+        owner = upload_owner(request)
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            raise UploadError('JSON inválido')
+        return JsonResponse(start_upload(data.get('filename'), data.get('size'), data.get('content_type'), owner=owner))
+    except UploadError as error:
+        return upload_error_response(request, error)
+
+@require_POST
+def upload_complete(request):
+    """
+    Completa una subida y valida el objeto en el bucket.
+
+    Args:
+        request: Objeto HttpRequest de Django con el `token` de `upload_start`
+
+    Returns:
+        HttpResponse: Fragmento con el resultado si la request es HTMX, JSON si no
+    """
+    try:
+        result = complete_upload(request.POST.get('token'), owner=upload_owner(request))
+    except UploadError as error:
+        return upload_error_response(request, error)
+    if request.htmx:
+        return render(request, 'core/upload_result.html', {'upload': result})
+    return JsonResponse({'status': 'ok', **result})
+
+@require_POST
+def upload_abort(request):
+    """Aborta una subida en curso para liberar las partes ya almacenadas en S3."""
+    try:
+        abort_upload(request.POST.get('token'), owner=upload_owner(request))
+    except UploadError as error:
+        return upload_error_response(request, error)
+    return JsonResponse({'status': 'ok'})
+
+def media(request, path):
+    """
+    Descarga un archivo del storage `default` con soporte de rangos (ver `core.downloads`).
+
+    Los archivos subidos por un usuario solo los descarga su dueño o el staff; para el
+    resto se responde 404 sin revelar si existen.
+
+    Args:
+        request: Objeto HttpRequest de Django
+        path: Nombre del archivo en el storage
+
+    Returns:
+        HttpResponse: Archivo (completo o parcial), redirección a una URL prefirmada o streaming desde S3
+    """
+    if not can_download(request.user, path):
+        raise Http404(f'"{path}" no existe')
+    return serve_storage(request, path, as_attachment=request.GET.get('download') == '1')
+
+async def events(request):
+    """
+    Stream de Server-Sent Events con fragmentos HTMX (ver `core.events`).
+
+    Mantiene la conexión abierta y envía los eventos publicados en `broadcaster`, con
+    heartbeats periódicos. Solo se sirve con ASGI; con WSGI responde 501 para no ocupar
+    un hilo del worker por conexión.
+
+    Args:
+        request: Objeto HttpRequest de Django
+
+    Returns:
+        StreamingHttpResponse: Stream `text/event-stream`, o 503 si el worker alcanzó
+        `SSE_MAX_CONNECTIONS`
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'status': 'error', 'message': 'Los eventos requieren SERVER_MODE=asgi'}, status=501)
+    try:
+        subscription = broadcaster.subscribe()
+    except TooManyConnections:
+        response = JsonResponse({'status': 'error', 'message': 'Demasiadas conexiones de eventos'}, status=503)
+        response['Retry-After'] = str(settings.SSE_RETRY_MS // 1000 or 1)
+        return response
+    demo_ticker.ensure_started()
+    response = StreamingHttpResponse(broadcaster.stream(subscription), content_type='text/event-stream')
+    # Si el cliente se desconecta antes de empezar el stream, el cierre libera la conexión igual
+    response._resource_closers.append(lambda: broadcaster.unsubscribe(subscription))
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
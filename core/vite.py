@@ -0,0 +1,129 @@
+"""
+Acceso al manifiesto de Vite con la configuración de `DJANGO_VITE['default']`.
+
+Usa el cliente de django-vite para las URLs (servidor de desarrollo o estáticos
+según `dev_mode`). El manifiesto se lee una vez y se vuelve a leer solo si cambia la
+fecha de modificación del archivo; de él se obtiene el grafo de dependencias de cada
+entrada (chunks JS importados y CSS) para las etiquetas de los componentes y las
+cabeceras `Link` de precarga (ver `core.middleware.PreloadMiddleware`).
+"""
+import json
+import os
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.html import format_html
+from django_vite.core.asset_loader import DjangoViteAppClient, DjangoViteConfig
+
+# Entradas de Vite de los componentes renderizados en la request actual (None fuera de una request)
+rendered_entries = ContextVar('rendered_entries', default=None)
+
+
+@lru_cache(maxsize=4)
+def _client(config):
+    return DjangoViteAppClient(config)
+
+
+def vite_client():
+    """Cliente de django-vite para la configuración actual (se crea una vez por configuración)."""
+    return _client(DjangoViteConfig(**settings.DJANGO_VITE['default']))
+
+
+def dev_mode():
+    return vite_client().dev_mode
+
+
+class ManifestGraph:
+    """Manifiesto de Vite en memoria con las dependencias de cada entrada calculadas una vez."""
+
+    def __init__(self):
+        self._version = None
+        self._manifest = {}
+        self._chunks = {}
+
+    def manifest(self):
+        """Devuelve el manifiesto, releyéndolo si el archivo cambió ({} si no existe)."""
+        path = str(settings.DJANGO_VITE['default']['manifest_path'])
+        try:
+            version = (path, os.stat(path).st_mtime_ns)
+        except OSError:
+            return {}
+        if version != self._version:
+            with open(path) as f:
+                manifest = json.load(f)
+            self._manifest, self._chunks, self._version = manifest, {}, version
+        return self._manifest
+
+    def chunks(self, entry):
+        """
+        Archivos de una entrada y de sus imports estáticos, en orden de carga.
+
+        Returns:
+            tuple: (archivos JS, archivos CSS), vacíos si la entrada no está en el manifiesto
+        """
+        manifest = self.manifest()
+        if entry not in self._chunks:
+            js, css, seen, pending = [], [], set(), [entry]
+            while pending:
+                name = pending.pop(0)
+                chunk = manifest.get(name)
+                if name in seen or chunk is None:
+                    continue
+                seen.add(name)
+                if chunk['file'].endswith('.js'):
+                    js.append(chunk['file'])
+                css.extend(path for path in chunk.get('css', []) if path not in css)
+                pending.extend(chunk.get('imports', []))
+            self._chunks[entry] = (js, css)
+        return self._chunks[entry]
+
+    def reset(self):
+        self._version = None
+
+
+manifest_graph = ManifestGraph()
+
+
+def entry_css(entry):
+    """
+    Devuelve las rutas del manifiesto de los CSS de una entrada y de sus imports.
+
+    En modo desarrollo Vite inyecta el CSS desde el JS, por lo que no hay rutas.
+    """
+    if dev_mode():
+        return []
+    return manifest_graph.chunks(entry)[1]
+
+
+def script_tag(entry):
+    """Etiqueta `<script type="module">` de una entrada del manifiesto."""
+    return format_html('<script type="module" src="{}"></script>', vite_client().generate_vite_asset_url(entry))
+
+
+def stylesheet_tags(entry):
+    """Etiquetas `<link rel="stylesheet">` de los CSS de una entrada (vacío en desarrollo)."""
+    client = vite_client()
+    return [
+        format_html('<link rel="stylesheet" href="{}">', client.get_production_server_url(path))
+        for path in entry_css(entry)
+    ]
+
+
+def preload_links(entries):
+    """
+    Valores de la cabecera `Link` para precargar los chunks de las entradas.
+
+    Los CSS se precargan con `rel=preload; as=style` y los JS con `rel=modulepreload`.
+    En modo desarrollo no hay manifiesto y los sirve el servidor de Vite, por lo que
+    no se genera ninguno.
+    """
+    if dev_mode():
+        return []
+    client = vite_client()
+    links = []
+    for entry in entries:
+        js, css = manifest_graph.chunks(entry)
+        links += [f'<{client.get_production_server_url(path)}>; rel=preload; as=style' for path in css]
+        links += [f'<{client.get_production_server_url(path)}>; rel=modulepreload' for path in js]
+    return list(dict.fromkeys(links))
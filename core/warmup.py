@@ -0,0 +1,142 @@
+"""
+Calentamiento del proceso antes de atender requests.
+
+Sin calentamiento cada worker de Gunicorn importa los componentes y compila las
+plantillas en su primera request. `warmup()`:
+
+1. Importa y registra los componentes listados en el índice precalculado
+   `components/index.json` (generado con `manage.py componentindex`), sin recorrer
+   `COMPONENTS.dirs` en cada arranque.
+2. Compila con el loader cacheado las plantillas del proyecto listadas en el índice
+   (las de `TEMPLATES['DIRS']` y las de las apps del proyecto) y la plantilla y el
+   Media de cada componente registrado.
+3. Informa la duración.
+
+`project/wsgi.py` y `project/asgi.py` lo ejecutan al importarse, de modo que con
+`preload_app` de Gunicorn ocurre una sola vez en el proceso maestro y los workers heredan
+las plantillas compiladas por copy-on-write.
+"""
+import importlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+from django_components import get_component_files, registry
+from loguru import logger
+
+from .apps import project_apps
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+@dataclass
+class WarmupResult:
+    """Resumen del calentamiento."""
+
+    components: int
+    templates: int
+    elapsed: float
+    from_index: bool
+
+
+def index_path():
+    return Path(settings.BASE_DIR) / 'components' / 'index.json'
+
+
+def template_dirs():
+    """Directorios de plantillas del proyecto (las de los componentes se compilan desde su clase)."""
+    dirs = [Path(path) for path in settings.TEMPLATES[0]['DIRS']]
+    dirs += [Path(app.path) / 'templates' for app in project_apps()]
+    return [path for path in dirs if path.is_dir()]
+
+
+def build_index():
+    """
+    Recorre los directorios de componentes y plantillas y devuelve el índice.
+
+    Returns:
+        dict: {'components': [módulos], 'templates': [nombres de plantilla]}
+    """
+    templates = set()
+    for directory in template_dirs():
+        for path in directory.rglob('*'):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                templates.add(path.relative_to(directory).as_posix())
+    return {
+        'components': sorted(entry.dot_path for entry in get_component_files('.py')),
+        'templates': sorted(templates),
+    }
+
+
+def load_index():
+    """Devuelve el índice guardado o None si no existe."""
+    try:
+        return json.loads(index_path().read_text())
+    except FileNotFoundError:
+        return None
+
+
+def write_index(index):
+    index_path().write_text(json.dumps(index, indent=2) + '\n')
+
+
+def get_index():
+    """Devuelve (índice, si proviene del archivo); sin archivo recorre los directorios."""
+    index = load_index()
+    if index is not None:
+        return index, True
+    logger.warning(f"No existe {index_path()}, se recorren los directorios de componentes (ejecutar `manage.py componentindex`)")
+    return build_index(), False
+
+
+def register_components(index=None):
+    """Importa los módulos de componentes del índice (cada uno se registra al importarse)."""
+    if index is None:
+        index, _ = get_index()
+    for module in index['components']:
+        importlib.import_module(module)
+    return index['components']
+
+
+def compile_templates(names):
+    """Compila las plantillas con el loader cacheado y las de los componentes registrados."""
+    compiled = 0
+    for name in names:
+        try:
+            get_template(name)
+            compiled += 1
+        except TemplateSyntaxError as e:
+            logger.warning(f"No se pudo precompilar {name}: {e}")
+    for component_cls in registry.all().values():
+        # Acceder a `template` resuelve el Media del componente y guarda su plantilla compilada
+        if component_cls.template is not None:
+            compiled += 1
+    return compiled
+
+
+def warmup():
+    """
+    Registra los componentes y precompila las plantillas del proyecto.
+
+    Returns:
+        WarmupResult: Componentes registrados, plantillas compiladas y duración
+    """
+    start = time.perf_counter()
+    index, from_index = get_index()
+    components = register_components(index)
+    templates = compile_templates(index['templates'])
+    result = WarmupResult(
+        components=len(components),
+        templates=templates,
+        elapsed=time.perf_counter() - start,
+        from_index=from_index,
+    )
+    logger.info(
+        f"Warmup: {result.components} componentes y {result.templates} plantillas "
+        f"en {result.elapsed * 1000:.1f} ms ({'índice' if from_index else 'recorrido'})"
+    )
+    return result
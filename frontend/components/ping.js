@@ -0,0 +1,3 @@
+// Generado por `manage.py componentbundles`; no editar.
+import '../../components/core/ping/ping.css';
+import '../../components/core/ping/ping.js';
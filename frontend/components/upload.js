@@ -0,0 +1,3 @@
+// Generado por `manage.py componentbundles`; no editar.
+import '../../components/core/upload/upload.css';
+import '../../components/core/upload/upload.js';
@@ -0,0 +1,45 @@
+"""
+Configuración de Gunicorn ajustada a los límites del contenedor (ver core/server.py).
+
+Todos los valores se pueden reemplazar con variables de entorno GUNICORN_*.
+"""
+import os
+
+from core.server import close_db_connections, env_int, plan_workers, start_worker_threads
+
+plan = plan_workers()
+server_mode = os.environ.get('SERVER_MODE', 'wsgi')
+
+wsgi_app = 'project.asgi:application' if server_mode == 'asgi' else 'project.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8080')}")
+workers = plan.workers
+threads = plan.threads
+worker_class = plan.worker_class
+
+# La aplicación (y core.warmup) se carga una vez en el maestro; los workers la heredan por copy-on-write
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+# Reciclado de workers para acotar el crecimiento de memoria; el jitter evita reinicios simultáneos
+max_requests = env_int(os.environ, 'GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int(os.environ, 'GUNICORN_MAX_REQUESTS_JITTER', 100)
+timeout = env_int(os.environ, 'GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int(os.environ, 'GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int(os.environ, 'GUNICORN_KEEPALIVE', 5)
+
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+# Las líneas de acceso se emiten como logs estructurados desde la aplicación (LOG_ACCESS, core/logpipeline.py)
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+errorlog = os.environ.get('GUNICORN_ERROR_LOG', '-')
+
+
+def when_ready(server):
+    server.log.info(f'Gunicorn ({server_mode}): {plan.describe()}')
+
+
+def pre_fork(server, worker):
+    # Ninguna conexión ni pool del maestro debe compartirse con los workers
+    close_db_connections()
+
+
+def post_fork(server, worker):
+    close_db_connections()
+    start_worker_threads()
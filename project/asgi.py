@@ -4,4 +4,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from core.fastpath import FastPathASGI  # noqa: E402
+from core.static_assets import ASGIPrecompressedStaticHandler  # noqa: E402
+from core.warmup import warmup  # noqa: E402
+
+# Componentes y plantillas listos antes de la primera request (compartidos entre workers con preload_app)
+warmup()
+
+application = django_application
+if settings.STATIC_SERVE:
+    # Estáticos precomprimidos servidos sin pasar por el middleware (ver core/static_assets.py)
+    application = ASGIPrecompressedStaticHandler(application)
+
+# Las sondas de salud se responden antes del stack de middleware (ver core/fastpath.py)
+application = FastPathASGI(application)
@@ -3,32 +3,59 @@ import os
 import json
 from loguru import logger
 import sys
-from datetime import datetime
 from dotenv import load_dotenv
 from django_components import ComponentsSettings
+from core.logpipeline import Sampler, TEXT_FORMAT, json_format, parse_rates
+from core.logsink import S3LogSink, StreamLogSink
 
 # Cargar variables de entorno desde .env
 load_dotenv(override=True)
 
-# Configuración de Loguru
+# Configuración de Loguru (core/logpipeline.py): los handlers solo encolan y un hilo de fondo
+# escribe; JSON compacto en producción y muestreo por logger de DEBUG/INFO
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text' if os.environ.get('IS_LOCAL') == 'True' else 'json')
+# Líneas de acceso desde InstrumentationMiddleware (en local ya las imprime runserver)
+LOG_ACCESS = os.environ.get('LOG_ACCESS', str(os.environ.get('IS_LOCAL') != 'True')) == 'True'
+LOG_SAMPLER = Sampler(
+    rate=float(os.environ.get('LOG_SAMPLE_RATE', '1.0')),
+    rates=parse_rates(os.environ.get('LOG_SAMPLE_RATES', '')),  # p. ej. "access=0.1,core.cache=0.5"
+)
+STDOUT_LOG_SINK = StreamLogSink(
+    max_queue=int(os.environ.get('LOG_QUEUE_SIZE', '10000')),
+    policy=os.environ.get('LOG_QUEUE_POLICY', 'drop'),
+)
+LOG_FORMATTER = json_format if LOG_FORMAT == 'json' else TEXT_FORMAT
 LOGURU_CONFIG = {
     "handlers": [
         {
-            "sink": sys.stdout,
-            "format": "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-            "level": "INFO",
+            "sink": STDOUT_LOG_SINK,
+            "format": LOG_FORMATTER,
+            "colorize": LOG_FORMAT == 'text',
+            "level": os.environ.get('LOG_LEVEL', 'INFO'),
+            "filter": LOG_SAMPLER.filter,
         }
-    ]
+    ],
+    "patcher": LOG_SAMPLER.patch,
 }
 
-# En producción, agregar el handler de S3
+# En producción, agregar el handler de S3: lotes comprimidos subidos en segundo plano
+# a s3://<bucket>/logs/app_<fecha>/ (la retención se define con una regla de ciclo de vida del bucket)
+S3_LOG_SINK = None
 if not os.environ.get('IS_LOCAL') == 'True':
+    S3_LOG_SINK = S3LogSink(
+        bucket=os.environ['AWS_STORAGE_BUCKET_NAME'],
+        prefix='logs',
+        batch_bytes=int(os.environ.get('S3_LOG_BATCH_BYTES', 1024 * 1024)),
+        flush_interval=float(os.environ.get('S3_LOG_FLUSH_INTERVAL', '10')),
+        max_queue=int(os.environ.get('S3_LOG_MAX_QUEUE', '10000')),
+        policy=os.environ.get('S3_LOG_POLICY', 'drop'),
+    )
     LOGURU_CONFIG["handlers"].append({
-        "sink": f"s3://{os.environ['AWS_STORAGE_BUCKET_NAME']}/logs/app_{datetime.now().strftime('%Y-%m-%d')}.log",
-        "format": "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        "level": "DEBUG",
-        "rotation": "1 day",
-        "retention": "30 days",
+        "sink": S3_LOG_SINK,
+        "format": LOG_FORMATTER,
+        "colorize": False,
+        "level": os.environ.get('S3_LOG_LEVEL', 'INFO'),
+        "filter": LOG_SAMPLER.filter,
     })
 
 # Configurar Loguru
@@ -81,11 +108,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
+    'core.middleware.AdmissionMiddleware',
+    'core.middleware.PreloadMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django_htmx.middleware.HtmxMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    # Debajo de CSRF: su respuesta se procesa antes de que CSRF limpie CSRF_COOKIE_NEEDS_UPDATE
+    'core.middleware.CompressionMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -104,6 +136,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.response_cache',
             ],
             'builtins': [
                 'django_components.templatetags.component_tags',
@@ -123,6 +156,21 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'project.wsgi.application'
+ASGI_APPLICATION = 'project.asgi.application'
+
+# Modo de servidor: 'wsgi' (gunicorn con workers sync) o 'asgi' (gunicorn con workers uvicorn)
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+# Conexiones a la base de datos: pool de psycopg3 por proceso (DB_POOL=True) o conexiones
+# persistentes con CONN_MAX_AGE. En modo ASGI sin pool las conexiones no se reutilizan,
+# porque cada request corre en un hilo distinto.
+DB_POOL = os.environ.get('DB_POOL', 'True') == 'True'
+DB_POOL_OPTIONS = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+    'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),  # Segundos antes de cerrar una conexión ociosa
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),  # Espera máxima para obtener una conexión
+}
 
 DATABASES = {
     'default': {
@@ -132,9 +180,85 @@ DATABASES = {
         'PASSWORD': os.environ['DB_PASSWORD'],
         'HOST': os.environ['DB_HOST'],
         'PORT': os.environ['DB_PORT'],
+        'CONN_HEALTH_CHECKS': True,  # Verifica la conexión (pre-ping) antes de reutilizarla
+        'CONN_MAX_AGE': 0 if DB_POOL or SERVER_MODE == 'asgi' else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        'OPTIONS': {'pool': DB_POOL_OPTIONS} if DB_POOL else {},
     }
 }
 
+# Caché en dos niveles: LRU en memoria del proceso sobre un caché compartido (core/cache.py).
+# Por defecto el nivel compartido es la tabla `django_cache` en Postgres (creada por `bootstrap`).
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_MAX_ENTRIES': int(os.environ.get('CACHE_LOCAL_MAX_ENTRIES', '1000')),
+            'LOCAL_MAX_BYTES': int(os.environ.get('CACHE_LOCAL_MAX_BYTES', 16 * 1024 * 1024)),
+            'LOCAL_TIMEOUT': float(os.environ.get('CACHE_LOCAL_TIMEOUT', '30')),  # Inconsistencia máxima entre procesos
+        },
+    },
+    'shared': {
+        'BACKEND': os.environ.get('CACHE_SHARED_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('CACHE_SHARED_LOCATION', 'django_cache'),
+    },
+    # Fragmentos HTML de componentes (core/extensions.py): solo en memoria del proceso y acotado
+    'components': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'components',
+        'OPTIONS': {
+            'SHARED': None,
+            'LOCAL_MAX_ENTRIES': int(os.environ.get('COMPONENT_CACHE_MAX_ENTRIES', '500')),
+            'LOCAL_MAX_BYTES': int(os.environ.get('COMPONENT_CACHE_MAX_BYTES', 4 * 1024 * 1024)),
+            'LOCAL_TIMEOUT': float(os.environ.get('COMPONENT_CACHE_TTL', '600')),
+        },
+    },
+}
+COMPONENT_CACHE_ENABLED = os.environ.get('COMPONENT_CACHE_ENABLED', 'True') == 'True'
+COMPONENT_CACHE_TTL = int(os.environ.get('COMPONENT_CACHE_TTL', '600'))  # Validez por defecto de un fragmento
+
+# Sesiones leídas desde Redis con escritura diferida y agrupada a la base de datos (core/sessions.py).
+# Redis es compartido por todos los workers (una sesión escrita, rotada o cerrada se lee al instante
+# en los demás) y no consume consultas a Postgres. Sin `SESSION_CACHE_URL` se usan sesiones en base de datos.
+SESSION_CACHE_URL = os.environ.get('SESSION_CACHE_URL')  # p. ej. redis://sesiones.xxxxxx.cache.amazonaws.com:6379/0
+if SESSION_CACHE_URL:
+    CACHES['sessions'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SESSION_CACHE_URL,
+        # Si Redis no responde, core/sessions.py recurre a la base de datos sin demorar la request
+        'OPTIONS': {'socket_connect_timeout': 0.5, 'socket_timeout': 0.5},
+    }
+SESSION_ENGINE = 'core.sessions' if SESSION_CACHE_URL else 'django.contrib.sessions.backends.db'
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_WRITE_INTERVAL = float(os.environ.get('SESSION_WRITE_INTERVAL', '5'))  # Segundos máximos entre volcados
+SESSION_WRITE_BATCH_SIZE = int(os.environ.get('SESSION_WRITE_BATCH_SIZE', '100'))  # Sesiones pendientes que fuerzan un volcado
+SESSION_CLEANUP_BATCH_SIZE = int(os.environ.get('SESSION_CLEANUP_BATCH_SIZE', '1000'))  # Tamaño de lote de `clearsessions`
+
+# Caché de respuestas de vistas de solo lectura (core/response_cache.py)
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_ALIAS = os.environ.get('RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+
+# Monitor de salud de la base de datos (core/health.py)
+HEALTH_DB_INTERVAL = float(os.environ.get('HEALTH_DB_INTERVAL', '15'))  # Segundos entre verificaciones de fondo; 0 las desactiva
+HEALTH_DB_MAX_AGE = float(os.environ.get('HEALTH_DB_MAX_AGE', '5'))  # Validez del resultado cacheado sin hilo de fondo
+HEALTH_DB_WINDOW = int(os.environ.get('HEALTH_DB_WINDOW', '20'))  # Verificaciones usadas para la tasa de error móvil
+
+# Instrumentación de requests (ver core/middleware.py y /core/metrics/)
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', '0.1'))  # Fracción de requests con desglose de tiempos
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'True') == 'True'  # Cabecera Server-Timing en las requests muestreadas
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # `Authorization: Bearer <token>` de /core/metrics/ y /core/health/db/pool/ (además del staff)
+
+# Compresión de respuestas dinámicas (core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '512'))  # Bytes mínimos para comprimir
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))  # Calidades altas son lentas para HTML dinámico
+COMPRESSION_CONTENT_TYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/javascript', 'application/javascript',
+    'application/json', 'application/xml', 'image/svg+xml',
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -170,6 +294,39 @@ AWS_S3_OBJECT_PARAMETERS = json.loads(os.environ.get('AWS_S3_OBJECT_PARAMETERS',
 AWS_S3_SIGNATURE_VERSION = 's3v4'
 AWS_S3_VERIFY = True
 
+# Subidas directas al bucket del storage `default` con multipart prefirmado (core/uploads.py)
+UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', str(5 * 1024 ** 3)))
+UPLOAD_PART_SIZE = int(os.environ.get('UPLOAD_PART_SIZE', str(8 * 1024 * 1024)))  # Mínimo de S3: 5 MiB
+UPLOAD_CONCURRENCY = int(os.environ.get('UPLOAD_CONCURRENCY', '4'))  # Partes en paralelo desde el navegador
+UPLOAD_URL_EXPIRES = int(os.environ.get('UPLOAD_URL_EXPIRES', '3600'))  # Vigencia de las URLs y del token
+UPLOAD_PREFIX = 'uploads'
+UPLOAD_CONTENT_TYPES = [
+    'image/*', 'video/*', 'audio/*', 'application/pdf', 'application/zip', 'text/plain', 'text/csv',
+]
+
+# Control de admisión con límite de concurrencia adaptativo por worker (core/admission.py)
+ADMISSION_CONTROL = os.environ.get('ADMISSION_CONTROL', 'True') == 'True'
+ADMISSION_INITIAL_LIMIT = int(os.environ.get('ADMISSION_INITIAL_LIMIT', '20'))
+ADMISSION_MIN_LIMIT = int(os.environ.get('ADMISSION_MIN_LIMIT', '2'))
+ADMISSION_MAX_LIMIT = int(os.environ.get('ADMISSION_MAX_LIMIT', '200'))
+ADMISSION_LATENCY_TARGET = float(os.environ.get('ADMISSION_LATENCY_TARGET', '1.0'))  # Segundos; más lento reduce el límite
+ADMISSION_BACKOFF = float(os.environ.get('ADMISSION_BACKOFF', '0.7'))  # Factor de reducción ante congestión
+ADMISSION_HEADROOM = float(os.environ.get('ADMISSION_HEADROOM', '0.25'))  # Margen extra para escrituras (POST, PUT...)
+ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', '2'))
+ADMISSION_EXEMPT_VIEWS = ['health', 'db_health_check']
+
+# Server-Sent Events (core/events.py), solo en modo ASGI; límites por worker
+SSE_MAX_CONNECTIONS = int(os.environ.get('SSE_MAX_CONNECTIONS', '100'))
+SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', '32'))  # Eventos pendientes antes de desconectar a un cliente lento
+SSE_HEARTBEAT = float(os.environ.get('SSE_HEARTBEAT', '15'))  # Segundos sin eventos antes de enviar un heartbeat
+SSE_RETRY_MS = int(os.environ.get('SSE_RETRY_MS', '3000'))  # Espera del navegador antes de reconectar
+SSE_DEMO_INTERVAL = float(os.environ.get('SSE_DEMO_INTERVAL', '1'))  # Periodo del reloj en vivo de la demo HTMX
+
+# Descargas de media (core/downloads.py): sendfile en local; en S3 URL prefirmada ('redirect') o 'stream'
+MEDIA_DOWNLOAD_MODE = os.environ.get('MEDIA_DOWNLOAD_MODE', 'redirect')
+MEDIA_URL_EXPIRES = int(os.environ.get('MEDIA_URL_EXPIRES', '300'))
+MEDIA_STREAM_CHUNK_SIZE = int(os.environ.get('MEDIA_STREAM_CHUNK_SIZE', str(256 * 1024)))  # Techo de memoria por descarga
+
 # Archivos estáticos y multimedia
 VITE_ASSETS_PATH = BASE_DIR / "static" / "dist"
 
@@ -185,6 +342,11 @@ STATICFILES_DIRS = [
     VITE_ASSETS_PATH,
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_SYNC_WORKERS = int(os.environ.get('STATIC_SYNC_WORKERS', '8'))  # Subidas paralelas de `syncstatic`
+# Estáticos servidos por Django con variantes precomprimidas (core/static_assets.py): en local o sin CDN
+STATIC_SERVE = IS_LOCAL or os.environ.get('STATIC_SERVE') == 'True'
+STATIC_IMMUTABLE_PATTERN = r'^assets/.+-[\w-]{8}\.\w+$'  # Salidas de Vite con hash de contenido
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', '300'))  # Vida en caché de los estáticos sin hash
 
 DJANGO_VITE = {
     "default": {
@@ -192,6 +354,9 @@ DJANGO_VITE = {
         "manifest_path": VITE_ASSETS_PATH / "manifest.json",
     }
 }
+# Precarga de chunks de Vite en las páginas HTML (core.middleware.PreloadMiddleware)
+VITE_PRELOAD_ENTRIES = ['frontend/main.js']  # Entradas que carga base.html en todas las páginas
+VITE_EARLY_HINTS = os.environ.get('VITE_EARLY_HINTS', 'True') == 'True'  # 103 Early Hints si el servidor los soporta
 
 if IS_LOCAL:
     STATIC_URL = '/static/'
@@ -219,24 +384,35 @@ else:
             },
         },
         "staticfiles": {
-            "BACKEND": "storages.backends.s3.S3Storage",
+            "BACKEND": "core.storage.StaticS3Storage",  # Cache-Control por archivo (immutable con hash)
             "OPTIONS": {
                 "bucket_name": AWS_STORAGE_BUCKET_NAME,
                 "location": "static",
+                "file_overwrite": True,  # Los estáticos se reemplazan en sitio al sincronizar
                 "custom_domain": AWS_S3_CUSTOM_DOMAIN,
                 "object_parameters": AWS_S3_OBJECT_PARAMETERS,
             },
         },
     }
-    STATIC_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/static/'
+    STATIC_URL = '/static/' if STATIC_SERVE else f'https://{AWS_S3_CUSTOM_DOMAIN}/static/'
     MEDIA_URL = f'https://{AWS_S3_CUSTOM_DOMAIN}/media/'
 
 # Ejecutor de pruebas
 TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 
+# Media de los componentes empaquetado en chunks de Vite (core/bundles.py, `manage.py componentbundles`)
+COMPONENT_BUNDLES_ENABLED = os.environ.get('COMPONENT_BUNDLES_ENABLED', 'True') == 'True'
+
 # Configuración de django-components según documentación oficial
 COMPONENTS = ComponentsSettings(
     dirs=[
         BASE_DIR / "components",
     ],
+    # Los componentes se importan desde components/index.json (core/warmup.py)
+    autodiscover=False,
+    extensions=[
+        "core.extensions.InstrumentationExtension",
+        "core.extensions.ViteBundleExtension",
+        "core.extensions.RenderCacheExtension",
+    ],
 )
@@ -1,8 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
-from core.views import home
+from core.views import home, media
 from django.conf import settings
-from django.conf.urls.static import static
 
 urlpatterns = [
     path('', home, name='root_home'),
@@ -10,7 +9,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     # Django components URLs
     path("", include("django_components.urls")),
+    # Media con rangos y sin cargar archivos en memoria: sendfile en local, URL prefirmada o streaming en S3
+    path('media/<path:path>', media, name='media'),
 ]
-
-if settings.IS_LOCAL:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -4,4 +4,20 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 django.setup()  # Ensure Django is fully initialized
+
+from django.conf import settings  # noqa: E402
+
+from core.fastpath import FastPathWSGI  # noqa: E402
+from core.static_assets import PrecompressedStaticHandler  # noqa: E402
+from core.warmup import warmup  # noqa: E402
+
+# Componentes y plantillas listos antes de la primera request (compartidos entre workers con preload_app)
+warmup()
+
 application = get_wsgi_application()
+if settings.STATIC_SERVE:
+    # Estáticos precomprimidos servidos sin pasar por el middleware (ver core/static_assets.py)
+    application = PrecompressedStaticHandler(application)
+
+# Las sondas de salud se responden antes del stack de middleware (ver core/fastpath.py)
+application = FastPathWSGI(application)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Benchmark del costo de logging por request en el hilo que atiende la request.
+
+Simula los registros de una request típica (la línea de acceso, dos INFO y un DEBUG de
+la aplicación) con cada configuración de Loguru y mide el tiempo que pasan los hilos
+de las requests dentro de las llamadas a `logger`:
+
+- `sync-text`: la configuración anterior, formato de texto con colores escrito en
+  stdout en el mismo hilo.
+- `queued-json`: JSON compacto encolado en `core.logsink.StreamLogSink`.
+- `queued-json-sampled`: igual, con DEBUG/INFO muestreados a `--sample-rate`.
+
+La salida va a un pipe vaciado por otro hilo, como el recolector de logs del contenedor.
+
+Uso:
+    python scripts/bench_logging.py --requests 20000 --threads 4
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.logpipeline import TEXT_FORMAT, Sampler, json_format  # noqa: E402
+from core.logsink import StreamLogSink  # noqa: E402
+
+
+def open_drained_pipe():
+    """Devuelve un stream de escritura cuyo contenido lee y descarta un hilo de fondo."""
+    read_fd, write_fd = os.pipe()
+
+    def drain():
+        with os.fdopen(read_fd, 'rb') as reader:
+            while reader.read(65536):
+                pass
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return os.fdopen(write_fd, 'w', buffering=1), thread
+
+
+def configure(mode, stream, sample_rate):
+    """Configura Loguru para el modo y devuelve el sink encolado (o None)."""
+    if mode == 'sync-text':
+        logger.configure(handlers=[{'sink': stream, 'format': TEXT_FORMAT, 'colorize': True, 'level': 'DEBUG'}], patcher=None)
+        return None
+    sampler = Sampler(rate=sample_rate if mode == 'queued-json-sampled' else 1.0)
+    sink = StreamLogSink(stream=stream, max_queue=100000, policy='block', block_timeout=1.0)
+    logger.configure(
+        handlers=[{'sink': sink, 'format': json_format, 'level': 'DEBUG', 'filter': sampler.filter}],
+        patcher=sampler.patch,
+    )
+    return sink
+
+
+def simulated_request(index):
+    """Registros de una request; devuelve los segundos pasados dentro de `logger`."""
+    start = time.perf_counter()
+    logger.debug('Resolviendo la vista de la request {}', index)
+    logger.info('Render de la plantilla core/home.html')
+    logger.bind(user_id=index % 100).info('Sesión cargada')
+    logger.bind(
+        logger='access', method='GET', path='/core/home/', status=200, view='home', ms=3.2, bytes=2048, ip='10.0.0.1',
+    ).info('GET /core/home/ 200')
+    return time.perf_counter() - start
+
+
+def bench_mode(mode, args):
+    stream, drainer = open_drained_pipe()
+    sink = configure(mode, stream, args.sample_rate)
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(simulated_request, range(200)))  # Calentamiento
+        start = time.perf_counter()
+        durations = sorted(pool.map(simulated_request, range(args.requests)))
+        elapsed = time.perf_counter() - start
+    if sink is not None:
+        sink.flush(timeout=60)
+        written = sink.stats()['written']
+        sink.stop()
+    else:
+        written = None
+    logger.remove()
+    stream.close()
+    drainer.join(timeout=10)
+    return {
+        'mode': mode,
+        'requests': args.requests,
+        'threads': args.threads,
+        'mean_us': round(statistics.fmean(durations) * 1e6, 1),
+        'p50_us': round(durations[len(durations) // 2] * 1e6, 1),
+        'p99_us': round(durations[int(len(durations) * 0.99)] * 1e6, 1),
+        'requests_per_s': round(args.requests / elapsed),
+        'lines_written': written,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['sync-text', 'queued-json', 'queued-json-sampled'])
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--sample-rate', type=float, default=0.1)
+    parser.add_argument('--json', dest='json_path', help='Guarda los resultados en un archivo JSON.')
+    args = parser.parse_args()
+
+    results = [bench_mode(mode, args) for mode in args.modes]
+    print(f"{'modo':<22} {'µs/req media':>13} {'p50 µs':>9} {'p99 µs':>9} {'req/s':>9} {'líneas':>8}")
+    for row in results:
+        lines = '-' if row['lines_written'] is None else row['lines_written']
+        print(
+            f"{row['mode']:<22} {row['mean_us']:>13} {row['p50_us']:>9} {row['p99_us']:>9} "
+            f"{row['requests_per_s']:>9} {lines:>8}"
+        )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
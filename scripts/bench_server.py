@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Benchmark comparativo de los modos de servidor WSGI y ASGI.
+
+Levanta gunicorn en cada modo con la misma cantidad de workers (mismo presupuesto
+de memoria), genera carga concurrente contra los endpoints de salud y reporta
+requests por segundo, latencia p50/p99 y memoria residente de los procesos.
+
+Uso:
+    python scripts/bench_server.py --workers 2 --concurrency 32 --duration 10
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MODES = {
+    'wsgi': ['project.wsgi'],
+    'asgi': ['project.asgi', '-k', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+def process_tree_rss(pid):
+    """Suma la memoria residente (KiB) de un proceso y sus hijos directos (solo Linux)."""
+    pids = [pid]
+    children = Path(f'/proc/{pid}/task/{pid}/children')
+    if children.exists():
+        pids += [int(child) for child in children.read_text().split()]
+    total = 0
+    for item in pids:
+        status = Path(f'/proc/{item}/status')
+        if not status.exists():
+            continue
+        for line in status.read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                total += int(line.split()[1])
+    return total
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/core/health/', headers={'Host': 'localhost'})
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El servidor no respondió en el puerto {port}')
+
+
+def run_load(port, path, concurrency, duration):
+    """Genera carga con conexiones keep-alive y devuelve latencias (s) y errores."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        local, failures = [], 0
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Host': 'localhost'})
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    failures += 1
+            except OSError:
+                failures += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors.append(failures)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, sum(errors)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench_mode(mode, args):
+    env = {**os.environ, 'SERVER_MODE': mode}
+    command = [
+        sys.executable, '-m', 'gunicorn', *MODES[mode],
+        '-b', f'127.0.0.1:{args.port}', '-w', str(args.workers), '--log-level', 'warning',
+    ]
+    server = subprocess.Popen(command, cwd=BASE_DIR, env=env)
+    try:
+        wait_until_ready(args.port)
+        results = []
+        for path in args.paths:
+            run_load(args.port, path, args.concurrency, min(1.0, args.duration))  # calentamiento
+            latencies, errors = run_load(args.port, path, args.concurrency, args.duration)
+            results.append({
+                'mode': mode,
+                'path': path,
+                'requests': len(latencies),
+                'rps': round(len(latencies) / args.duration, 1),
+                'p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else 0.0,
+                'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                'errors': errors,
+                'rss_kib': process_tree_rss(server.pid),
+            })
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['wsgi', 'asgi'], choices=sorted(MODES))
+    parser.add_argument('--paths', nargs='+', default=['/core/health/', '/core/health/db/'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--json', dest='json_path', help='Guarda los resultados en un archivo JSON.')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        results.extend(bench_mode(mode, args))
+
+    print(f"{'modo':<6} {'ruta':<20} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8} {'RSS MiB':>9}")
+    for row in results:
+        print(
+            f"{row['mode']:<6} {row['path']:<20} {row['rps']:>9} {row['p50_ms']:>9} "
+            f"{row['p99_ms']:>9} {row['errors']:>8} {row['rss_kib'] / 1024:>9.1f}"
+        )
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
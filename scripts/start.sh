@@ -10,24 +10,11 @@ banner() {
   echo ""
 }
 
-banner "MIGRACIONES DE DJANGO"
-.venv/bin/python manage.py makemigrations
-.venv/bin/python manage.py migrate
+banner "ARRANQUE DE DJANGO"
+# Migraciones, estáticos, superusuario y pruebas en un único proceso.
+# Los pasos cuyas entradas no cambiaron se omiten (ver core/management/commands/bootstrap.py).
+.venv/bin/python manage.py bootstrap
 
-banner "ARCHIVOS ESTÁTICOS"
-.venv/bin/python manage.py collectstatic --noinput
-
-banner "VERIFICACIÓN DE SUPERUSUARIO"
-if .venv/bin/python manage.py shell -c "from django.contrib.auth import get_user_model; User = get_user_model(); print(User.objects.filter(is_superuser=True).exists())" | grep -q "True"; then
-    echo "Superusuario ya existe, omitiendo creación."
-else
-    .venv/bin/python manage.py createsuperuser --noinput
-fi
-
-banner "PRUEBAS"
-.venv/bin/python manage.py test tests --verbosity 2
-.venv/bin/python manage.py test core.tests.test_views --verbosity 2
-.venv/bin/python manage.py test core.tests.test_models --verbosity 2
-
-banner "INICIANDO GUNICORN"
-exec .venv/bin/gunicorn -b 0.0.0.0:8080 project.wsgi --log-level info --access-logfile - --error-logfile - 
\ No newline at end of file
+banner "INICIANDO GUNICORN (${SERVER_MODE:-wsgi})"
+# Workers, hilos, clase de worker, preload y reciclado según los límites del contenedor (ver gunicorn.conf.py)
+exec .venv/bin/gunicorn -c gunicorn.conf.py
@@ -1,6 +1,16 @@
 import { defineConfig } from 'vite';
 import { viteStaticCopy } from 'vite-plugin-static-copy';
 import tailwindcss from '@tailwindcss/vite';
+import { existsSync, readFileSync } from 'node:fs';
+
+// Entradas con el Media de cada componente, generadas por `manage.py componentbundles`
+const componentBundlesPath = 'frontend/components/bundles.json';
+const componentBundles = existsSync(componentBundlesPath)
+  ? JSON.parse(readFileSync(componentBundlesPath, 'utf-8'))
+  : {};
+const componentInputs = Object.fromEntries(
+  Object.entries(componentBundles).map(([name, bundle]) => [`component-${name}`, bundle.entry])
+);
 
 export default defineConfig({
   base: '/static/',
@@ -11,6 +21,7 @@ export default defineConfig({
       input: {
         main: 'frontend/main.js',
         favicon: 'frontend/favicon.ico',
+        ...componentInputs,
       },
     },
   },